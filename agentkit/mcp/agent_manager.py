@@ -1,6 +1,9 @@
 ﻿import logging
+import os
+import re
 import time
 from dataclasses import dataclass, field
+from datetime import datetime
 from typing import Dict, List, Any, Optional
 import json
 from pathlib import Path
@@ -10,6 +13,14 @@ import asyncio
 logging.basicConfig(level = logging.INFO)
 logger = logging.getLogger("AgentManager")
 
+_PLACEHOLDER_RE = re.compile(r"\{\{([A-Za-z_][A-Za-z0-9_]*)\}\}")
+_ENV_PLACEHOLDER_NAME_RE = re.compile(r"[A-Z_][A-Z0-9_]*")
+_TIME_PLACEHOLDER_FORMATS = {
+    "CurrentTime": "%H:%M:%S",
+    "CurrentDate": "%Y-%m-%d",
+    "CurrentDateTime": "%Y-%m-%d %H:%M:%S",
+}
+
 @dataclass
 class AgentConfig:
 
@@ -163,32 +174,40 @@ class AgentManager:
 
             return ""
         processed_text = str(text)
+        if "{{" not in processed_text:
+            return processed_text
+        values: Dict[str, str] = {}
         if agent_config:
-            processed_text = processed_text.replace("{{AgentName}}", agent_config.name)
-            processed_text = processed_text.replace("{{MaidName}}", agent_config.name)
-            processed_text = processed_text.replace("{{BaseName}}", agent_config.base_name)
-            processed_text = processed_text.replace("{{Description}}", agent_config.description)
-            processed_text = processed_text.replace("{{ModelId}}", agent_config.id)
-            processed_text = processed_text.replace("{{Temperature}}", str(agent_config.temperature))
-            processed_text = processed_text.replace("{{MaxTokens}}", str(agent_config.max_output_tokens))
-            processed_text = processed_text.replace("{{ModelProvider}}", agent_config.model_provider)
-            processed_text = processed_text.replace("{{ApiBaseUrl}}", agent_config.api_base_url)
-            processed_text = processed_text.replace("{{ApiKey}}", agent_config.api_key)
-        import os
-        import re
-        env_pattern = r'\{\{([A-Z_][A-Z0-9_]*)\}\}'
-        for match in re.finditer(env_pattern, processed_text):
-            env_var_name = match.group(1)
-            env_value = os.getenv(env_var_name, '')
-            processed_text = processed_text.replace(f"{{{{{env_var_name}}}}}", env_value)
-        
-        from datetime import datetime
-        now = datetime.now()
-        processed_text = processed_text.replace("{{CurrentTime}}", now.strftime("%H:%M:%S"))
-        processed_text = processed_text.replace("{{CurrentDate}}", now.strftime("%Y-%m-%d"))
-        processed_text = processed_text.replace("{{CurrentDateTime}}", now.strftime("%Y-%m-%d %H:%M:%S"))
-
-        return processed_text
+            values = {
+                "AgentName": agent_config.name,
+                "MaidName": agent_config.name,
+                "BaseName": agent_config.base_name,
+                "Description": agent_config.description,
+                "ModelId": agent_config.id,
+                "Temperature": str(agent_config.temperature),
+                "MaxTokens": str(agent_config.max_output_tokens),
+                "ModelProvider": agent_config.model_provider,
+                "ApiBaseUrl": agent_config.api_base_url,
+                "ApiKey": agent_config.api_key,
+            }
+        now: Optional[datetime] = None
+
+        def _substitute(match: "re.Match[str]") -> str:
+            nonlocal now
+            name = match.group(1)
+            if name in values:
+                return values[name]
+            time_format = _TIME_PLACEHOLDER_FORMATS.get(name)
+            if time_format is not None:
+                if now is None:
+                    now = datetime.now()
+                return now.strftime(time_format)
+            if _ENV_PLACEHOLDER_NAME_RE.fullmatch(name):
+                return os.getenv(name, "")
+            return match.group(0)
+
+        # One scan over the prompt instead of a str.replace() pass per placeholder.
+        return _PLACEHOLDER_RE.sub(_substitute, processed_text)
     
     def _build_system_message(self, agent_config: AgentConfig) -> Dict[str, str]:
 
@@ -1,4 +1,4 @@
-﻿from datetime import datetime
+﻿from datetime import datetime, timezone
 import sys
 import json
 import importlib
@@ -12,6 +12,11 @@ MCP_REGISTRY = {}
 MANIFEST_CACHE = {}
 MANIFEST_SOURCES = {}
 
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
 def load_tools_manifest(manifest_path: Path) -> Optional[Dict[str, Any]]:
 
     try:
@@ -164,7 +169,7 @@ def service_statistics() -> Dict[str, Any]:
         "total_services": len(MCP_REGISTRY),
         "total_tools": sum(len(get_available_tools(name)) for name in MCP_REGISTRY.keys()),
         "registered_services": list(MCP_REGISTRY.keys()),
-        "last_update": datetime.utcnow().isoformat() + 'Z'
+        "last_update": _utc_now_iso()
     }
 
 def auto_registry():
@@ -233,7 +238,7 @@ def ensure_builtin_service():
             except Exception:
                 return 0.0
         async def now(self) -> str:
-            return datetime.utcnow().isoformat() + "Z"
+            return _utc_now_iso()
         async def json_get(self, obj: Dict[str, Any], key: str, default: Any = None) -> Any:
             if not isinstance(obj, dict):
                 return default
@@ -20,6 +20,8 @@ class SystemConfig(BaseSettings):
     base_dir: Path = Field(default_factory=lambda: PROJECT_ROOT)
     log_dir: Path = Field(default_factory=lambda: PROJECT_ROOT / "logs")
     stream_mode: bool = Field(default=True)
+    stream_flush_chars: int = Field(default=512, ge=0)
+    stream_flush_ms: int = Field(default=10, ge=0)
     debug: bool = Field(default=False)
     log_level: str = Field(default="INFO")
     session_ttl_hours: int = Field(default=0, ge=0)
@@ -89,13 +89,13 @@ class PrometheaConversation:
             f"{services_desc}"
         )
 
-        new_messages = list(messages)
-        if new_messages and new_messages[0].get("role") == "system":
-            new_messages[0]["content"] = f"{new_messages[0].get('content', '')}\n\n{system_prompt}"
-        else:
-            new_messages.insert(0, {"role": "system", "content": system_prompt})
-
-        return new_messages
+        # Build the result in one allocation. The caller's system dict is copied,
+        # not edited, so a retried turn does not get the tool prompt appended twice.
+        if messages and messages[0].get("role") == "system":
+            head = dict(messages[0])
+            head["content"] = f"{head.get('content', '')}\n\n{system_prompt}"
+            return [head, *messages[1:]]
+        return [{"role": "system", "content": system_prompt}, *messages]
 
     @staticmethod
     def _safe_user_segment(user_id: Optional[str]) -> str:
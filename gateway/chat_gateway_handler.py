@@ -60,13 +60,8 @@ async def handle_chat(self, connection, request):
                 request.id, False, error="message is required"
             )
 
-        session_id = gateway_request.session_id
-        if session_id:
-            if not self.message_manager.get_session(session_id, user_id=user_id):
-                self.message_manager.create_session(session_id=session_id, user_id=user_id)
-        else:
-            session_id = self.message_manager.create_session(user_id=user_id)
-            gateway_request.session_id = session_id
+        session_id = self.message_manager.ensure_session(gateway_request.session_id, user_id=user_id)
+        gateway_request.session_id = session_id
 
         run_context_payload = dict(request.params or {})
         run_context_payload["session_id"] = session_id
@@ -11,8 +11,10 @@ Goals:
 - Serve as the central entrypoint for model switching and other config-related features.
 """
 
+import asyncio
 import os
 import json
+from collections import OrderedDict
 from copy import deepcopy
 from pathlib import Path
 from typing import Any, Dict, Optional
@@ -49,6 +51,8 @@ ENV_ONLY_SECRET_PATHS = (
     ("memory", "flat_memory_path"),
 )
 
+MERGED_CONFIG_CACHE_SIZE = 256
+
 
 class ConfigService:
     """
@@ -68,6 +72,11 @@ class ConfigService:
 
         self._default_config: Optional[PrometheaConfig] = None
         self._user_config_cache: Dict[str, Dict[str, Any]] = {}
+        # user key -> (config version, merged config); see get_merged_config().
+        self._merged_config_cache: OrderedDict[str, tuple[int, Dict[str, Any]]] = OrderedDict()
+        self._config_versions: Dict[str, int] = {}
+        # user_id -> (merged pending updates, future resolved by the flush)
+        self._pending_config_writes: Dict[str, tuple[Dict[str, Any], asyncio.Future]] = {}
         self._deprecation_warnings: Dict[str, list[str]] = {}
 
         self._load_default_config()
@@ -198,6 +207,13 @@ class ConfigService:
         Returns:
             Merged configuration as a dictionary.
         """
+        cache_key = user_id or "default"
+        version = self._config_versions.get(cache_key, 0)
+        cached = self._merged_config_cache.get(cache_key)
+        if cached is not None and cached[0] == version:
+            self._merged_config_cache.move_to_end(cache_key)
+            return deepcopy(cached[1])
+
         # 1. Start from the default configuration
         if not self._default_config:
             self._load_default_config()
@@ -216,7 +232,22 @@ class ConfigService:
         # 3. Keep env-only secret fields pinned to default/env-resolved values.
         self._apply_env_only_secret_overlay(merged, default_dict)
 
-        return self._migrate_payload(merged, warning_key=(user_id or "default"))
+        merged = self._migrate_payload(merged, warning_key=cache_key)
+        self._merged_config_cache[cache_key] = (version, deepcopy(merged))
+        self._merged_config_cache.move_to_end(cache_key)
+        while len(self._merged_config_cache) > MERGED_CONFIG_CACHE_SIZE:
+            self._merged_config_cache.popitem(last=False)
+        return merged
+
+    def get_config_version(self, user_id: Optional[str] = None) -> int:
+        """Return the change counter for a user's configuration (bumped on every write)."""
+        return self._config_versions.get(user_id or "default", 0)
+
+    def invalidate_user_config(self, user_id: str) -> None:
+        """Drop cached configuration for ``user_id`` after its config file changed."""
+        self._config_versions[user_id] = self._config_versions.get(user_id, 0) + 1
+        self._user_config_cache.pop(user_id, None)
+        self._merged_config_cache.pop(user_id, None)
 
     def _merge_configs(self, user_id: str, user_config: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -468,7 +499,8 @@ class ConfigService:
                         "migration": migration_report,
                     }
 
-            success = user_manager.update_user_config_file(user_id, persisted_updates)
+            # Shielded so one cancelled caller cannot cancel the shared write result.
+            success = await asyncio.shield(self._queue_user_config_write(user_id, persisted_updates))
             if not success:
                 return {
                     "success": False,
@@ -477,8 +509,7 @@ class ConfigService:
                     "migration": migration_report,
                 }
 
-            if user_id in self._user_config_cache:
-                del self._user_config_cache[user_id]
+            self.invalidate_user_config(user_id)
             reload_sandbox_policy()
 
             if self.event_emitter:
@@ -527,6 +558,33 @@ class ConfigService:
                 "config": {},
             }
 
+    def _queue_user_config_write(self, user_id: str, updates: Dict[str, Any]) -> asyncio.Future:
+        """Coalesce updates for ``user_id`` that arrive in the same loop tick into one write.
+
+        The file layer deep-merges each patch into the stored config, so merging
+        the patches first and writing once gives the same result as writing
+        them one after another. Every caller awaits the shared outcome.
+        """
+        pending = self._pending_config_writes.get(user_id)
+        if pending is None:
+            loop = asyncio.get_running_loop()
+            pending = ({}, loop.create_future())
+            self._pending_config_writes[user_id] = pending
+            loop.call_soon(self._flush_user_config_write, user_id)
+        self._deep_merge(pending[0], deepcopy(updates))
+        return pending[1]
+
+    def _flush_user_config_write(self, user_id: str) -> None:
+        updates, future = self._pending_config_writes.pop(user_id)
+        try:
+            success = bool(user_manager.update_user_config_file(user_id, updates))
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(success)
+
     async def reset_user_config(
         self,
         user_id: str,
@@ -573,8 +631,7 @@ class ConfigService:
                 }
             
             # Clear cache
-            if user_id in self._user_config_cache:
-                del self._user_config_cache[user_id]
+            self.invalidate_user_config(user_id)
             reload_sandbox_policy()
             
             # Emit configuration-changed event
@@ -627,6 +684,7 @@ class ConfigService:
             
             # Clear all user configuration cache entries (default config changed)
             self._user_config_cache.clear()
+            self._merged_config_cache.clear()
             
             logger.info("ConfigService: Default config reloaded")
             
@@ -4,7 +4,6 @@ import asyncio
 from typing import Dict, Set, Optional, Any
 from datetime import datetime, timezone
 from fastapi import WebSocket, WebSocketDisconnect
-import json
 from loguru import logger
 
 from .protocol import (
@@ -12,6 +11,7 @@ from .protocol import (
     MessageType, RequestType, EventType, GatewayProtocol
 )
 from .events import EventEmitter
+from .http.json_codec import dumps_bytes
 
 
 class Connection:
@@ -34,7 +34,7 @@ class Connection:
         if isinstance(message, (ResponseMessage, EventMessage)):
             data = message.model_dump_json()
         elif isinstance(message, dict):
-            data = json.dumps(message, ensure_ascii=False)
+            data = dumps_bytes(message).decode("utf-8")
         else:
             data = str(message)
         
@@ -1,5 +1,6 @@
 from __future__ import annotations
 import asyncio
+import sys
 import time
 import uuid
 from types import SimpleNamespace
@@ -69,6 +70,7 @@ class ConversationService:
         "- If the user explicitly asks for a different language, follow that language.\n"
         "- Do not use UI language as a response-language signal."
     )
+    _BASE_PROMPT_CACHE_SIZE = 128
 
     """Gateway conversation orchestration service."""
 
@@ -105,6 +107,7 @@ class ConversationService:
         self._queue_dropped = 0
         self._queue_coalesced = 0
         self._queue_lock = asyncio.Lock()
+        self._base_prompt_cache: Dict[str, str] = {}
         self._processing_defaults = {
             "max_queue_size": 32,
             "max_retries": 2,
@@ -156,7 +159,8 @@ class ConversationService:
             if not content:
                 return
 
-            session_id = f"{channel}_{sender}"
+            # Interned: it keys the long-lived per-session queue/worker dicts.
+            session_id = sys.intern(f"{channel}_{sender}")
             user_id = sender
             policy = self._resolve_processing_policy(user_id)
             queue_mode, normalized_content = self._parse_queue_hint(
@@ -523,9 +527,9 @@ class ConversationService:
                 )
                 from gateway.http.user_manager import user_manager
 
-                user = user_manager.get_user_by_channel_account(channel, user_id)
+                user = await asyncio.to_thread(user_manager.get_user_by_channel_account, channel, user_id)
                 if user:
-                    user_config = user_manager.get_user_config(user.get("user_id"))
+                    user_config = user_manager.get_user_config(user.get("user_id"), user=user)
         except Exception as e:
             logger.debug("ConversationService: Failed to get config: {}", e)
             from config import config
@@ -533,7 +537,18 @@ class ConversationService:
             prompts_cfg = getattr(config, "prompts", None)
             base_system_prompt = getattr(prompts_cfg, "Promethea_system_prompt", "")
 
-        return self._append_language_policy(self._ensure_core_system_prompt(base_system_prompt)), user_config
+        return self._finalize_base_prompt(base_system_prompt), user_config
+
+    def _finalize_base_prompt(self, prompt: str) -> str:
+        """Core identity + language policy wrapped around ``prompt``, memoized per prompt text."""
+        key = str(prompt or "")
+        cached = self._base_prompt_cache.get(key)
+        if cached is None:
+            cached = self._append_language_policy(self._ensure_core_system_prompt(key))
+            if len(self._base_prompt_cache) >= self._BASE_PROMPT_CACHE_SIZE:
+                self._base_prompt_cache.clear()
+            self._base_prompt_cache[key] = cached
+        return cached
 
     def _append_language_policy(self, prompt: str) -> str:
         text = str(prompt or "").strip()
@@ -655,13 +670,10 @@ class ConversationService:
         user_config: Optional[Dict[str, Any]] = None
         messages: List[Dict[str, Any]] = []
 
+        # Already wrapped with the core identity and language policy.
         base_system_prompt, user_config = await self._get_user_prompt_and_config(
             user_id, channel
         )
-        if user_config:
-            base_system_prompt = self._append_language_policy(
-                self._ensure_core_system_prompt(base_system_prompt)
-            )
 
         assembler_context = run_context
         attachment_rows = list(attachments or [])
@@ -983,8 +995,7 @@ class ConversationService:
         messages: List[Dict[str, Any]] = []
 
         if self.message_manager:
-            if not self.message_manager.get_session(session_id, user_id=user_id):
-                self.message_manager.create_session(session_id, user_id=user_id)
+            self.message_manager.ensure_session(session_id, user_id=user_id)
             if turn_id and hasattr(self.message_manager, "begin_turn"):
                 ok = self.message_manager.begin_turn(
                     session_id=session_id,
@@ -1,8 +1,8 @@
 ﻿"""Event bus used by gateway services."""
 import asyncio
 import logging
-from typing import Dict, List, Callable, Any, Optional
-from collections import defaultdict
+from typing import Deque, Dict, List, Callable, Any, Optional
+from collections import defaultdict, deque
 from .protocol import EventType, EventMessage
 from .observability import TraceEvent, AuditEvent, infer_audit_event
 
@@ -14,24 +14,30 @@ class EventEmitter:
 
     def __init__(self):
         self._listeners: Dict[EventType, List[Callable]] = defaultdict(list)
+        # handler -> iscoroutinefunction(handler), resolved once at registration.
+        self._async_handlers: Dict[Callable, bool] = {}
         self._seq_counter = 0
-        self._event_history: List[EventMessage] = []
         self._max_history = 1000
-        self._trace_history: List[TraceEvent] = []
-        self._audit_history: List[AuditEvent] = []
         self._max_trace_history = 5000
         self._max_audit_history = 5000
+        # Bounded ring buffers: appending to a full deque drops the oldest entry
+        # in O(1) instead of re-slicing the whole history on every emit.
+        self._event_history: Deque[EventMessage] = deque(maxlen=self._max_history)
+        self._trace_history: Deque[TraceEvent] = deque(maxlen=self._max_trace_history)
+        self._audit_history: Deque[AuditEvent] = deque(maxlen=self._max_audit_history)
 
     def on(self, event: EventType, handler: Callable) -> None:
         """Register a listener for an event."""
         if handler not in self._listeners[event]:
             self._listeners[event].append(handler)
+            self._async_handlers[handler] = asyncio.iscoroutinefunction(handler)
             logger.debug(f"Registered handler for event: {event}")
 
     def off(self, event: EventType, handler: Callable) -> None:
         """Unregister a listener."""
         if handler in self._listeners[event]:
             self._listeners[event].remove(handler)
+            self._async_handlers.pop(handler, None)
             logger.debug(f"Unregistered handler for event: {event}")
 
     def once(self, event: EventType, handler: Callable) -> None:
@@ -54,8 +60,6 @@ class EventEmitter:
 
         # Keep bounded event history for diagnostics.
         self._event_history.append(event_msg)
-        if len(self._event_history) > self._max_history:
-            self._event_history = self._event_history[-self._max_history :]
 
         # Structured trace/audit buffering for inspector/doctor usage.
         trace_event = TraceEvent.from_emission(
@@ -64,14 +68,10 @@ class EventEmitter:
             seq=self._seq_counter,
         )
         self._trace_history.append(trace_event)
-        if len(self._trace_history) > self._max_trace_history:
-            self._trace_history = self._trace_history[-self._max_trace_history :]
 
         audit_event = infer_audit_event(trace_event)
         if audit_event is not None:
             self._audit_history.append(audit_event)
-            if len(self._audit_history) > self._max_audit_history:
-                self._audit_history = self._audit_history[-self._max_audit_history :]
 
         # Dispatch handlers.
         handlers = self._listeners.get(event, [])
@@ -80,7 +80,10 @@ class EventEmitter:
             tasks = []
             for handler in handlers:
                 try:
-                    if asyncio.iscoroutinefunction(handler):
+                    is_async = self._async_handlers.get(handler)
+                    if is_async is None:
+                        is_async = asyncio.iscoroutinefunction(handler)
+                    if is_async:
                         tasks.append(handler(event_msg))
                     else:
                         handler(event_msg)
@@ -97,7 +100,7 @@ class EventEmitter:
         if event:
             filtered = [e for e in self._event_history if e.event == event]
             return filtered[-limit:]
-        return self._event_history[-limit:]
+        return list(self._event_history)[-limit:]
 
     def get_trace_history(
         self,
@@ -107,7 +110,7 @@ class EventEmitter:
         user_id: Optional[str] = None,
         limit: int = 200,
     ) -> List[TraceEvent]:
-        events = self._trace_history
+        events = list(self._trace_history)
         if trace_id:
             events = [e for e in events if e.trace_id == trace_id]
         if session_id:
@@ -125,7 +128,7 @@ class EventEmitter:
         action: Optional[str] = None,
         limit: int = 200,
     ) -> List[AuditEvent]:
-        events = self._audit_history
+        events = list(self._audit_history)
         if trace_id:
             events = [e for e in events if e.trace_id == trace_id]
         if session_id:
@@ -142,3 +145,4 @@ class EventEmitter:
             self._listeners[event].clear()
         else:
             self._listeners.clear()
+            self._async_handlers.clear()
@@ -0,0 +1,51 @@
+"""JSON encode/decode helpers that use orjson when it is installed.
+
+orjson is an optional speedup (``pip install promethea-agent[speedups]``);
+without it these helpers fall back to the stdlib with the same compact,
+UTF-8 output Starlette's ``JSONResponse`` produces.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Callable, Optional
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def dumps_bytes(
+    value: Any,
+    *,
+    default: Optional[Callable[[Any], Any]] = None,
+    indent: bool = False,
+) -> bytes:
+    """Serialize ``value`` to UTF-8 JSON bytes.
+
+    Output is compact unless ``indent`` is set, which pretty-prints with two
+    spaces (the only width orjson supports) on both backends.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(value, default=default, option=option)
+    return json.dumps(
+        value,
+        ensure_ascii=False,
+        indent=2 if indent else None,
+        separators=(",", ": ") if indent else (",", ":"),
+        default=default,
+    ).encode("utf-8")
+
+
+def loads(data: bytes | str) -> Any:
+    """Parse JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -216,9 +216,19 @@ class MessageManager:
         self.session[key] = Session()
         logger.info(f"Created new session {session_id}")
 
-        self.session_store.save_all(self.session)
+        self.session_store.save_all(self.session, changed=(key,))
         return session_id
     
+    def ensure_session(
+        self,
+        session_id: Optional[str] = None,
+        user_id: str = "default_user",
+    ) -> str:
+        """Return ``session_id``, creating the session first if it does not exist."""
+        if session_id and self._resolve_session_key(session_id, user_id=user_id):
+            return session_id
+        return self.create_session(session_id=session_id, user_id=user_id)
+
     def get_session(
         self,
         session_id: str,
@@ -262,7 +272,7 @@ class MessageManager:
         
         logger.debug(f"Session {session_id} new message: {role} - {content[:50]}...")
 
-        self.session_store.save_all(self.session)
+        self.session_store.save_all(self.session, changed=(key,))
         
         # Sync to memory system asynchronously (if enabled) to avoid blocking main flow.
         if sync_memory and self.memory_adapter and self.memory_adapter.is_enabled():
@@ -328,7 +338,7 @@ class MessageManager:
         if not session.messages and (not session.title or session.title == "New Chat"):
             session.title = self._generate_session_title(user_content)
         session.last_activity = time.time()
-        self.session_store.save_all(self.session)
+        self.session_store.save_all(self.session, changed=(key,))
         return True
 
     def commit_turn(
@@ -374,7 +384,7 @@ class MessageManager:
         if len(session.completed_turn_ids) > 1000:
             session.completed_turn_ids = session.completed_turn_ids[-1000:]
 
-        self.session_store.save_all(self.session)
+        self.session_store.save_all(self.session, changed=(key,))
 
         # Keep memory graph consistent with turn-based write path.
         if self.memory_adapter and self.memory_adapter.is_enabled():
@@ -411,7 +421,7 @@ class MessageManager:
         if turn_id in session.pending_turns:
             session.pending_turns.pop(turn_id, None)
             session.last_activity = time.time()
-            self.session_store.save_all(self.session)
+            self.session_store.save_all(self.session, changed=(key,))
             return True
         return False
     
@@ -466,8 +476,9 @@ class MessageManager:
             return []
         if count is None:
             count = self.max_messages_per_session
-        messages = self.get_messages(session_id, user_id=user_id)
-        return messages[-count:] if messages else []
+        session = self.session.get(key)
+        # Slice before converting so only the returned tail is materialized.
+        return [_model_to_dict(m) for m in session.messages[-count:]]
     
     def build_conversation(
         self, 
@@ -505,7 +516,7 @@ class MessageManager:
             title = self._derive_title_from_messages(session)
             if title != session.title:
                 session.title = title
-                self.session_store.save_all(self.session)
+                self.session_store.save_all(self.session, changed=(key,))
         last_msg_preview = (
             session.messages[-1].content[:100] + "..." if session.messages else ""
         )
@@ -596,7 +607,7 @@ class MessageManager:
         if not key or key not in self.session:
             return False
         self.session[key].pinned = bool(pinned)
-        self.session_store.save_all(self.session)
+        self.session_store.save_all(self.session, changed=(key,))
         return True
 
     def count_pinned_sessions(self, *, user_id: str) -> int:
@@ -634,6 +645,7 @@ class MessageManager:
         skipped = 0
         remapped = 0
         restored_ids: List[str] = []
+        imported_keys: List[str] = []
 
         def _next_id(base_sid: str) -> str:
             candidate = base_sid or self.generate_session_id()
@@ -676,9 +688,10 @@ class MessageManager:
             self.session[key] = session
             imported += 1
             restored_ids.append(target_sid)
+            imported_keys.append(key)
 
         if imported:
-            self.session_store.save_all(self.session)
+            self.session_store.save_all(self.session, changed=imported_keys)
         return {
             "imported_sessions": imported,
             "skipped_sessions": skipped,
@@ -692,16 +705,31 @@ class MessageManager:
         if key in self.session:
             del self.session[key]
             logger.info(f"Deleted session: {session_id}")
-            self.session_store.save_all(self.session)
+            self.session_store.save_all(self.session, changed=())
             return True
         return False
     
+    def delete_user_sessions(self, *, user_id: str) -> int:
+        """Delete every session owned by a user and persist once."""
+        expected = self._normalize_user_id(user_id)
+        owned_keys = [
+            key
+            for key in self.session
+            if (self._split_session_key(key)[0] or "default_user") == expected
+        ]
+        for key in owned_keys:
+            del self.session[key]
+        if owned_keys:
+            logger.info(f"Deleted {len(owned_keys)} sessions for user: {expected}")
+            self.session_store.save_all(self.session, changed=())
+        return len(owned_keys)
+
     def clear_all_sessions(self) -> int:
         """Clear all sessions and return the number removed."""
         count = len(self.session)
         self.session.clear()
         logger.info(f"Cleared all sessions: {count}")
-        self.session_store.save_all(self.session)
+        self.session_store.save_all(self.session, changed=())
         return count
     
     def cleanup_old_sessions(self, max_age_hours: int = 0) -> int:
@@ -726,7 +754,7 @@ class MessageManager:
         
         if expired_session_ids:
             logger.info(f"Removed expired sessions: {len(expired_session_ids)}")
-            self.session_store.save_all(self.session)
+            self.session_store.save_all(self.session, changed=())
         return len(expired_session_ids)
 
     def set_pending_confirmation(
@@ -739,7 +767,7 @@ class MessageManager:
         key = self._resolve_session_key(session_id, user_id=user_id)
         if key in self.session:
             self.session[key].pending_confirmation = confirmation_data
-            self.session_store.save_all(self.session)
+            self.session_store.save_all(self.session, changed=(key,))
             return True
         return False
 
@@ -763,7 +791,7 @@ class MessageManager:
         key = self._resolve_session_key(session_id, user_id=user_id)
         if key in self.session:
             self.session[key].pending_confirmation = None
-            self.session_store.save_all(self.session)
+            self.session_store.save_all(self.session, changed=(key,))
 
     def set_agent_type(
         self,
@@ -775,6 +803,7 @@ class MessageManager:
         key = self._resolve_session_key(session_id, user_id=user_id)
         if key in self.session:
             self.session[key].agent_type = agent_type
+            self.session_store.save_all(self.session, changed=(key,))
             return True
         return False
 
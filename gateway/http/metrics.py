@@ -1,9 +1,12 @@
 ﻿"""In-process metrics collector for HTTP and gateway stats."""
 
 import time
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 from datetime import datetime, timezone
 
+# Label-value escaping required by the Prometheus text exposition format.
+_PROMETHEUS_LABEL_ESCAPES = str.maketrans({"\\": "\\\\", '"': '\\"', "\n": "\\n"})
+
 
 class MetricsCollector:
     """Collect runtime counters and basic latency statistics."""
@@ -26,6 +29,9 @@ class MetricsCollector:
             'start_time': datetime.now(timezone.utc)
         }
         self.http_by_path: Dict[str, Dict[str, float]] = {}
+        self._http_buckets: Dict[Tuple[str, str], Dict[str, float]] = {}
+        # path key -> escaped per-path sample prefixes for to_prometheus_text.
+        self._prometheus_path_prefixes: Dict[str, Tuple[str, str]] = {}
     
     def record_llm_call(self, duration: float, prompt_tokens: int = 0, completion_tokens: int = 0):
         """Record one LLM call."""
@@ -104,41 +110,56 @@ class MetricsCollector:
         }
 
     def record_http_request(self, method: str, path: str, status_code: int, duration_ms: float):
-        self.stats['http_requests_total'] += 1
-        self.stats['http_latency_ms_total'] += float(duration_ms)
-        self.stats['http_latency_ms_count'] += 1
-        if int(status_code) >= 400:
-            self.stats['http_errors_total'] += 1
+        duration_ms = float(duration_ms)
+        is_error = int(status_code) >= 400
+        stats = self.stats
+        stats['http_requests_total'] += 1
+        stats['http_latency_ms_total'] += duration_ms
+        stats['http_latency_ms_count'] += 1
+        if is_error:
+            stats['http_errors_total'] += 1
 
-        key = f"{method} {path}"
-        if key not in self.http_by_path:
-            self.http_by_path[key] = {"count": 0, "latency_ms_total": 0.0, "errors": 0}
-        self.http_by_path[key]["count"] += 1
-        self.http_by_path[key]["latency_ms_total"] += float(duration_ms)
-        if int(status_code) >= 400:
-            self.http_by_path[key]["errors"] += 1
+        # (method, path) -> the same counter dict exposed via http_by_path.
+        bucket = self._http_buckets.get((method, path))
+        if bucket is None:
+            bucket = self.http_by_path.setdefault(
+                f"{method} {path}", {"count": 0, "latency_ms_total": 0.0, "errors": 0}
+            )
+            self._http_buckets[(method, path)] = bucket
+        bucket["count"] += 1
+        bucket["latency_ms_total"] += duration_ms
+        if is_error:
+            bucket["errors"] += 1
 
     def to_prometheus_text(self) -> str:
-        lines = [
-            "# HELP promethea_http_requests_total Total HTTP requests",
-            "# TYPE promethea_http_requests_total counter",
-            f"promethea_http_requests_total {self.stats['http_requests_total']}",
-            "# HELP promethea_http_errors_total Total HTTP error responses",
-            "# TYPE promethea_http_errors_total counter",
-            f"promethea_http_errors_total {self.stats['http_errors_total']}",
-            "# HELP promethea_http_request_duration_ms_total Total HTTP request latency in milliseconds",
-            "# TYPE promethea_http_request_duration_ms_total counter",
-            f"promethea_http_request_duration_ms_total {self.stats['http_latency_ms_total']}",
+        parts = [
+            "# HELP promethea_http_requests_total Total HTTP requests\n"
+            "# TYPE promethea_http_requests_total counter\n"
+            f"promethea_http_requests_total {self.stats['http_requests_total']}\n"
+            "# HELP promethea_http_errors_total Total HTTP error responses\n"
+            "# TYPE promethea_http_errors_total counter\n"
+            f"promethea_http_errors_total {self.stats['http_errors_total']}\n"
+            "# HELP promethea_http_request_duration_ms_total Total HTTP request latency in milliseconds\n"
+            "# TYPE promethea_http_request_duration_ms_total counter\n"
+            f"promethea_http_request_duration_ms_total {self.stats['http_latency_ms_total']}\n"
         ]
+        append = parts.append
+        path_prefixes = self._prometheus_path_prefixes
         for path, data in self.http_by_path.items():
-            escaped = path.replace('"', '\\"')
-            lines.append(
-                f'promethea_http_requests_by_path_total{{path="{escaped}"}} {data["count"]}'
-            )
-            lines.append(
-                f'promethea_http_errors_by_path_total{{path="{escaped}"}} {data["errors"]}'
-            )
-        return "\n".join(lines) + "\n"
+            prefixes = path_prefixes.get(path)
+            if prefixes is None:
+                label = path.translate(_PROMETHEUS_LABEL_ESCAPES)
+                prefixes = (
+                    f'promethea_http_requests_by_path_total{{path="{label}"}} ',
+                    f'\npromethea_http_errors_by_path_total{{path="{label}"}} ',
+                )
+                path_prefixes[path] = prefixes
+            append(prefixes[0])
+            append(str(data["count"]))
+            append(prefixes[1])
+            append(str(data["errors"]))
+            append("\n")
+        return "".join(parts)
     
     def reset(self):
         """Reset all counters."""
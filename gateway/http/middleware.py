@@ -1,19 +1,20 @@
 ﻿from __future__ import annotations
 
+import json
 import time
 import uuid
-from collections import defaultdict, deque
+from collections import OrderedDict
 from dataclasses import dataclass
 from threading import Lock
-from typing import Deque, Dict
+from typing import List, Tuple
 import os
 
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from jose import JWTError
 from loguru import logger
 
-from .routes.auth import decode_access_token
+from .routes.auth import decode_access_token, extract_access_token
 from .state import metrics
 from gateway_integration import get_gateway_integration
 
@@ -22,38 +23,109 @@ from gateway_integration import get_gateway_integration
 class RateLimitConfig:
     requests: int = 120
     window_seconds: int = 60
+    max_keys: int = 100_000
 
 
 class InMemoryRateLimiter:
+    """Token-bucket limiter keyed by user id or client address.
+
+    Each key keeps a ``[tokens, last_ts]`` pair that refills continuously at
+    ``requests / window_seconds`` tokens per second, capped at ``requests``.
+    Keys are spread across striped locks so unrelated clients never contend.
+    Every stripe is an LRU: buckets idle for a whole window are full again and
+    get dropped, and the least recently seen key is evicted past ``max_keys``.
+    """
+
+    _LOCK_STRIPES = 64
+
     def __init__(self, cfg: RateLimitConfig):
         self.cfg = cfg
-        self._hits: Dict[str, Deque[float]] = defaultdict(deque)
-        self._lock = Lock()
+        self._capacity = float(max(0, cfg.requests))
+        self._window = max(1.0, float(cfg.window_seconds))
+        self._refill_per_second = self._capacity / self._window
+        self._stripe_max_keys = max(1, int(cfg.max_keys) // self._LOCK_STRIPES)
+        self._stripes: Tuple[OrderedDict[str, List[float]], ...] = tuple(
+            OrderedDict() for _ in range(self._LOCK_STRIPES)
+        )
+        self._locks = tuple(Lock() for _ in range(self._LOCK_STRIPES))
+
+    def __len__(self) -> int:
+        return sum(len(buckets) for buckets in self._stripes)
 
     def allow(self, key: str) -> bool:
-        now = time.time()
-        threshold = now - self.cfg.window_seconds
-        with self._lock:
-            q = self._hits[key]
-            while q and q[0] < threshold:
-                q.popleft()
-            if len(q) >= self.cfg.requests:
-                return False
-            q.append(now)
-            return True
+        now = time.monotonic()
+        stripe = hash(key) % self._LOCK_STRIPES
+        buckets = self._stripes[stripe]
+        with self._locks[stripe]:
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = [self._capacity, now]
+                buckets[key] = bucket
+            else:
+                buckets.move_to_end(key)
+            tokens = bucket[0] + (now - bucket[1]) * self._refill_per_second
+            if tokens > self._capacity:
+                tokens = self._capacity
+            bucket[1] = now
+            if tokens < 1.0:
+                bucket[0] = tokens
+                allowed = False
+            else:
+                bucket[0] = tokens - 1.0
+                allowed = True
+            self._evict(buckets, now)
+            return allowed
+
+    def _evict(self, buckets: OrderedDict[str, List[float]], now: float) -> None:
+        idle_before = now - self._window
+        while buckets:
+            oldest_key = next(iter(buckets))
+            if buckets[oldest_key][1] > idle_before and len(buckets) <= self._stripe_max_keys:
+                break
+            del buckets[oldest_key]
+
+
+API_PREFIX = "/api"
+PUBLIC_PATHS = frozenset(
+    {
+        "/api/auth/login",
+        "/api/auth/register",
+        "/api/bootstrap",
+        "/api/status",
+        "/api/metrics",
+        "/health",
+        "/gateway/status",
+    }
+)
+
+
+def _error_body_prefix(code: str, message: str) -> bytes:
+    body = json.dumps(
+        {"status": "error", "error": {"code": code, "message": message}},
+        separators=(",", ":"),
+    )
+    return body[:-1].encode("utf-8") + b',"request_id":'
+
+
+_UNAUTHORIZED_BODY_PREFIX = _error_body_prefix("unauthorized", "Invalid token")
+_RATE_LIMITED_BODY_PREFIX = _error_body_prefix("rate_limited", "Too many requests")
+
+
+def _canned_error_response(body_prefix: bytes, status_code: int, request_id: str | None) -> Response:
+    """Finish a pre-serialized error body with the (JSON-escaped) request id."""
+    return Response(
+        content=body_prefix + json.dumps(request_id).encode("utf-8") + b"}",
+        status_code=status_code,
+        media_type="application/json",
+    )
 
 
 def register_http_middlewares(app: FastAPI) -> None:
-    auth_cookie_name = os.getenv("AUTH__COOKIE_NAME", "promethea_auth")
     integration = get_gateway_integration()
     rate_cfg = {}
     try:
         if integration and isinstance(integration.config, dict):
-            rate_cfg = (
-                ((integration.config.get("http") or {}).get("rate_limit") or {})
-                if isinstance(integration.config, dict)
-                else {}
-            )
+            rate_cfg = (integration.config.get("http") or {}).get("rate_limit") or {}
     except Exception:
         rate_cfg = {}
 
@@ -71,25 +143,47 @@ def register_http_middlewares(app: FastAPI) -> None:
                     str(rate_cfg.get("window_seconds", 60)),
                 )
             ),
+            max_keys=int(
+                os.getenv(
+                    "GATEWAY_RATE_LIMIT_MAX_KEYS",
+                    str(rate_cfg.get("max_keys", 100_000)),
+                )
+            ),
         )
     )
-    public_paths = {
-        "/api/auth/login",
-        "/api/auth/register",
-        "/api/bootstrap",
-        "/api/status",
-        "/api/metrics",
-        "/health",
-        "/gateway/status",
-    }
+
+    slow_request_ms = float(os.getenv("GATEWAY_SLOW_REQUEST_MS", "1000"))
+    # Routine fast successes are only logged on request; the metrics below still count them.
+    log_routine_requests = str(os.getenv("GATEWAY_LOG_ROUTINE_REQUESTS", "false")).lower() in {"1", "true", "yes", "on"}
 
     @app.middleware("http")
     async def request_context_and_auth(request: Request, call_next):
         request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
         request.state.request_id = request_id
         request.state.user_id = None
+        request.state.jwt_payload = None
+        path = request.url.path
+        is_api = path.startswith(API_PREFIX)
+
+        token = extract_access_token(request)
+        token_rejected = False
+        if token:
+            try:
+                payload = decode_access_token(token)
+                request.state.jwt_payload = payload
+                request.state.user_id = payload.get("sub")
+            except JWTError:
+                token_rejected = is_api and path not in PUBLIC_PATHS
+
+        if is_api:
+            # Rate limiting lives here so the bucket key sees the decoded user id,
+            # and runs before the 401 so invalid-token floods are limited per host.
+            client_host = request.client.host if request.client else "unknown"
+            if not limiter.allow(str(request.state.user_id or client_host)):
+                return _canned_error_response(_RATE_LIMITED_BODY_PREFIX, 429, request_id)
+            if token_rejected:
+                return _canned_error_response(_UNAUTHORIZED_BODY_PREFIX, 401, request_id)
 
-        if request.url.path.startswith("/api"):
             live_integration = get_gateway_integration()
             if live_integration and hasattr(live_integration, "maybe_refresh_plugins"):
                 try:
@@ -97,48 +191,10 @@ def register_http_middlewares(app: FastAPI) -> None:
                 except Exception as plugin_refresh_err:
                     logger.warning("Plugin auto-refresh check failed: {}", plugin_refresh_err)
 
-        auth = request.headers.get("Authorization", "")
-        token = ""
-        if auth.startswith("Bearer "):
-            token = auth[7:].strip()
-        if not token:
-            token = request.cookies.get(auth_cookie_name, "")
-        if token:
-            try:
-                payload = decode_access_token(token)
-                request.state.user_id = payload.get("sub")
-            except JWTError:
-                if request.url.path.startswith("/api") and request.url.path not in public_paths:
-                    return JSONResponse(
-                        status_code=401,
-                        content={
-                            "status": "error",
-                            "error": {"code": "unauthorized", "message": "Invalid token"},
-                            "request_id": request_id,
-                        },
-                    )
-
         response = await call_next(request)
         response.headers["X-Request-ID"] = request_id
         return response
 
-    @app.middleware("http")
-    async def rate_limit(request: Request, call_next):
-        if request.url.path.startswith("/api"):
-            user_id = getattr(request.state, "user_id", None)
-            ip = request.client.host if request.client else "unknown"
-            key = str(user_id or ip)
-            if not limiter.allow(key):
-                return JSONResponse(
-                    status_code=429,
-                    content={
-                        "status": "error",
-                        "error": {"code": "rate_limited", "message": "Too many requests"},
-                        "request_id": getattr(request.state, "request_id", None),
-                    },
-                )
-        return await call_next(request)
-
     @app.middleware("http")
     async def logging_and_metrics(request: Request, call_next):
         start = time.perf_counter()
@@ -149,23 +205,32 @@ def register_http_middlewares(app: FastAPI) -> None:
             return response
         finally:
             elapsed_ms = (time.perf_counter() - start) * 1000
+            method = request.method
+            path = request.url.path
             try:
+                # Label by route template so path params don't explode the series count.
+                route = request.scope.get("route")
                 metrics.record_http_request(
-                    method=request.method,
-                    path=request.url.path,
+                    method=method,
+                    path=getattr(route, "path", None) or path,
                     status_code=status_code,
                     duration_ms=elapsed_ms,
                 )
             except Exception:
                 pass
-            logger.info(
-                "{} {} -> {} ({:.1f}ms) rid={}",
-                request.method,
-                request.url.path,
-                status_code,
-                elapsed_ms,
-                getattr(request.state, "request_id", "-"),
-            )
+            # The app.log sink accepts DEBUG, so a DEBUG record is still formatted
+            # and queued; routine requests are skipped instead of demoted.
+            notable = status_code >= 400 or elapsed_ms >= slow_request_ms
+            if notable or log_routine_requests:
+                # request_context_and_auth (the innermost layer) always sets request_id first.
+                (logger.info if notable else logger.debug)(
+                    "{} {} -> {} ({:.1f}ms) rid={}",
+                    method,
+                    path,
+                    status_code,
+                    elapsed_ms,
+                    request.state.request_id,
+                )
 
     @app.middleware("http")
     async def normalized_error_response(request: Request, call_next):
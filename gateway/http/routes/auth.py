@@ -1,7 +1,9 @@
+import asyncio
 import os
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
-from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from loguru import logger
 from neo4j.exceptions import AuthError, ServiceUnavailable
@@ -28,7 +30,8 @@ SESSION_TOKEN_EXPIRE_MINUTES = 60 * 12
 AUTH_COOKIE_NAME = os.getenv("AUTH__COOKIE_NAME", "promethea_auth")
 AUTH_COOKIE_SECURE = str(os.getenv("AUTH__COOKIE_SECURE", "false")).lower() in {"1", "true", "yes", "on"}
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login", auto_error=False)
+DECODED_TOKEN_CACHE_SIZE = 4096
+_decoded_token_cache: "OrderedDict[str, tuple[dict, float]]" = OrderedDict()
 
 
 def create_access_token(data: dict, *, expires_minutes: int = ACCESS_TOKEN_EXPIRE_MINUTES):
@@ -39,12 +42,46 @@ def create_access_token(data: dict, *, expires_minutes: int = ACCESS_TOKEN_EXPIR
 
 
 def decode_access_token(token: str) -> dict:
-    """Decode and validate a JWT access token."""
-    return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-
-
-async def get_current_user_id(request: Request, token: str | None = Depends(oauth2_scheme)) -> str:
-    middleware_user_id = getattr(request.state, "user_id", None)
+    """Decode and validate a JWT access token.
+
+    Verified payloads are cached per token until their ``exp`` claim, so
+    repeat requests from the same client skip signature verification.
+    """
+    cached = _decoded_token_cache.get(token)
+    if cached is not None:
+        payload, expires_at = cached
+        if expires_at > time.time():
+            return dict(payload)
+        _decoded_token_cache.pop(token, None)
+
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    expires_at = payload.get("exp")
+    if isinstance(expires_at, (int, float)):
+        _decoded_token_cache[token] = (payload, float(expires_at))
+        while len(_decoded_token_cache) > DECODED_TOKEN_CACHE_SIZE:
+            _decoded_token_cache.popitem(last=False)
+    return dict(payload)
+
+
+def clear_decoded_token_cache() -> None:
+    _decoded_token_cache.clear()
+
+
+def extract_access_token(request: Request) -> str:
+    """Return the bearer token from the Authorization header or auth cookie."""
+    headers = getattr(request, "headers", None) or {}
+    auth_header = headers.get("Authorization", "")
+    if auth_header.startswith("Bearer "):
+        token = auth_header[7:].strip()
+        if token:
+            return token
+    cookies = getattr(request, "cookies", None) or {}
+    return cookies.get(AUTH_COOKIE_NAME, "")
+
+
+async def get_current_user_id(request: Request) -> str:
+    state = request.state
+    middleware_user_id = getattr(state, "user_id", None)
     if middleware_user_id:
         return str(middleware_user_id)
 
@@ -53,9 +90,11 @@ async def get_current_user_id(request: Request, token: str | None = Depends(oaut
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    if not token:
-        cookies = getattr(request, "cookies", {}) or {}
-        token = cookies.get(AUTH_COOKIE_NAME)
+    if hasattr(state, "jwt_payload"):
+        # The HTTP middleware already decoded this request's token (if any).
+        raise credentials_exception
+
+    token = extract_access_token(request)
     if not token:
         raise credentials_exception
 
@@ -71,7 +110,7 @@ async def get_current_user_id(request: Request, token: str | None = Depends(oaut
 
 @router.post("/auth/register")
 async def register(user: UserRegister):
-    user_id = user_manager.create_user(user.username, user.password, user.agent_name)
+    user_id = await asyncio.to_thread(user_manager.create_user, user.username, user.password, user.agent_name)
     if not user_id:
         can_register, reason = user_manager.can_register()
         if not can_register and reason in {
@@ -104,7 +143,7 @@ async def register(user: UserRegister):
 @router.post("/auth/login")
 async def login(user: UserLogin, response: Response):
     try:
-        db_user = user_manager.verify_user(user.username, user.password)
+        db_user = await asyncio.to_thread(user_manager.verify_user, user.username, user.password)
     except AuthError:
         raise HTTPException(
             status_code=503,
@@ -132,7 +171,7 @@ async def login(user: UserLogin, response: Response):
         expires_minutes=token_minutes,
     )
 
-    user_config = user_manager.get_user_config(user_id)
+    user_config = user_manager.get_user_config(user_id, user=db_user)
     agent_name = user_config.get("agent_name", db_user.get("agent_name", "Promethea"))
     system_prompt = user_config.get("system_prompt", db_user.get("system_prompt"))
     secrets_status = get_user_secrets_status(user_id)
@@ -168,12 +207,12 @@ async def logout(response: Response):
 
 @router.get("/user/profile")
 async def get_profile(user_id: str = Depends(get_current_user_id)):
-    user_config = user_manager.get_user_config(user_id)
-    secrets_status = get_user_secrets_status(user_id)
-    api_key_configured = bool((secrets_status.get("api") or {}).get("api_key_configured"))
-    user = user_manager.get_user_by_id(user_id)
+    user = await asyncio.to_thread(user_manager.get_user_by_id, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    user_config = user_manager.get_user_config(user_id, user=user)
+    secrets_status = get_user_secrets_status(user_id)
+    api_key_configured = bool((secrets_status.get("api") or {}).get("api_key_configured"))
 
     return {
         "user_id": user.get("user_id"),
@@ -195,6 +234,19 @@ def _get_config_service():
     return gateway_server.config_service
 
 
+def _invalidate_cached_user_config(user_id: str) -> None:
+    """Best-effort drop of the config service's cached config for ``user_id``."""
+    try:
+        integration = get_gateway_integration()
+        gateway_server = integration.get_gateway_server() if integration else None
+        config_service = getattr(gateway_server, "config_service", None)
+        invalidate = getattr(config_service, "invalidate_user_config", None) if config_service else None
+        if callable(invalidate):
+            invalidate(user_id)
+    except Exception as e:
+        logger.warning("user config: failed to invalidate cached config for {}: {}", user_id, e)
+
+
 @router.post("/user/config")
 async def update_config(
     req: UserConfigUpdate,
@@ -233,7 +285,8 @@ async def update_config(
         if exc.status_code != 503:
             raise
         # Fallback: keep legacy behavior if gateway services are unavailable.
-        graph_sync_ok = user_manager.update_user_config(
+        graph_sync_ok = await asyncio.to_thread(
+            user_manager.update_user_config,
             user_id,
             agent_name=req.agent_name,
             system_prompt=req.system_prompt,
@@ -241,6 +294,8 @@ async def update_config(
         file_ok = user_manager.update_user_config_file(user_id, payload) if payload else True
         if not file_ok:
             raise HTTPException(status_code=500, detail="Update config failed")
+        # The config service may exist but have failed with 503 itself.
+        _invalidate_cached_user_config(user_id)
         return {
             "status": "success",
             "message": "Config updated (legacy fallback)",
@@ -255,7 +310,7 @@ async def bind_channel(
     request: ChannelBindRequest,
     user_id: str = Depends(get_current_user_id),
 ):
-    success = user_manager.bind_channel_account(user_id, request.channel, request.account_id)
+    success = await asyncio.to_thread(user_manager.bind_channel_account, user_id, request.channel, request.account_id)
     if not success:
         raise HTTPException(status_code=500, detail="Bind failed")
     return {"status": "success", "message": f"bound {request.channel}"}
@@ -279,10 +334,7 @@ async def delete_user_account(
     try:
         from gateway.http.message_manager import message_manager
 
-        sessions = message_manager.get_all_sessions_info(user_id=user_id)
-        for sid in list(sessions.keys()):
-            raw_sid = sid.split("::", 1)[-1] if "::" in sid else sid
-            message_manager.delete_session(raw_sid, user_id=user_id)
+        message_manager.delete_user_sessions(user_id=user_id)
     except Exception as e:
         logger.warning("user delete: failed to clear session cache for {}: {}", user_id, e)
 
@@ -293,6 +345,9 @@ async def delete_user_account(
         if callable(purge):
             purge(user_id)
         config_service = getattr(gateway, "config_service", None)
+        invalidate = getattr(config_service, "invalidate_user_config", None) if config_service else None
+        if callable(invalidate):
+            invalidate(user_id)
         cache = getattr(config_service, "_user_config_cache", None) if config_service else None
         if isinstance(cache, dict):
             cache.pop(user_id, None)
@@ -300,7 +355,7 @@ async def delete_user_account(
     except Exception as e:
         logger.warning("user delete: failed to clear runtime user state for {}: {}", user_id, e)
 
-    success = user_manager.delete_user(user_id)
+    success = await asyncio.to_thread(user_manager.delete_user, user_id)
     if not success:
         raise HTTPException(status_code=500, detail="Delete user failed")
     return {"status": "success", "message": "User account deleted"}
@@ -1,17 +1,48 @@
 ﻿from __future__ import annotations
 
+import asyncio
+from itertools import groupby
+from typing import Any, Dict, List
+
 from fastapi import APIRouter, Depends, HTTPException, Request
 from loguru import logger
 
 from gateway.protocol import RequestType
 
 from ..dispatcher import dispatch_gateway_method
-from ..schemas import BatchRequest
+from ..schemas import BatchRequest, BatchRequestItem
 from .auth import get_current_user_id
 
 
 router = APIRouter()
 
+_METHOD_MAP: Dict[str, RequestType] = {m.value: m for m in RequestType}
+
+
+async def _dispatch_item(
+    item: BatchRequestItem,
+    method: RequestType,
+    user_id: str,
+    raw_request: Request,
+    limiter: asyncio.Semaphore,
+) -> Dict[str, Any]:
+    try:
+        async with limiter:
+            payload = await dispatch_gateway_method(
+                method=method,
+                params=item.params or {},
+                user_id=user_id,
+                timeout_ms=item.timeout_ms,
+                retries=item.retries,
+                request=raw_request,
+            )
+        return {"method": item.method, "ok": True, "payload": payload}
+    except HTTPException as e:
+        return {"method": item.method, "ok": False, "error": str(e.detail)}
+    except Exception as e:
+        logger.error("batch request failed: {}", e)
+        return {"method": item.method, "ok": False, "error": str(e)}
+
 
 @router.post("/batch")
 async def batch_dispatch(
@@ -22,41 +53,40 @@ async def batch_dispatch(
     if not request.requests:
         raise HTTPException(status_code=400, detail="requests is required")
 
-    # Higher priority first.
+    # Higher priority groups run first and in order. Items run one at a time
+    # unless the caller opts into max_concurrency > 1, in which case items
+    # sharing a priority are dispatched together.
     sorted_items = sorted(
         request.requests,
         key=lambda x: int(x.priority),
         reverse=True,
     )
+    max_concurrency = request.max_concurrency
+    limiter = asyncio.Semaphore(max_concurrency)
     results = []
-    for item in sorted_items:
-        try:
-            method = RequestType(item.method)
-        except Exception:
-            results.append(
-                {
-                    "method": item.method,
-                    "ok": False,
-                    "error": f"Unknown request method: {item.method}",
-                }
-            )
-            continue
+    for _, group in groupby(sorted_items, key=lambda x: int(x.priority)):
+        slots: List[Dict[str, Any] | None] = []
+        pending = []
+        for item in group:
+            method = _METHOD_MAP.get(item.method)
+            if method is None:
+                slots.append(
+                    {
+                        "method": item.method,
+                        "ok": False,
+                        "error": f"Unknown request method: {item.method}",
+                    }
+                )
+                continue
+            pending.append((len(slots), _dispatch_item(item, method, user_id, raw_request, limiter)))
+            slots.append(None)
 
-        try:
-            payload = await dispatch_gateway_method(
-                method=method,
-                params=item.params or {},
-                user_id=user_id,
-                timeout_ms=item.timeout_ms,
-                retries=item.retries,
-                request=raw_request,
-            )
-            results.append({"method": item.method, "ok": True, "payload": payload})
-        except HTTPException as e:
-            results.append({"method": item.method, "ok": False, "error": str(e.detail)})
-        except Exception as e:
-            logger.error("batch request failed: {}", e)
-            results.append({"method": item.method, "ok": False, "error": str(e)})
+        if max_concurrency == 1:
+            outcomes = [await task for _, task in pending]
+        else:
+            outcomes = await asyncio.gather(*(task for _, task in pending))
+        for (index, _), outcome in zip(pending, outcomes):
+            slots[index] = outcome
+        results.extend(slots)
 
     return {"status": "success", "results": results}
-
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import itertools
+import secrets
+import time
 import uuid
+from contextlib import aclosing
 
 from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import StreamingResponse
@@ -11,6 +14,7 @@ from loguru import logger
 from gateway.protocol import EventType, RequestType
 
 from ..dispatcher import dispatch_gateway_method, get_gateway_server
+from ..json_codec import dumps_bytes
 from ..schemas import ChatRequest, ChatResponse, ConfirmToolRequest
 from .auth import get_current_user_id
 
@@ -18,6 +22,147 @@ from .auth import get_current_user_id
 router = APIRouter()
 
 
+_SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+DEFAULT_STREAM_FLUSH_CHARS = 512
+DEFAULT_STREAM_FLUSH_MS = 10
+STREAM_PREFETCH_CHUNKS = 64
+_STREAM_END = object()
+_BACKGROUND_TASKS: set[asyncio.Task] = set()
+# Turn ids only need to be unique per session; a per-process prefix plus a
+# clock and counter avoids an urandom read and UUID formatting per turn.
+_TURN_ID_PREFIX = secrets.token_hex(4)
+_TURN_SEQ = itertools.count()
+
+
+def _sse(payload: dict) -> bytes:
+    return b"data: " + dumps_bytes(payload) + b"\n\n"
+
+
+# Token frames only vary in their content, so only that string is encoded per chunk.
+_TEXT_FRAME_PREFIX = b'data: {"type":"text","content":'
+_FRAME_SUFFIX = b"}\n\n"
+_TURN_START_FAILED_FRAME = _sse({"type": "error", "content": "failed to start turn"})
+_TURN_COMMIT_FAILED_FRAME = _sse({"type": "error", "content": "failed to commit turn"})
+
+
+def _sse_text(content: str) -> bytes:
+    return _TEXT_FRAME_PREFIX + dumps_bytes(content) + _FRAME_SUFFIX
+
+
+def _next_turn_id() -> str:
+    return f"{_TURN_ID_PREFIX}{time.time_ns():x}{next(_TURN_SEQ):x}"
+
+
+def _stream_flush_settings(user_config) -> tuple[int, float]:
+    system_cfg = (user_config or {}).get("system") if isinstance(user_config, dict) else None
+    system_cfg = system_cfg if isinstance(system_cfg, dict) else {}
+    try:
+        flush_chars = int(system_cfg.get("stream_flush_chars", DEFAULT_STREAM_FLUSH_CHARS))
+        flush_ms = float(system_cfg.get("stream_flush_ms", DEFAULT_STREAM_FLUSH_MS))
+    except (TypeError, ValueError):
+        flush_chars, flush_ms = DEFAULT_STREAM_FLUSH_CHARS, DEFAULT_STREAM_FLUSH_MS
+    return flush_chars, flush_ms / 1000.0
+
+
+async def _prefetch_chunks(chunks, *, maxsize: int = STREAM_PREFETCH_CHUNKS):
+    """Read ``chunks`` ahead of the consumer through a bounded queue.
+
+    A producer task pulls from the upstream stream while frames are being
+    written; once ``maxsize`` chunks are waiting it blocks, so a slow client
+    holds back the upstream read instead of growing memory. Upstream errors
+    are re-raised to the consumer.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, maxsize))
+    failure = None
+
+    async def _pump() -> None:
+        nonlocal failure
+        try:
+            async for chunk in chunks:
+                await queue.put(chunk)
+        except Exception as exc:
+            failure = exc
+        await queue.put(_STREAM_END)
+
+    producer = asyncio.create_task(_pump())
+    try:
+        while True:
+            chunk = await queue.get()
+            if chunk is _STREAM_END:
+                if failure is not None:
+                    raise failure
+                return
+            yield chunk
+    finally:
+        if not producer.done():
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+
+
+async def _coalesce_text_chunks(chunks, *, max_chars: int, max_delay: float):
+    """Merge small streamed text chunks into fewer, larger ones.
+
+    Buffered text is released once it reaches ``max_chars`` or the oldest
+    buffered piece has waited ``max_delay`` seconds. ``[error]`` markers and
+    non-string chunks are passed through unmerged so callers still see them.
+    """
+    if max_chars <= 1 or max_delay <= 0:
+        async for chunk in chunks:
+            yield chunk
+        return
+
+    loop = asyncio.get_running_loop()
+    iterator = chunks.__aiter__()
+    buffer: list[str] = []
+    buffered = 0
+    deadline = 0.0
+    next_chunk = None
+    try:
+        while True:
+            if next_chunk is None:
+                next_chunk = asyncio.ensure_future(iterator.__anext__())
+            if buffer:
+                done, _ = await asyncio.wait({next_chunk}, timeout=max(0.0, deadline - loop.time()))
+                if not done:
+                    yield "".join(buffer)
+                    buffer.clear()
+                    buffered = 0
+                    continue
+            try:
+                chunk = await next_chunk
+            except StopAsyncIteration:
+                next_chunk = None
+                break
+            next_chunk = None
+
+            if not isinstance(chunk, str) or chunk.startswith("[error]"):
+                if buffer:
+                    yield "".join(buffer)
+                    buffer.clear()
+                    buffered = 0
+                yield chunk
+                continue
+            if not chunk:
+                continue
+            if not buffer:
+                deadline = loop.time() + max_delay
+            buffer.append(chunk)
+            buffered += len(chunk)
+            if buffered >= max_chars:
+                yield "".join(buffer)
+                buffer.clear()
+                buffered = 0
+        if buffer:
+            yield "".join(buffer)
+    finally:
+        if next_chunk is not None and not next_chunk.done():
+            next_chunk.cancel()
+            await asyncio.gather(next_chunk, return_exceptions=True)
+        close = getattr(iterator, "aclose", None)
+        if close is not None:
+            await close()
+
+
 def _normalize_tool_args(value):
     if value is None:
         return None
@@ -67,14 +212,22 @@ def _emit_interaction_completed_async(gateway_server, payload: dict):
         if exc:
             logger.error(f"background interaction.completed failed: {exc}")
 
+    # The loop only keeps weak references; hold one until the emit finishes.
+    _BACKGROUND_TASKS.add(task)
+    task.add_done_callback(_BACKGROUND_TASKS.discard)
     task.add_done_callback(_log_background_failure)
     return task
 
 
-def _drain_memory_visibility(gateway_server, *, session_id: str, user_id: str, limit: int = 3):
+def _memory_visibility_drain(gateway_server):
     memory_service = getattr(getattr(gateway_server, "conversation_service", None), "memory_service", None)
     drain = getattr(memory_service, "drain_visibility_hints", None) if memory_service else None
-    if not callable(drain) or not session_id or not user_id:
+    return drain if callable(drain) else None
+
+
+def _drain_memory_visibility(gateway_server, *, session_id: str, user_id: str, limit: int = 3):
+    drain = _memory_visibility_drain(gateway_server)
+    if drain is None or not session_id or not user_id:
         return None
     try:
         rows = list(drain(session_id=session_id, user_id=user_id, limit=limit) or [])
@@ -93,7 +246,20 @@ def _drain_memory_visibility(gateway_server, *, session_id: str, user_id: str, l
     }
 
 
-@router.post("/chat", response_model=ChatResponse)
+def _chat_response(payload: dict) -> ChatResponse:
+    # Gateway payloads are already well-formed; skip re-validating every field.
+    return ChatResponse.model_construct(
+        response=payload.get("response", ""),
+        session_id=payload.get("session_id"),
+        status=payload.get("status", "success"),
+        tool_call_id=payload.get("tool_call_id"),
+        tool_name=payload.get("tool_name"),
+        args=_normalize_tool_args(payload.get("args")),
+        memory_write_summary=_summarize_memory_visibility(payload.get("memory_write_summary")),
+    )
+
+
+@router.post("/chat", response_model=None, responses={200: {"model": ChatResponse}})
 async def chat(
     request: ChatRequest,
     raw_request: Request,
@@ -111,19 +277,14 @@ async def chat(
             if not user_text:
                 raise HTTPException(status_code=400, detail="message is required")
 
-            def _sse(payload: dict) -> str:
-                return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
-
             async def _stream():
                 session_id = request.session_id
                 message_manager = gateway_server.message_manager
-                turn_id = uuid.uuid4().hex
+                conversation_service = gateway_server.conversation_service
+                reasoning_service = gateway_server.reasoning_service
+                turn_id = _next_turn_id()
                 try:
-                    if session_id:
-                        if not message_manager.get_session(session_id, user_id=user_id):
-                            message_manager.create_session(session_id=session_id, user_id=user_id)
-                    else:
-                        session_id = message_manager.create_session(user_id=user_id)
+                    session_id = message_manager.ensure_session(session_id, user_id=user_id)
                     yield _sse({"type": "session_started", "session_id": session_id})
 
                     began = message_manager.begin_turn(
@@ -134,11 +295,11 @@ async def chat(
                         user_id=user_id,
                     )
                     if not began:
-                        yield _sse({"type": "error", "content": "failed to start turn"})
+                        yield _TURN_START_FAILED_FRAME
                         return
 
                     prepared_task = asyncio.create_task(
-                        gateway_server.conversation_service.prepare_chat_turn(
+                        conversation_service.prepare_chat_turn(
                             session_id=session_id,
                             user_id=user_id,
                             user_message=user_text,
@@ -157,7 +318,6 @@ async def chat(
                         }
                     )
                     while not prepared_task.done():
-                        reasoning_service = gateway_server.reasoning_service
                         if reasoning_service and session_id:
                             try:
                                 active_rows = reasoning_service.list_runtime_trees(
@@ -223,7 +383,7 @@ async def chat(
                                 "message": "Tool-capable turn is using the runtime tool loop.",
                             }
                         )
-                        run_chat_loop_result = await gateway_server.conversation_service.run_chat_loop(
+                        run_chat_loop_result = await conversation_service.run_chat_loop(
                             messages,
                             user_config=user_config,
                             session_id=session_id,
@@ -241,18 +401,28 @@ async def chat(
                         )
                         full_text = run_chat_loop_result.get("content", "")
                     else:
-                        async for chunk in gateway_server.conversation_service.call_llm_stream(
-                            messages, user_config=user_config, user_id=user_id
-                        ):
-                            if isinstance(chunk, str) and chunk.startswith("[error]"):
-                                stream_failed = True
-                                break
-                            if chunk:
-                                full_text += chunk
-                                yield _sse({"type": "text", "content": chunk})
+                        flush_chars, flush_delay = _stream_flush_settings(user_config)
+                        async with aclosing(
+                            _coalesce_text_chunks(
+                                _prefetch_chunks(
+                                    conversation_service.call_llm_stream(
+                                        messages, user_config=user_config, user_id=user_id
+                                    )
+                                ),
+                                max_chars=flush_chars,
+                                max_delay=flush_delay,
+                            )
+                        ) as chunks:
+                            async for chunk in chunks:
+                                if isinstance(chunk, str) and chunk.startswith("[error]"):
+                                    stream_failed = True
+                                    break
+                                if chunk:
+                                    full_text += chunk
+                                    yield _sse_text(chunk)
 
                         if stream_failed:
-                            run_chat_loop_result = await gateway_server.conversation_service.run_chat_loop(
+                            run_chat_loop_result = await conversation_service.run_chat_loop(
                                 messages,
                                 user_config=user_config,
                                 session_id=session_id,
@@ -289,7 +459,7 @@ async def chat(
                         full_text = f"Tool `{run_chat_loop_result.get('tool_name')}` requires confirmation."
 
                     if (needs_tools or stream_failed) and full_text:
-                        yield _sse({"type": "text", "content": full_text})
+                        yield _sse_text(full_text)
 
                     committed = message_manager.commit_turn(
                         session_id=session_id,
@@ -298,7 +468,7 @@ async def chat(
                         user_id=user_id,
                     )
                     if not committed:
-                        yield _sse({"type": "error", "content": "failed to commit turn"})
+                        yield _TURN_COMMIT_FAILED_FRAME
                         return
 
                     if isinstance(run_chat_loop_result, dict):
@@ -327,7 +497,13 @@ async def chat(
                                 "attachments": request.attachments,
                             },
                         )
-                        if interaction_task is not None:
+                        # Only hold the done frame for subscribers when their memory
+                        # write hints could still land in it; otherwise finish now.
+                        if (
+                            interaction_task is not None
+                            and not memory_write_summary
+                            and _memory_visibility_drain(gateway_server) is not None
+                        ):
                             try:
                                 await asyncio.wait_for(asyncio.shield(interaction_task), timeout=0.8)
                             except asyncio.TimeoutError:
@@ -349,8 +525,8 @@ async def chat(
                     if memory_write_summary:
                         done_payload["memory_write_summary"] = memory_write_summary
                         done_payload["memory_visibility"] = memory_write_summary
-                    if gateway_server.reasoning_service and tree_id:
-                        assessment = await gateway_server.reasoning_service.assess_outcome(
+                    if reasoning_service and tree_id:
+                        assessment = await reasoning_service.assess_outcome(
                             tree_id=tree_id,
                             assistant_output=full_text,
                             user_config=user_config,
@@ -388,6 +564,10 @@ async def chat(
                             done_payload["tree_id"] = tree_id
 
                     yield _sse(done_payload)
+                except (asyncio.CancelledError, GeneratorExit):
+                    # Client disconnected mid-stream: release the pending turn.
+                    message_manager.abort_turn(session_id, turn_id, user_id=user_id)
+                    raise
                 except Exception as e:
                     message_manager.abort_turn(session_id, turn_id, user_id=user_id)
                     logger.error(f"chat stream failed: {e}")
@@ -396,7 +576,7 @@ async def chat(
             return StreamingResponse(
                 _stream(),
                 media_type="text/event-stream",
-                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+                headers=_SSE_HEADERS,
             )
 
         gateway_server = get_gateway_server()
@@ -446,22 +626,14 @@ async def chat(
             )
             mapped = adapter.emit_response(payload)
 
-        return ChatResponse(
-            response=mapped.get("response", ""),
-            session_id=mapped.get("session_id"),
-            status=mapped.get("status", "success"),
-            tool_call_id=mapped.get("tool_call_id"),
-            tool_name=mapped.get("tool_name"),
-            args=_normalize_tool_args(mapped.get("args")),
-            memory_write_summary=_summarize_memory_visibility(mapped.get("memory_write_summary")),
-        )
+        return _chat_response(mapped)
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"chat failed: {e}")
         raise HTTPException(status_code=500, detail=f"chat failed: {e}")
 
-@router.post("/chat/confirm", response_model=ChatResponse)
+@router.post("/chat/confirm", response_model=None, responses={200: {"model": ChatResponse}})
 async def confirm_tool(
     request: ConfirmToolRequest,
     raw_request: Request,
@@ -478,15 +650,7 @@ async def confirm_tool(
             user_id=user_id,
             request=raw_request,
         )
-        return ChatResponse(
-            response=payload.get("response", ""),
-            session_id=payload.get("session_id"),
-            status=payload.get("status", "success"),
-            tool_call_id=payload.get("tool_call_id"),
-            tool_name=payload.get("tool_name"),
-            args=_normalize_tool_args(payload.get("args")),
-            memory_write_summary=_summarize_memory_visibility(payload.get("memory_write_summary")),
-        )
+        return _chat_response(payload)
     except HTTPException:
         raise
     except Exception as e:
@@ -1,11 +1,13 @@
 ﻿from __future__ import annotations
 
-import json
+import asyncio
+import codecs
+import hashlib
 import copy
 from pathlib import Path
 from typing import Any, Dict, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from pydantic import BaseModel, Field
 
 import config as config_module
@@ -14,6 +16,7 @@ from gateway.soul_service import build_soul_response_payload
 from gateway.user_secrets import get_user_secrets_status, update_user_secrets
 from gateway_integration import get_gateway_integration
 
+from ..json_codec import dumps_bytes, loads as json_loads
 from .auth import get_current_user_id
 
 router = APIRouter()
@@ -67,6 +70,8 @@ ADVANCED_CONFIG_FIELDS = [
     "memory.cold_layer.compression_threshold",
     "system.debug",
     "system.log_level",
+    "system.stream_flush_chars",
+    "system.stream_flush_ms",
     "org_brain.org_id",
     "org_brain.recall_priority",
     "org_brain.confirmation_queue",
@@ -127,6 +132,15 @@ def _get_config_service():
     return gateway_server.config_service
 
 
+def _invalidate_memory_api(user_id: str) -> None:
+    """Drop the memory service's resolved API settings after a secrets write."""
+    gateway_integration = get_gateway_integration()
+    gateway_server = gateway_integration.get_gateway_server() if gateway_integration else None
+    memory_service = getattr(gateway_server, "memory_service", None)
+    if memory_service:
+        memory_service.invalidate_memory_api(user_id)
+
+
 def _get_gateway_integration_or_503():
     integration = get_gateway_integration()
     if not integration:
@@ -135,11 +149,15 @@ def _get_gateway_integration_or_503():
 
 
 def _deep_update(base_dict: Dict[str, Any], update_dict: Dict[str, Any]) -> None:
-    for key, value in update_dict.items():
-        if isinstance(value, dict) and key in base_dict and isinstance(base_dict[key], dict):
-            _deep_update(base_dict[key], value)
-        else:
-            base_dict[key] = value
+    stack = [(base_dict, update_dict)]
+    while stack:
+        base, update = stack.pop()
+        for key, value in update.items():
+            current = base.get(key)
+            if isinstance(value, dict) and isinstance(current, dict):
+                stack.append((current, value))
+            else:
+                base[key] = value
 
 
 def _sanitize_config_for_client(config_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -213,16 +231,33 @@ def _build_basic_config_view(config_data: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def _load_default_config_dict() -> tuple[Path, Dict[str, Any]]:
+# path -> ((st_mtime_ns, st_size), parsed template); callers must treat the dict as read-only.
+_DEFAULT_CONFIG_CACHE: Dict[Path, tuple[tuple[int, int], Dict[str, Any]]] = {}
+
+
+async def _load_default_config_dict() -> tuple[Path, Dict[str, Any]]:
     config_path = Path("config/default.json")
     if not config_path.exists():
         config_path = Path("config.json")
 
-    if config_path.exists():
-        with open(config_path, "r", encoding="utf-8-sig") as file:
-            return config_path, json.load(file)
+    try:
+        stat = config_path.stat()
+    except OSError:
+        return config_path, config_module.PrometheaConfig().model_dump()
+    # Size as well as mtime: coarse timestamps can miss an in-place rewrite.
+    stamp = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _DEFAULT_CONFIG_CACHE.get(config_path)
+    if cached is not None and cached[0] == stamp:
+        return config_path, cached[1]
 
-    return config_path, config_module.PrometheaConfig().model_dump()
+    # Only a cache miss touches the file contents; read them off the event loop.
+    data = await asyncio.to_thread(config_path.read_bytes)
+    if data.startswith(codecs.BOM_UTF8):
+        data = data[len(codecs.BOM_UTF8):]
+    template = json_loads(data)
+    _DEFAULT_CONFIG_CACHE[config_path] = (stamp, template)
+    return config_path, template
 
 
 def _resolve_user_id(requested: Optional[str], current_user_id: str) -> str:
@@ -307,14 +342,35 @@ def _build_config_contract() -> Dict[str, Any]:
     }
 
 
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def _conditional_json_response(request: Request, payload: Any) -> Response:
+    """JSON response tagged with a content hash; a matching If-None-Match gets a bodiless 304."""
+    body = dumps_bytes(payload, default=str)
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @router.get("/config")
 async def get_config(
+    request: Request,
     user_id: Optional[str] = None,
     raw: bool = False,
     view: Literal["basic", "full"] = "full",
     include_sources: bool = False,
     current_user_id: str = Depends(get_current_user_id),
-) -> Dict[str, Any]:
+) -> Response:
     config_service = _get_config_service()
     resolved_user_id = _resolve_user_id(user_id, current_user_id)
     source_paths = SIMPLE_CONFIG_FIELDS if (include_sources and view == "basic") else None
@@ -326,7 +382,7 @@ async def get_config(
     config_data = _build_basic_config_view(full_config) if view == "basic" else full_config
     warnings = config_service.get_deprecation_warnings(resolved_user_id)
     if raw:
-        return config_data
+        return _conditional_json_response(request, config_data)
     payload = {
         "status": "success",
         "user_id": resolved_user_id,
@@ -337,7 +393,7 @@ async def get_config(
     }
     if include_sources:
         payload["sources"] = effective_bundle.get("sources") or {}
-    return payload
+    return _conditional_json_response(request, payload)
 
 
 @router.get("/config/secrets")
@@ -357,6 +413,7 @@ async def update_config_secrets(
     current_user_id: str = Depends(get_current_user_id),
 ) -> Dict[str, Any]:
     status = update_user_secrets(current_user_id, request.values)
+    _invalidate_memory_api(current_user_id)
     return {
         "status": "success",
         "user_id": current_user_id,
@@ -378,7 +435,7 @@ async def get_default_template(
     view: Literal["basic", "full"] = "full",
     current_user_id: str = Depends(get_current_user_id),
 ) -> Dict[str, Any]:
-    config_path, template = _load_default_config_dict()
+    config_path, template = await _load_default_config_dict()
     sanitized_template = _sanitize_config_for_client(template)
     template_view = _build_basic_config_view(sanitized_template) if view == "basic" else sanitized_template
     if raw:
@@ -550,6 +607,7 @@ async def switch_model(
 
     if not result.get("success"):
         raise HTTPException(status_code=400, detail=result.get("message", "Switch model failed"))
+    _invalidate_memory_api(resolved_user_id)
     return {**result, "user_id": resolved_user_id, "config": _sanitize_config_for_client(result.get("config", {}))}
 
 
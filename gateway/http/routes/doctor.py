@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-import json
+import asyncio
 import platform
 import shutil
 from datetime import datetime, timezone
@@ -12,6 +12,7 @@ from fastapi import APIRouter
 import config as config_module
 from gateway.config_migrations import collect_deprecation_warnings, migrate_config as migrate_config_schema
 from .. import state
+from ..json_codec import dumps_bytes
 from ..dispatcher import get_gateway_server
 
 
@@ -72,14 +73,9 @@ def _build_recommendations(checks: Dict[str, Dict[str, Any]]) -> list[Dict[str,
     return out
 
 
-@router.get("/doctor")
-async def run_doctor() -> Dict[str, Any]:
-    checks: Dict[str, Dict[str, Any]] = {}
-    cfg = config_module.config
-    gateway_server = get_gateway_server()
-
+def _check_config_api(cfg: Any) -> Dict[str, Any]:
     api_ok = bool(cfg.api.api_key and cfg.api.api_key != "placeholder-key-not-set")
-    checks["config_api"] = {
+    return {
         "ok": api_ok,
         "status": _bool_status(api_ok),
         "api_base_url": cfg.api.base_url,
@@ -87,6 +83,8 @@ async def run_doctor() -> Dict[str, Any]:
         "issues": [] if api_ok else ["API key not configured"],
     }
 
+
+def _check_memory(cfg: Any, gateway_server: Any) -> Dict[str, Any]:
     mem_ok = True
     mem_issues = []
     try:
@@ -98,7 +96,7 @@ async def run_doctor() -> Dict[str, Any]:
         mem_ok = False
         mem_issues.append(f"memory check failed: {e}")
 
-    checks["memory"] = {
+    return {
         "ok": mem_ok,
         "status": _bool_status(mem_ok),
         "enabled": bool(cfg.memory.enabled),
@@ -108,11 +106,13 @@ async def run_doctor() -> Dict[str, Any]:
         "issues": mem_issues,
     }
 
+
+def _check_plugins() -> Dict[str, Any]:
     from core.plugins.runtime import get_active_plugin_registry
 
     reg = get_active_plugin_registry()
     if reg is None:
-        checks["plugins"] = {
+        return {
             "ok": False,
             "status": "error",
             "plugins_total": 0,
@@ -120,22 +120,23 @@ async def run_doctor() -> Dict[str, Any]:
             "services_total": 0,
             "issues": ["plugin registry not initialized"],
         }
-    else:
-        error_plugins = [p.id for p in reg.plugins if p.status == "error"]
-        checks["plugins"] = {
-            "ok": not error_plugins,
-            "status": _bool_status(not error_plugins),
-            "plugins_total": len(reg.plugins),
-            "channels_total": len(reg.channels),
-            "services_total": len(reg.services),
-            "error_plugins": error_plugins,
-            "disabled_plugins": [p.id for p in reg.plugins if not p.enabled],
-            "issues": [f"error plugins: {', '.join(error_plugins)}"] if error_plugins else [],
-        }
+    error_plugins = [p.id for p in reg.plugins if p.status == "error"]
+    return {
+        "ok": not error_plugins,
+        "status": _bool_status(not error_plugins),
+        "plugins_total": len(reg.plugins),
+        "channels_total": len(reg.channels),
+        "services_total": len(reg.services),
+        "error_plugins": error_plugins,
+        "disabled_plugins": [p.id for p in reg.plugins if not p.enabled],
+        "issues": [f"error plugins: {', '.join(error_plugins)}"] if error_plugins else [],
+    }
+
 
+def _check_mcp() -> Dict[str, Any]:
     from agentkit.mcp.mcpregistry import MANIFEST_CACHE, MCP_REGISTRY
 
-    checks["mcp"] = {
+    return {
         "ok": True,
         "status": "ok",
         "services_total": len(MCP_REGISTRY),
@@ -144,7 +145,9 @@ async def run_doctor() -> Dict[str, Any]:
         "issues": [],
     }
 
-    checks["sessions"] = {
+
+def _check_sessions(gateway_server: Any) -> Dict[str, Any]:
+    check: Dict[str, Any] = {
         "ok": True,
         "status": "ok",
         "sessions_in_memory": 0,
@@ -155,34 +158,41 @@ async def run_doctor() -> Dict[str, Any]:
             if sessions_obj is None:
                 sessions_obj = getattr(gateway_server.message_manager, "sessions", None)
             if isinstance(sessions_obj, dict):
-                checks["sessions"]["sessions_in_memory"] = len(sessions_obj)
+                check["sessions_in_memory"] = len(sessions_obj)
             elif isinstance(sessions_obj, (list, tuple, set)):
-                checks["sessions"]["sessions_in_memory"] = len(sessions_obj)
+                check["sessions_in_memory"] = len(sessions_obj)
     except Exception as e:
-        checks["sessions"]["ok"] = False
-        checks["sessions"]["status"] = "error"
-        checks["sessions"]["issues"] = [f"session inventory failed: {e}"]
+        check["ok"] = False
+        check["status"] = "error"
+        check["issues"] = [f"session inventory failed: {e}"]
+    return check
 
+
+def _check_metrics() -> Dict[str, Any]:
     try:
         metrics_snapshot = state.metrics.get_stats()
         metrics_ok = True
     except Exception as e:
         metrics_ok = False
         metrics_snapshot = {"error": str(e)}
-    checks["metrics"] = {
+    return {
         "ok": metrics_ok,
         "status": _bool_status(metrics_ok),
         "snapshot": metrics_snapshot,
     }
 
-    checks["gateway"] = {
+
+def _check_gateway(gateway_server: Any) -> Dict[str, Any]:
+    return {
         "ok": bool(gateway_server.is_running),
         "status": "ok" if gateway_server.is_running else "error",
         "connections": gateway_server.connection_manager.get_active_count(),
         "channels": list(gateway_server.channels.keys()),
     }
 
-    checks["environment"] = {
+
+def _check_environment() -> Dict[str, Any]:
+    return {
         "ok": True,
         "status": "ok",
         "details": {
@@ -191,6 +201,29 @@ async def run_doctor() -> Dict[str, Any]:
         },
     }
 
+
+@router.get("/doctor")
+async def run_doctor() -> Dict[str, Any]:
+    cfg = config_module.config
+    gateway_server = get_gateway_server()
+
+    # Memory and metrics may block on backend I/O or locks; probe them off the
+    # event loop concurrently. The remaining checks are plain attribute reads.
+    memory_check, metrics_check = await asyncio.gather(
+        asyncio.to_thread(_check_memory, cfg, gateway_server),
+        asyncio.to_thread(_check_metrics),
+    )
+    checks: Dict[str, Dict[str, Any]] = {
+        "config_api": _check_config_api(cfg),
+        "memory": memory_check,
+        "plugins": _check_plugins(),
+        "mcp": _check_mcp(),
+        "sessions": _check_sessions(gateway_server),
+        "metrics": metrics_check,
+        "gateway": _check_gateway(gateway_server),
+        "environment": _check_environment(),
+    }
+
     ok_count = sum(1 for ch in checks.values() if bool(ch.get("ok", True)))
     total = max(1, len(checks))
     ratio = ok_count / total
@@ -214,9 +247,15 @@ async def run_doctor() -> Dict[str, Any]:
     }
 
 
+def _write_atomic(temp_path: Path, target: Path, blob: bytes) -> None:
+    temp_path.write_bytes(blob)
+    temp_path.replace(target)
+
+
 @router.post("/doctor/migrate-config")
 async def migrate_config() -> Dict[str, Any]:
-    cfg = config_module.load_config()
+    # File reads, the backup copy and the rewrite all run off the event loop.
+    cfg = await asyncio.to_thread(config_module.load_config)
     data = cfg.model_dump()
 
     # Keep secrets out of config file
@@ -241,17 +280,15 @@ async def migrate_config() -> Dict[str, Any]:
         ts = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
         backup_path = config_path.with_suffix(f".json.bak.{ts}")
         try:
-            shutil.copy2(config_path, backup_path)
+            await asyncio.to_thread(shutil.copy2, config_path, backup_path)
         except Exception:
             backup_path = None
 
     config_path.parent.mkdir(parents=True, exist_ok=True)
     temp_path = config_path.with_suffix(config_path.suffix + ".tmp")
     try:
-        with temp_path.open("w", encoding="utf-8") as f:
-            json.dump(migrated, f, ensure_ascii=False, indent=4)
-            f.flush()
-        temp_path.replace(config_path)
+        blob = dumps_bytes(migrated, indent=True)
+        await asyncio.to_thread(_write_atomic, temp_path, config_path, blob)
     except Exception as e:
         try:
             if temp_path.exists():
@@ -268,7 +305,7 @@ async def migrate_config() -> Dict[str, Any]:
         }
 
     try:
-        new_cfg = config_module.load_config()
+        new_cfg = await asyncio.to_thread(config_module.load_config)
         config_module.config = new_cfg  # type: ignore[attr-defined]
     except Exception as e:
         return {
@@ -31,60 +31,47 @@ class MemoryProposalDecisionRequest(BaseModel):
     action: str = Field(description="confirm_write | confirm_write_keep_existing | ignore_once | reduce_similar")
 
 
-def _get_runtime_components():
-    gateway_server = get_gateway_server()
-    memory_service = gateway_server.memory_service
+async def get_memory_service():
+    """Resolve the memory service once per request; FastAPI caches the dependency."""
+    memory_service = get_gateway_server().memory_service
     if not memory_service:
         raise HTTPException(status_code=503, detail="Memory service not initialized")
     return memory_service
 
 
-def _resolve_owned_memory_session(session_id: str, user_id: str) -> str:
-    memory_service = _get_runtime_components()
+def _ensure_session_access(memory_service: Any, session_id: str, user_id: str) -> None:
     session_check = memory_service.ensure_session_access(session_id=session_id, user_id=user_id)
     if not session_check.get("ok"):
         reason = str(session_check.get("reason") or "")
         if reason == "message_manager_unavailable":
             raise HTTPException(status_code=503, detail="Message manager not initialized")
         raise HTTPException(status_code=404, detail="Session not found")
-    resolved = memory_service.resolve_owned_memory_session(session_id=session_id, user_id=user_id)
-    if not resolved.get("ok"):
-        reason = str(resolved.get("reason") or "")
-        if reason in {"memory_not_enabled", "hot_layer_unavailable"}:
-            raise HTTPException(status_code=503, detail="Memory system not enabled")
-        raise HTTPException(status_code=404, detail="Session memory not found")
-    return str(resolved.get("memory_session_id") or "")
 
 
-@router.post("/memory/cluster/{session_id}")
-async def cluster_session_memory(
-    session_id: str,
-    raw_request: Request,
-    user_id: str = Depends(get_current_user_id),
-):
-    payload = await dispatch_gateway_method(
-        RequestType.MEMORY_CLUSTER,
-        {"session_id": session_id},
-        user_id=user_id,
-        request=raw_request,
-    )
-    return {"status": "success", **payload}
+def _raise_for_owned_session_reason(reason: str) -> None:
+    """Map the ownership part of a fused owned-session read to HTTP errors."""
+    if reason in {"memory_not_enabled", "hot_layer_unavailable"}:
+        raise HTTPException(status_code=503, detail="Memory system not enabled")
+    if reason == "session_memory_not_found":
+        raise HTTPException(status_code=404, detail="Session memory not found")
 
 
 @router.get("/memory/concepts/{session_id}")
 async def get_session_concepts(
     session_id: str,
     user_id: str = Depends(get_current_user_id),
+    memory_service: Any = Depends(get_memory_service),
 ):
     try:
-        scoped_session_id = _resolve_owned_memory_session(session_id, user_id)
-        memory_service = _get_runtime_components()
-        result = memory_service.get_session_concepts(memory_session_id=scoped_session_id)
+        _ensure_session_access(memory_service, session_id, user_id)
+        result = memory_service.get_owned_session_concepts(session_id=session_id, user_id=user_id)
         if not result.get("ok"):
             reason = str(result.get("reason") or "")
+            _raise_for_owned_session_reason(reason)
             if reason == "warm_layer_unavailable":
                 raise HTTPException(status_code=503, detail="Warm layer unavailable")
             raise RuntimeError(reason or "get_concepts_failed")
+        scoped_session_id = str(result.get("memory_session_id") or "")
         concepts = result.get("concepts") or []
         return {
             "status": "success",
@@ -119,16 +106,18 @@ async def summarize_session(
 async def get_session_summaries(
     session_id: str,
     user_id: str = Depends(get_current_user_id),
+    memory_service: Any = Depends(get_memory_service),
 ):
     try:
-        scoped_session_id = _resolve_owned_memory_session(session_id, user_id)
-        memory_service = _get_runtime_components()
-        result = memory_service.get_session_summaries(memory_session_id=scoped_session_id)
+        _ensure_session_access(memory_service, session_id, user_id)
+        result = memory_service.get_owned_session_summaries(session_id=session_id, user_id=user_id)
         if not result.get("ok"):
             reason = str(result.get("reason") or "")
+            _raise_for_owned_session_reason(reason)
             if reason == "cold_layer_unavailable":
                 raise HTTPException(status_code=503, detail="Cold layer unavailable")
             raise RuntimeError(reason or "get_summaries_failed")
+        scoped_session_id = str(result.get("memory_session_id") or "")
         summaries = result.get("summaries") or []
         return {
             "status": "success",
@@ -148,9 +137,9 @@ async def get_session_summaries(
 async def get_summary(
     summary_id: str,
     user_id: str = Depends(get_current_user_id),
+    memory_service: Any = Depends(get_memory_service),
 ):
     try:
-        memory_service = _get_runtime_components()
         result = memory_service.get_summary_for_user(summary_id=summary_id, user_id=user_id)
         if not result.get("ok"):
             reason = str(result.get("reason") or "")
@@ -174,12 +163,12 @@ async def get_summary(
 @router.get("/memory/graph")
 async def get_memory_graph_global(
     user_id: str = Depends(get_current_user_id),
+    memory_service: Any = Depends(get_memory_service),
 ):
     """
     Return user-scoped full memory graph across all sessions.
     """
     try:
-        memory_service = _get_runtime_components()
         result = memory_service.get_graph_global_for_user(user_id=user_id)
         if not result.get("ok"):
             raise RuntimeError(str(result.get("reason") or "graph_global_failed"))
@@ -207,8 +196,8 @@ async def search_memory_graph(
     limit_nodes: int = 80,
     limit_edges: int = 160,
     user_id: str = Depends(get_current_user_id),
+    memory_service: Any = Depends(get_memory_service),
 ):
-    memory_service = _get_runtime_components()
     result = memory_service.search_graph_for_user(
         user_id=user_id,
         query=q,
@@ -238,9 +227,9 @@ async def search_memory_graph(
 async def get_memory_graph(
     session_id: str,
     user_id: str = Depends(get_current_user_id),
+    memory_service: Any = Depends(get_memory_service),
 ):
     try:
-        memory_service = _get_runtime_components()
         prebuilt = memory_service.get_graph_for_session(session_id=session_id, user_id=user_id)
         if prebuilt.get("ok") and prebuilt.get("handled"):
             return {
@@ -285,8 +274,10 @@ async def get_memory_graph(
 
 
 @router.get("/memory/capabilities")
-async def get_memory_capabilities(user_id: str = Depends(get_current_user_id)):
-    memory_service = _get_runtime_components()
+async def get_memory_capabilities(
+    user_id: str = Depends(get_current_user_id),
+    memory_service: Any = Depends(get_memory_service),
+):
     payload = memory_service.get_capabilities_snapshot()
     if not payload.get("ok"):
         raise HTTPException(status_code=503, detail="Memory adapter unavailable")
@@ -308,8 +299,8 @@ async def list_memory_entries(
     offset: int = 0,
     include_archived: bool = False,
     user_id: str = Depends(get_current_user_id),
+    memory_service: Any = Depends(get_memory_service),
 ):
-    memory_service = _get_runtime_components()
     result = memory_service.list_entries(
         user_id=user_id,
         scope=scope,
@@ -335,8 +326,8 @@ async def search_memory_entries(
     q: str,
     limit: int = 30,
     user_id: str = Depends(get_current_user_id),
+    memory_service: Any = Depends(get_memory_service),
 ):
-    memory_service = _get_runtime_components()
     result = memory_service.search_entries(
         user_id=user_id,
         query=q,
@@ -360,8 +351,8 @@ async def search_memory_entries(
 async def create_memory_entry(
     request: MemoryEntryCreateRequest,
     user_id: str = Depends(get_current_user_id),
+    memory_service: Any = Depends(get_memory_service),
 ):
-    memory_service = _get_runtime_components()
     result = memory_service.create_entry(
         user_id=user_id,
         content=request.content,
@@ -383,8 +374,8 @@ async def update_memory_entry(
     memory_id: str,
     request: MemoryEntryUpdateRequest,
     user_id: str = Depends(get_current_user_id),
+    memory_service: Any = Depends(get_memory_service),
 ):
-    memory_service = _get_runtime_components()
     res = memory_service.update_entry(
         user_id=user_id,
         memory_id=memory_id,
@@ -401,8 +392,8 @@ async def update_memory_entry(
 async def delete_memory_entry(
     memory_id: str,
     user_id: str = Depends(get_current_user_id),
+    memory_service: Any = Depends(get_memory_service),
 ):
-    memory_service = _get_runtime_components()
     res = memory_service.delete_entry(user_id=user_id, memory_id=memory_id)
     if not res.get("ok"):
         raise HTTPException(status_code=404, detail=str(res.get("reason") or "not_found"))
@@ -416,8 +407,8 @@ async def list_memory_write_decisions(
     decision: Optional[str] = None,
     limit: int = 100,
     user_id: str = Depends(get_current_user_id),
+    memory_service: Any = Depends(get_memory_service),
 ):
-    memory_service = _get_runtime_components()
     rows = memory_service.list_write_decisions(
         user_id=user_id,
         session_id=session_id,
@@ -433,8 +424,8 @@ async def list_memory_write_proposals(
     status: str = "pending",
     limit: int = 100,
     user_id: str = Depends(get_current_user_id),
+    memory_service: Any = Depends(get_memory_service),
 ):
-    memory_service = _get_runtime_components()
     rows = memory_service.list_write_proposals(user_id=user_id, status=status, limit=limit)
     return {"status": "success", "user_id": user_id, "proposals": rows, "total": len(rows)}
 
@@ -444,8 +435,8 @@ async def decide_memory_write_proposal(
     proposal_id: str,
     request: MemoryProposalDecisionRequest,
     user_id: str = Depends(get_current_user_id),
+    memory_service: Any = Depends(get_memory_service),
 ):
-    memory_service = _get_runtime_components()
     result = await memory_service.resolve_write_proposal(
         proposal_id=proposal_id,
         user_id=user_id,
@@ -461,8 +452,8 @@ async def get_memory_dev_dashboard(
     session_id: Optional[str] = None,
     limit: int = 200,
     user_id: str = Depends(get_current_user_id),
+    memory_service: Any = Depends(get_memory_service),
 ):
-    memory_service = _get_runtime_components()
     stats = memory_service.build_dev_dashboard(user_id=user_id, session_id=session_id, limit=limit)
     return {
         "status": "success",
@@ -473,50 +464,54 @@ async def get_memory_dev_dashboard(
     }
 
 
-@router.post("/memory/decay/{session_id}")
-async def apply_memory_decay(
-    session_id: str,
-    raw_request: Request,
-    user_id: str = Depends(get_current_user_id),
-):
-    payload = await dispatch_gateway_method(
-        RequestType.MEMORY_DECAY,
-        {"session_id": session_id},
-        user_id=user_id,
-        request=raw_request,
-    )
-    return {"status": "success", **payload}
+def _session_method_endpoint(request_type: RequestType):
+    """Build a POST handler that forwards ``session_id`` to one gateway method."""
 
+    async def endpoint(
+        session_id: str,
+        raw_request: Request,
+        user_id: str = Depends(get_current_user_id),
+    ):
+        payload = await dispatch_gateway_method(
+            request_type,
+            {"session_id": session_id},
+            user_id=user_id,
+            request=raw_request,
+        )
+        return {"status": "success", **payload}
 
-@router.post("/memory/cleanup/{session_id}")
-async def cleanup_forgotten_memory(
-    session_id: str,
-    raw_request: Request,
-    user_id: str = Depends(get_current_user_id),
-):
-    payload = await dispatch_gateway_method(
-        RequestType.MEMORY_CLEANUP,
-        {"session_id": session_id},
-        user_id=user_id,
-        request=raw_request,
+    return endpoint
+
+
+# (path, route name, gateway method) for session-scoped maintenance actions.
+_SESSION_METHOD_ROUTES = (
+    ("/memory/cluster/{session_id}", "cluster_session_memory", RequestType.MEMORY_CLUSTER),
+    ("/memory/decay/{session_id}", "apply_memory_decay", RequestType.MEMORY_DECAY),
+    ("/memory/cleanup/{session_id}", "cleanup_forgotten_memory", RequestType.MEMORY_CLEANUP),
+)
+
+for _path, _name, _request_type in _SESSION_METHOD_ROUTES:
+    router.add_api_route(
+        _path,
+        _session_method_endpoint(_request_type),
+        methods=["POST"],
+        name=_name,
     )
-    return {"status": "success", **payload}
 
 
 @router.get("/memory/forgetting/stats/{session_id}")
 async def get_forgetting_stats(
     session_id: str,
     user_id: str = Depends(get_current_user_id),
+    memory_service: Any = Depends(get_memory_service),
 ):
     try:
-        scoped_session_id = _resolve_owned_memory_session(session_id, user_id)
-        memory_service = _get_runtime_components()
-        result = memory_service.get_forgetting_stats(memory_session_id=scoped_session_id)
+        _ensure_session_access(memory_service, session_id, user_id)
+        result = memory_service.get_owned_forgetting_stats(session_id=session_id, user_id=user_id)
         if not result.get("ok"):
-            reason = str(result.get("reason") or "")
-            if reason in {"memory_not_enabled", "hot_layer_unavailable"}:
-                raise HTTPException(status_code=503, detail="Memory system not enabled")
-            raise RuntimeError(reason or "get_forgetting_stats_failed")
+            _raise_for_owned_session_reason(str(result.get("reason") or ""))
+            raise RuntimeError(str(result.get("reason") or "get_forgetting_stats_failed"))
+        scoped_session_id = str(result.get("memory_session_id") or "")
         stats = result.get("stats") or {}
         return {
             "status": "success",
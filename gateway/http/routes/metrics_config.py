@@ -1,15 +1,18 @@
 ﻿from __future__ import annotations
 
 from fastapi import APIRouter
-from fastapi.responses import PlainTextResponse
+from fastapi.responses import PlainTextResponse, Response
 
 from .. import state
 from ..dispatcher import get_gateway_server
+from ..json_codec import dumps_bytes
 from ..user_file_store import user_file_store
 
 
 router = APIRouter()
 
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
 
 @router.get("/metrics")
 async def get_metrics():
@@ -66,11 +69,17 @@ async def get_metrics():
         "file_users": int(file_stats.get("total_users") or 0),
     }
     metrics["workflow_recovery"] = workflow_recovery
-    return {"status": "success", "metrics": metrics}
+    return Response(
+        content=dumps_bytes({"status": "success", "metrics": metrics}, default=str),
+        media_type="application/json",
+    )
 
 
 @router.get("/metrics/prometheus", response_class=PlainTextResponse)
 async def get_prometheus_metrics():
-    return state.metrics.to_prometheus_text()
+    return PlainTextResponse(
+        state.metrics.to_prometheus_text(),
+        media_type=PROMETHEUS_CONTENT_TYPE,
+    )
 
 
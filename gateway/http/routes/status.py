@@ -1,15 +1,17 @@
 ﻿from __future__ import annotations
 
+import asyncio
 import json
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Request, Response
 
 from config import config
 from gateway.official_tools import register_official_tools
 from gateway.tool_service import ToolService
 from .. import state
 from ..dispatcher import get_gateway_server
+from ..json_codec import dumps_bytes
 from ..user_manager import user_manager
 from memory.neo4j_connector import Neo4jConnectionPool
 from .auth import get_current_user_id
@@ -135,8 +137,8 @@ async def get_bootstrap_status():
 @router.get("/welcome")
 async def get_dynamic_welcome(lang: str = "zh", user_id: str = Depends(get_current_user_id)):
     gateway_server = get_gateway_server()
-    user = user_manager.get_user_by_id(user_id) or {}
-    user_config = user_manager.get_user_config(user_id) or {}
+    user = await asyncio.to_thread(user_manager.get_user_by_id, user_id) or {}
+    user_config = user_manager.get_user_config(user_id, user=user) or {}
     agent_name = str(user_config.get("agent_name") or user.get("agent_name") or "Promethea")
     username = str(user.get("username") or "user")
 
@@ -325,7 +327,7 @@ async def get_status():
             self_evolve_profile = self_evolve_svc.resolve_profile(merged)
         except Exception:
             self_evolve_profile = {}
-    return {
+    payload = {
         "status": "running",
         "conversation_ready": conversation_ready,
         "memory_active": memory_status,
@@ -345,6 +347,7 @@ async def get_status():
         "workflow_recovery": workflow_recovery,
         "startup": dict(state.startup_report or {}),
     }
+    return Response(content=dumps_bytes(payload, default=str), media_type="application/json")
 
 
 @router.get("/status/services")
@@ -368,7 +371,7 @@ async def get_services_status():
         }
         for name in failed
     ]
-    return {
+    payload = {
         "status": overall,
         "summary": {"total": total, "ok": ok_count, "failed": len(failed)},
         "services": health,
@@ -376,6 +379,7 @@ async def get_services_status():
         "recommendations": recommendations,
         "startup": dict(state.startup_report or {}),
     }
+    return Response(content=dumps_bytes(payload, default=str), media_type="application/json")
 
 
 @router.get("/health/memory")
@@ -433,7 +437,7 @@ async def get_memory_health():
 @router.get("/status/routes")
 async def get_gateway_routes(request: Request):
     gateway_server = get_gateway_server()
-    methods = sorted([str(k.value) for k in gateway_server._handlers.keys()])  # noqa: SLF001
+    methods = gateway_server.handler_methods
     http_routes = []
     for route in request.app.routes:
         path = getattr(route, "path", "")
@@ -72,6 +72,10 @@ class ConfirmToolRequest(BaseModel):
     action: str # "approve" or "reject"
 
 
+# Server-side ceiling for BatchRequest.max_concurrency.
+BATCH_MAX_CONCURRENCY = 8
+
+
 class BatchRequestItem(BaseModel):
     method: str
     params: Dict = Field(default_factory=dict)
@@ -82,3 +86,5 @@ class BatchRequestItem(BaseModel):
 
 class BatchRequest(BaseModel):
     requests: List[BatchRequestItem]
+    # 1 keeps items strictly sequential; raise it to dispatch same-priority items together.
+    max_concurrency: int = Field(1, ge=1, le=BATCH_MAX_CONCURRENCY)
@@ -2,9 +2,11 @@ import json, os
 import tempfile
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, TYPE_CHECKING
+from typing import Dict, Iterable, Optional, TYPE_CHECKING
 from loguru import logger
 
+from .json_codec import dumps_bytes, loads as json_loads
+
 if TYPE_CHECKING:
     from .message_manager import Session
 
@@ -14,6 +16,8 @@ class SessionStorage:
         
         default_path = Path(__file__).resolve().parents[1] / "sessions.json"
         self.path = str(default_path) if not path else path
+        # session key -> encoded ``"key":{...}`` member of the sessions file.
+        self._encoded: Dict[str, bytes] = {}
     
     def load_all(self) -> Dict[str, "Session"]:
         from .message_manager import Session
@@ -21,8 +25,7 @@ class SessionStorage:
         if not os.path.exists(self.path):
             return {}
         try:
-            with open(self.path, "r", encoding="utf-8") as f:
-                raw = json.load(f)
+            raw = json_loads(Path(self.path).read_bytes())
             return {sid: Session(**payload) for sid,payload in raw.items()}
         except json.JSONDecodeError as e:
             backup = f"{self.path}.corrupt.{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')}"
@@ -44,20 +47,41 @@ class SessionStorage:
             logger.warning("SessionStorage.load_all failed for {}: {}", self.path, e)
             return {}
     
-    def save_all(self, sessions: Dict[str, "Session"]):
-        data = {sid: s.model_dump() if hasattr(s, "model_dump") else s.dict()
-            for sid, s in sessions.items()}
-        
+    def save_all(self, sessions: Dict[str, "Session"], changed: Optional[Iterable[str]] = None):
+        """Persist every session to one JSON file.
+
+        Each session's encoded JSON is cached, so only the sessions named in
+        ``changed`` (or not yet cached) are dumped again; ``changed=None``
+        re-encodes all of them. Sessions missing from ``sessions`` are dropped.
+        """
+        if changed is None:
+            self._encoded.clear()
+        else:
+            for sid in changed:
+                self._encoded.pop(sid, None)
+        for sid in self._encoded.keys() - sessions.keys():
+            del self._encoded[sid]
+
+        parts = []
+        for sid, s in sessions.items():
+            encoded = self._encoded.get(sid)
+            if encoded is None:
+                payload = s.model_dump() if hasattr(s, "model_dump") else s.dict()
+                encoded = dumps_bytes(sid) + b":" + dumps_bytes(payload)
+                self._encoded[sid] = encoded
+            parts.append(encoded)
+        blob = b"{" + b",".join(parts) + b"}"
+
         target_path = Path(self.path)
         target_path.parent.mkdir(parents=True, exist_ok=True)
         
         
         dir_path = target_path.parent
-        fd, temp_path = tempfile.mkstemp(dir=dir_path, prefix=f"{target_path.name}.tmp", text=True)
+        fd, temp_path = tempfile.mkstemp(dir=dir_path, prefix=f"{target_path.name}.tmp")
         
         try:
-            with os.fdopen(fd, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(blob)
                 f.flush()
                 os.fsync(f.fileno())
             
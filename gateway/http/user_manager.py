@@ -1,13 +1,19 @@
-﻿import json
+﻿import codecs
+import json
 import os
+import re
 import uuid
 import shutil
+import threading
 import tempfile
+from contextlib import contextmanager
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from loguru import logger
+from neo4j.exceptions import ServiceUnavailable
 from passlib.context import CryptContext
 from passlib.exc import MissingBackendError
 
@@ -15,6 +21,7 @@ from config import load_config
 from memory.models import Neo4jNode, NodeType
 from memory.neo4j_connector import Neo4jConnectionPool
 from gateway.user_secrets import ensure_user_secrets
+from .json_codec import loads as json_loads
 
 # Prefer bcrypt, with PBKDF2 fallback when bcrypt backend is unavailable.
 pwd_context = CryptContext(
@@ -22,6 +29,56 @@ pwd_context = CryptContext(
     default="bcrypt",
     deprecated="auto",
 )
+# Used when bcrypt is unusable, and directly for hashes already in PBKDF2 form.
+_pbkdf2_context = CryptContext(
+    schemes=["pbkdf2_sha256"],
+    default="pbkdf2_sha256",
+    deprecated="auto",
+)
+_PBKDF2_HASH_PREFIX = "$pbkdf2-sha256$"
+
+# Caps concurrent user-graph queries (e.g. from worker threads) so a burst of
+# auth traffic cannot take every connection in the shared Neo4j pool. Async
+# routes call UserManager via asyncio.to_thread, so waiting never blocks the loop.
+_GRAPH_QUERY_LIMIT = 8
+_GRAPH_QUERY_SLOT_TIMEOUT_S = 10.0
+_graph_query_slots = threading.BoundedSemaphore(_GRAPH_QUERY_LIMIT)
+
+_CHANNEL_NAME_RE = re.compile(r"^[A-Za-z0-9_]+$")
+
+
+@contextmanager
+def _graph_query_slot():
+    """Hold one user-graph query slot, giving up after _GRAPH_QUERY_SLOT_TIMEOUT_S."""
+    if not _graph_query_slots.acquire(timeout=_GRAPH_QUERY_SLOT_TIMEOUT_S):
+        raise ServiceUnavailable("Timed out waiting for a user graph query slot")
+    try:
+        yield
+    finally:
+        _graph_query_slots.release()
+
+
+@lru_cache(maxsize=1024)
+def _config_paths(users_dir: Path, user_uuid: str) -> Tuple[Path, Path]:
+    """Return the (current, legacy) config paths for a user."""
+    return users_dir / user_uuid / "config.json", users_dir / f"{user_uuid}.json"
+
+
+@lru_cache(maxsize=64)
+def _channel_queries(channel: str) -> Optional[Tuple[str, str]]:
+    """
+    Build the (bind, lookup) Cypher for a ``channel_<name>`` user property once.
+
+    The property name is spliced into the query text, so names that are not
+    plain identifiers get None instead of a query.
+    """
+    if not _CHANNEL_NAME_RE.match(channel or ""):
+        return None
+    prop_name = f"channel_{channel}"
+    return (
+        f"MATCH (u:User {{id: $user_id}}) SET u.{prop_name} = $account_id RETURN u",
+        f"MATCH (u:User) WHERE u.{prop_name} = $account_id RETURN u",
+    )
 
 
 class UserManager:
@@ -34,6 +91,8 @@ class UserManager:
 
         self.users_dir = Path(__file__).resolve().parents[2] / "config" / "users"
         self.users_dir.mkdir(parents=True, exist_ok=True)
+        # path -> ((mtime_ns, size), raw bytes) of the last config file read.
+        self._config_file_cache: Dict[str, Tuple[Tuple[int, int], bytes]] = {}
 
     def _use_graph_users(self) -> bool:
         return self.store_backend == "neo4j" and self.connector is not None
@@ -58,8 +117,7 @@ class UserManager:
         if not path.exists():
             return {"users": []}
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = json_loads(path.read_bytes())
             return data if isinstance(data, dict) else {"users": []}
         except Exception as e:
             logger.error(f"Read local users failed: {e}")
@@ -68,6 +126,10 @@ class UserManager:
     def _save_local_users(self, data: Dict[str, Any]) -> None:
         self._write_json_atomic(self._local_users_path(), data)
 
+    def _graph_query(self, query: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        with _graph_query_slot():
+            return self.connector.query(query, params)
+
     def get_user_by_username(self, username: str) -> Optional[Dict[str, Any]]:
         if self._use_local_users():
             data = self._load_local_users()
@@ -80,7 +142,7 @@ class UserManager:
             return None
 
         query = "MATCH (u:User {username: $username}) RETURN u"
-        results = self.connector.query(query, {"username": username})
+        results = self._graph_query(query, {"username": username})
         return results[0]["u"] if results else None
 
     def get_user_by_id(self, user_id: str) -> Optional[Dict[str, Any]]:
@@ -99,7 +161,7 @@ class UserManager:
             user_id = f"user_{user_id}"
 
         query = "MATCH (u:User {id: $user_id}) RETURN u"
-        results = self.connector.query(query, {"user_id": user_id})
+        results = self._graph_query(query, {"user_id": user_id})
         return results[0]["u"] if results else None
 
     def create_user(self, username: str, password: str, agent_name: str = "Promethea") -> Optional[str]:
@@ -152,7 +214,8 @@ class UserManager:
                     "created_at": datetime.now(timezone.utc).isoformat(),
                 },
             )
-            self.connector.create_node(user_node)
+            with _graph_query_slot():
+                self.connector.create_node(user_node)
             self.create_user_config(raw_uuid, agent_name)
             logger.info(f"User created: user_{raw_uuid}")
             return raw_uuid
@@ -166,12 +229,7 @@ class UserManager:
             return pwd_context.hash(password)
         except (MissingBackendError, ValueError):
             # Fallback when bcrypt backend is missing or runtime-incompatible.
-            fallback_ctx = CryptContext(
-                schemes=["pbkdf2_sha256"],
-                default="pbkdf2_sha256",
-                deprecated="auto",
-            )
-            return fallback_ctx.hash(password)
+            return _pbkdf2_context.hash(password)
 
     def create_user_config(self, user_uuid: str, agent_name: str):
         user_dir = self.users_dir / user_uuid
@@ -188,8 +246,7 @@ class UserManager:
         except Exception as e:
             logger.error(f"Create user config failed: {e}")
 
-    @staticmethod
-    def _write_json_atomic(path: Path, payload: Dict[str, Any]) -> None:
+    def _write_json_atomic(self, path: Path, payload: Dict[str, Any]) -> None:
         """
         Atomically write JSON to disk to avoid truncated/corrupted files
         when process interruption happens during write.
@@ -203,6 +260,8 @@ class UserManager:
                 f.flush()
                 os.fsync(f.fileno())
             os.replace(tmp_path, path)
+            # Coarse mtimes can leave a same-size rewrite with an unchanged stamp.
+            self._config_file_cache.pop(str(path), None)
         except Exception:
             try:
                 if tmp_path.exists():
@@ -259,25 +318,58 @@ class UserManager:
         return cfg
 
     def _legacy_config_path(self, user_uuid: str) -> Path:
-        return self.users_dir / f"{user_uuid}.json"
+        return _config_paths(self.users_dir, user_uuid)[1]
 
     def _current_config_path(self, user_uuid: str) -> Path:
-        return self.users_dir / user_uuid / "config.json"
+        return _config_paths(self.users_dir, user_uuid)[0]
+
+    def _stat_config_file(self, user_uuid: str) -> Optional[Tuple[Path, os.stat_result]]:
+        """Stat the current config file, falling back to the legacy location."""
+        for config_path in _config_paths(self.users_dir, user_uuid):
+            try:
+                return config_path, config_path.stat()
+            except FileNotFoundError:
+                continue
+        return None
+
+    def _read_config_file(self, config_path: Path, stat: Optional[os.stat_result] = None) -> Dict[str, Any]:
+        """Parse a config file, skipping the disk read while mtime and size are unchanged.
+
+        Raw bytes are cached rather than the parsed dict: callers mutate the
+        result, and re-parsing is cheaper than a deepcopy.
+        """
+        if stat is None:
+            stat = config_path.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        key = str(config_path)
+        cached = self._config_file_cache.get(key)
+        if cached is not None and cached[0] == stamp:
+            raw = cached[1]
+        else:
+            raw = config_path.read_bytes()
+            self._config_file_cache[key] = (stamp, raw)
+        if raw.startswith(codecs.BOM_UTF8):
+            raw = raw[len(codecs.BOM_UTF8):]
+        return json_loads(raw)
 
-    def get_user_config(self, user_uuid: str) -> Dict[str, Any]:
-        current_path = self._current_config_path(user_uuid)
-        legacy_path = self._legacy_config_path(user_uuid)
-        config_path = current_path if current_path.exists() else legacy_path
+    def get_user_config(self, user_uuid: str, user: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Load a user's config file, creating it if missing or corrupt.
 
-        if not config_path.exists():
-            user = self.get_user_by_id(user_uuid)
+        Callers that already fetched the user record can pass it as ``user`` so
+        re-creating the file does not look the user up again.
+        """
+        found = self._stat_config_file(user_uuid)
+        if found is not None:
+            config_path, stat = found
+        else:
+            if user is None:
+                user = self.get_user_by_id(user_uuid)
             agent_name = user.get("agent_name", "Promethea") if user else "Promethea"
             self.create_user_config(user_uuid, agent_name)
-            config_path = self._current_config_path(user_uuid)
+            config_path, stat = self._current_config_path(user_uuid), None
 
         try:
-            with open(config_path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            return self._read_config_file(config_path, stat)
         except Exception as e:
             logger.error(f"Read user config failed: {e}")
             # Auto-heal corrupted/truncated config files to avoid repeated runtime failures.
@@ -287,12 +379,11 @@ class UserManager:
                     backup_path = config_path.with_suffix(f".corrupt-{stamp}.json")
                     shutil.move(str(config_path), str(backup_path))
                     logger.warning(f"Corrupted user config moved to backup: {backup_path}")
-                user = self.get_user_by_id(user_uuid)
+                if user is None:
+                    user = self.get_user_by_id(user_uuid)
                 agent_name = user.get("agent_name", "Promethea") if user else "Promethea"
                 self.create_user_config(user_uuid, agent_name)
-                healed_path = self._current_config_path(user_uuid)
-                with open(healed_path, "r", encoding="utf-8") as f:
-                    return json.load(f)
+                return self._read_config_file(self._current_config_path(user_uuid))
             except Exception as heal_err:
                 logger.error(f"Failed to auto-heal user config for {user_uuid}: {heal_err}")
             return {}
@@ -346,28 +437,30 @@ class UserManager:
             target = {}
         if not isinstance(source, dict):
             return target
-        for key, value in source.items():
-            if isinstance(value, dict) and isinstance(target.get(key), dict):
-                UserManager._deep_merge(target[key], value)
-            else:
-                target[key] = value
+        stack = [(target, source)]
+        while stack:
+            base, update = stack.pop()
+            for key, value in update.items():
+                current = base.get(key)
+                if isinstance(value, dict) and isinstance(current, dict):
+                    stack.append((current, value))
+                else:
+                    base[key] = value
         return target
 
     def verify_user(self, username: str, password: str) -> Optional[Dict[str, Any]]:
         user = self.get_user_by_username(username)
         if not user:
             return None
+        password_hash = user.get("password_hash")
+        if isinstance(password_hash, str) and password_hash.startswith(_PBKDF2_HASH_PREFIX):
+            return user if _pbkdf2_context.verify(password, password_hash) else None
         try:
-            if pwd_context.verify(password, user.get("password_hash")):
+            if pwd_context.verify(password, password_hash):
                 return user
         except (MissingBackendError, ValueError):
             # Verify PBKDF2 hashes even if bcrypt backend is unavailable/incompatible.
-            fallback_ctx = CryptContext(
-                schemes=["pbkdf2_sha256"],
-                default="pbkdf2_sha256",
-                deprecated="auto",
-            )
-            if fallback_ctx.verify(password, user.get("password_hash")):
+            if _pbkdf2_context.verify(password, password_hash):
                 return user
         return None
 
@@ -379,6 +472,9 @@ class UserManager:
     ) -> bool:
         if not self.connector:
             return False
+        if not agent_name and not system_prompt:
+            # Nothing to SET in the graph and nothing to merge into the file.
+            return True
 
         if not user_id.startswith("user_"):
             neo4j_user_id = f"user_{user_id}"
@@ -399,7 +495,7 @@ class UserManager:
         if updates:
             query = f"MATCH (u:User {{id: $user_id}}) SET {', '.join(updates)} RETURN u"
             try:
-                self.connector.query(query, params)
+                self._graph_query(query, params)
             except Exception as e:
                 logger.error(f"Update Neo4j user config failed: {e}")
                 return False
@@ -418,10 +514,12 @@ class UserManager:
         if not user_id.startswith("user_"):
             user_id = f"user_{user_id}"
 
-        prop_name = f"channel_{channel}"
-        query = f"MATCH (u:User {{id: $user_id}}) SET u.{prop_name} = $account_id RETURN u"
+        queries = _channel_queries(channel)
+        if queries is None:
+            logger.warning(f"Bind channel account rejected invalid channel name: {channel!r}")
+            return False
         try:
-            self.connector.query(query, {"user_id": user_id, "account_id": account_id})
+            self._graph_query(queries[0], {"user_id": user_id, "account_id": account_id})
             return True
         except Exception as e:
             logger.error(f"Bind channel account failed: {e}")
@@ -436,7 +534,7 @@ class UserManager:
 
         query = "MATCH (u:User {id: $user_id}) RETURN u"
         try:
-            results = self.connector.query(query, {"user_id": user_id})
+            results = self._graph_query(query, {"user_id": user_id})
             if not results:
                 return {}
 
@@ -454,10 +552,11 @@ class UserManager:
         if not self.connector:
             return None
 
-        prop_name = f"channel_{channel}"
-        query = f"MATCH (u:User) WHERE u.{prop_name} = $account_id RETURN u"
+        queries = _channel_queries(channel)
+        if queries is None:
+            return None
         try:
-            results = self.connector.query(query, {"account_id": account_id})
+            results = self._graph_query(queries[1], {"account_id": account_id})
             return results[0]["u"] if results else None
         except Exception as e:
             logger.error(f"Get user by channel account failed: {e}")
@@ -518,7 +617,7 @@ class UserManager:
         Delete the user and the memory/session subgraph exclusively reachable
         through sessions owned by that user.
         """
-        self.connector.query(
+        self._graph_query(
             """
             MATCH (u:User {id: $user_id})
             OPTIONAL MATCH (s:Session)-[:OWNED_BY]->(u)
@@ -1,12 +1,13 @@
 ﻿from __future__ import annotations
 
 import asyncio
-import hashlib
 import json
 import re
+import threading
 import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from loguru import logger
 
@@ -37,9 +38,19 @@ from .memory_text_utils import (
     normalize_content,
 )
 from .protocol import EventType
+import memory
 from memory.session_scope import ensure_session_owned, scoped_session_id
 from memory.session_scope import user_node_id
 
+# Attributes set by MemoryService._refresh_thresholds.
+_WRITE_THRESHOLD_FIELDS = (
+    "_dedupe_min_candidate_chars",
+    "_recent_write_limit",
+    "_write_min_user_chars",
+    "_write_min_assistant_chars_for_short_user",
+    "_write_max_combined_chars",
+)
+
 
 class MemoryService:
     """
@@ -66,8 +77,8 @@ class MemoryService:
         self.config_service = config_service
         self.message_manager = message_manager
         self._memory_write_gate = MemoryWriteGate()
-        self._recent_write_keys: List[str] = []
-        self._recent_write_index: set[str] = set()
+        # Insertion-ordered set of recent write keys; oldest evicted first.
+        self._recent_write_index: "OrderedDict[int, None]" = OrderedDict()
         self._recent_write_limit = 2000
         self._sync_defaults = {
             "max_queue_size": 32,
@@ -76,6 +87,9 @@ class MemoryService:
         self._sync_queue: Optional[asyncio.Queue] = None
         self._sync_worker: Optional[asyncio.Task] = None
         self._sync_lock = asyncio.Lock()
+        # Summaries are blocking LLM calls; cap how many run at once.
+        self._summary_concurrency = 4
+        self._summary_slots = asyncio.Semaphore(self._summary_concurrency)
         self._sync_active = 0
         self._sync_enqueued = 0
         self._sync_completed = 0
@@ -97,7 +111,21 @@ class MemoryService:
         self._write_proposal_limit = 300
         self._visibility_hints_by_session: Dict[str, List[Dict[str, Any]]] = {}
         self._visibility_hint_limit = 20
-
+        # kind -> (connector, manager); see _layer_manager.
+        self._layer_managers: Dict[str, Tuple[Any, Any]] = {}
+        # user_id -> (resolved_at, write thresholds); see _refresh_thresholds.
+        self._threshold_cache: Dict[Optional[str], Tuple[float, Dict[str, int]]] = {}
+        self._threshold_cache_ttl_s = 30.0
+        # user_id -> (resolved_at, secrets.env signature, memory API settings).
+        self._memory_api_cache: Dict[str, Tuple[float, Any, Dict[str, str]]] = {}
+        self._memory_api_cache_ttl_s = 60.0
+        # (api_key, base_url) -> OpenAI client for the dedicated classifier path.
+        self._memory_llm_clients: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+        self._memory_llm_clients_limit = 8
+        self._memory_llm_clients_lock = threading.Lock()
+
+        # ``enabled`` is only ever True with an adapter present, so the entry
+        # guards below check the flag alone.
         if not self.memory_adapter:
             logger.warning(
                 "MemoryService: Memory adapter not available, memory features disabled"
@@ -133,7 +161,10 @@ class MemoryService:
             payload = event_msg.payload
             user_id = payload.get("user_id")
             changes = payload.get("changes", {})
+            self._memory_api_cache.pop(user_id, None)
             if "memory" in changes:
+                self._layer_managers.clear()
+                self._threshold_cache.pop(user_id, None)
                 logger.info(
                     "MemoryService: Memory config changed for user {}", user_id
                 )
@@ -142,14 +173,44 @@ class MemoryService:
 
     async def _on_config_reloaded(self, event_msg) -> None:
         try:
+            self._layer_managers.clear()
+            self._threshold_cache.clear()
+            self._memory_api_cache.clear()
             logger.info("MemoryService: Default config reloaded")
         except Exception as e:
             logger.error("MemoryService: Error handling config reload: {}", e)
 
+    def _layer_manager(self, kind: str) -> Any:
+        """Return the warm/cold/forgetting manager bound to the hot layer's connector.
+
+        Managers are built once per connector (each holds its own LLM client) and
+        dropped on config changes; a disabled layer (``None``) is not cached.
+        """
+        connector = self.memory_adapter.hot_layer.connector
+        cached = self._layer_managers.get(kind)
+        if cached is not None and cached[0] is connector:
+            return cached[1]
+        factories = {
+            "warm": memory.create_warm_layer_manager,
+            "cold": memory.create_cold_layer_manager,
+            "forgetting": memory.create_forgetting_manager,
+        }
+        manager = factories[kind](connector)
+        if manager is not None:
+            self._layer_managers[kind] = (connector, manager)
+        return manager
+
     def _normalize_content(self, text: str) -> str:
         return normalize_content(text)
 
     def _refresh_thresholds(self, user_id: Optional[str] = None) -> None:
+        # Called per candidate; reuse the last resolution instead of re-merging config.
+        now = time.monotonic()
+        cached = self._threshold_cache.get(user_id)
+        if cached is not None and now - cached[0] < self._threshold_cache_ttl_s:
+            for name, value in cached[1].items():
+                setattr(self, name, value)
+            return
         self._dedupe_min_candidate_chars = 8
         self._recent_write_limit = 2000
         self._write_min_user_chars = 4
@@ -197,6 +258,10 @@ class MemoryService:
             self._write_min_user_chars = max(1, self._write_min_user_chars - 2)
             self._dedupe_min_candidate_chars = max(4, self._dedupe_min_candidate_chars - 2)
             self._write_max_combined_chars = min(12000, self._write_max_combined_chars + 2000)
+        self._threshold_cache[user_id] = (
+            now,
+            {name: getattr(self, name) for name in _WRITE_THRESHOLD_FIELDS},
+        )
 
     def _resolve_sync_policy(self, user_id: Optional[str] = None) -> Dict[str, float]:
         policy = dict(self._sync_defaults)
@@ -227,19 +292,17 @@ class MemoryService:
                 self._sync_worker = asyncio.create_task(self._sync_worker_loop())
             return queue
 
-    def _make_write_key(self, user_id: str, memory_type: str, content: str) -> str:
+    def _make_write_key(self, user_id: str, memory_type: str, content: str) -> int:
+        # In-process dedupe only (never persisted), so the salted builtin hash suffices.
         normalized = self._normalize_content(content)
-        raw = f"{user_id}|{memory_type}|{normalized}"
-        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+        return hash((user_id, memory_type, normalized))
 
-    def _remember_write_key(self, write_key: str) -> None:
+    def _remember_write_key(self, write_key: int) -> None:
         if write_key in self._recent_write_index:
             return
-        self._recent_write_index.add(write_key)
-        self._recent_write_keys.append(write_key)
-        if len(self._recent_write_keys) > self._recent_write_limit:
-            old_key = self._recent_write_keys.pop(0)
-            self._recent_write_index.discard(old_key)
+        self._recent_write_index[write_key] = None
+        while len(self._recent_write_index) > self._recent_write_limit:
+            self._recent_write_index.popitem(last=False)
 
     def _should_write_candidate(
         self,
@@ -404,7 +467,42 @@ class MemoryService:
             return default
         return bool(value)
 
+    @staticmethod
+    def _file_stamp(path: Any) -> Optional[Tuple[int, int]]:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def invalidate_memory_api(self, user_id: str) -> None:
+        """Forget the resolved memory API settings for ``user_id`` after its secrets change."""
+        self._memory_api_cache.pop(user_id, None)
+
     def _resolve_memory_api_for_user(self, user_id: str) -> Dict[str, str]:
+        # In-app secret writes call invalidate_memory_api(); the file stats only
+        # catch edits made outside the app (within the timestamp resolution).
+        try:
+            from gateway.user_secrets import ENV_FILE, user_secrets_path
+
+            secrets_sig = tuple(
+                self._file_stamp(path) for path in (user_secrets_path(user_id), ENV_FILE)
+            )
+        except Exception:
+            secrets_sig = None
+        now = time.monotonic()
+        cached = self._memory_api_cache.get(user_id)
+        if (
+            cached is not None
+            and cached[1] == secrets_sig
+            and now - cached[0] < self._memory_api_cache_ttl_s
+        ):
+            return dict(cached[2])
+        api = self._load_memory_api_for_user(user_id)
+        self._memory_api_cache[user_id] = (now, secrets_sig, dict(api))
+        return api
+
+    def _load_memory_api_for_user(self, user_id: str) -> Dict[str, str]:
         cfg = self._get_merged_config(user_id=user_id) or {}
         try:
             from gateway.user_secrets import resolve_memory_runtime_settings
@@ -426,6 +524,29 @@ class MemoryService:
                 "model": memory_api.get("model") or api_cfg.get("model", ""),
             }
 
+    def _memory_llm_client(self, api_key: str, base_url: str) -> Any:
+        """Return a pooled OpenAI client so classifier calls reuse its connections."""
+        key = (api_key, base_url)
+        evicted = []
+        with self._memory_llm_clients_lock:
+            client = self._memory_llm_clients.get(key)
+            if client is not None:
+                self._memory_llm_clients.move_to_end(key)
+                return client
+            from openai import OpenAI
+
+            client = OpenAI(api_key=api_key, base_url=base_url)
+            self._memory_llm_clients[key] = client
+            while len(self._memory_llm_clients) > self._memory_llm_clients_limit:
+                evicted.append(self._memory_llm_clients.popitem(last=False)[1])
+        # Release the evicted clients' connection pools outside the lock.
+        for old_client in evicted:
+            try:
+                old_client.close()
+            except Exception as e:
+                logger.debug("MemoryService: closing evicted memory LLM client failed: {}", e)
+        return client
+
     async def _call_memory_classifier_llm(
         self,
         user_id: str,
@@ -464,10 +585,8 @@ class MemoryService:
             return None
 
         try:
-            from openai import OpenAI
-
             def _sync_call() -> str:
-                client = OpenAI(api_key=api_key, base_url=base_url)
+                client = self._memory_llm_client(api_key, base_url)
                 resp = client.chat.completions.create(
                     model=model,
                     messages=[
@@ -583,43 +702,39 @@ class MemoryService:
 
         normalized = self._normalize_content(content)
         try:
-            # 1) Exact content duplicate check for the same user.
-            exact_rows = connector.query(
+            # One round-trip for both checks:
+            # 1) exact content duplicate for the same user;
+            # 2) recent user messages linked to an entity with one of the semantic keys.
+            rows = connector.query(
                 """
-                MATCH (m:Message {user_id: $user_id, role: 'user'})
-                WHERE toLower(trim(m.content)) = $norm_content
-                RETURN m.id AS id
-                LIMIT 1
+                OPTIONAL MATCH (dup:Message {user_id: $user_id, role: 'user'})
+                WHERE toLower(trim(dup.content)) = $norm_content
+                WITH dup LIMIT 1
+                OPTIONAL MATCH (u:User {id: $user_node_id})<-[:OWNED_BY]-(s:Session)
+                    <-[:PART_OF_SESSION]-(m:Message {role: 'user'})<-[:FROM_MESSAGE]-(e:Entity)
+                WHERE e.content IN $keys
+                WITH dup, m
+                ORDER BY m.created_at DESC
+                RETURN dup.id AS exact_id, collect(m.content)[..5] AS semantic_contents
                 """,
-                {"user_id": user_id, "norm_content": normalized},
+                {
+                    "user_id": user_id,
+                    "norm_content": normalized,
+                    "user_node_id": user_node_id(user_id),
+                    "keys": list(semantic_keys or []),
+                },
             )
-            if exact_rows:
+            row = rows[0] if rows else {}
+            if row.get("exact_id"):
                 return False
 
-            # 2) Semantic-level check by user-owned sessions and linked entities.
-            # If equivalent semantic key exists with same content => duplicate.
-            # If semantic key exists but content differs => considered state change (write).
-            keys = semantic_keys or []
-            if keys:
-                semantic_rows = connector.query(
-                    """
-                    MATCH (u:User {id: $user_node_id})<-[:OWNED_BY]-(s:Session)<-[:PART_OF_SESSION]-(m:Message {role: 'user'})
-                    MATCH (e:Entity)-[:FROM_MESSAGE]->(m)
-                    WHERE e.content IN $keys
-                    RETURN m.content AS content
-                    ORDER BY m.created_at DESC
-                    LIMIT 5
-                    """,
-                    {"user_node_id": user_node_id(user_id), "keys": keys},
-                )
-                for row in semantic_rows:
-                    prev = self._normalize_content(str(row.get("content", "")))
-                    if prev == normalized:
-                        return False
-                if semantic_rows:
-                    return True
-
-            # 3) No equivalent found in graph.
+            # Equivalent semantic key with the same content => duplicate.
+            # Same key but different content is a state change (write).
+            for prev in row.get("semantic_contents") or []:
+                if self._normalize_content(str(prev or "")) == normalized:
+                    return False
+
+            # No equivalent found in graph.
             return True
         except Exception as e:
             logger.debug(
@@ -839,7 +954,7 @@ class MemoryService:
         await self._process_interaction_completed(payload)
 
     async def _enqueue_interaction_completed(self, event_msg) -> None:
-        if not self.enabled or not self.memory_adapter:
+        if not self.enabled:
             return
 
         payload = dict(getattr(event_msg, "payload", {}) or {})
@@ -913,7 +1028,7 @@ class MemoryService:
         - user_input
         - assistant_output
         """
-        if not self.enabled or not self.memory_adapter:
+        if not self.enabled:
             return
 
         session_id = payload.get("session_id")
@@ -1059,7 +1174,9 @@ class MemoryService:
                 )
                 continue
 
-            success = self.memory_adapter.add_message(
+            # The adapter write embeds and hits the store; keep it off the event loop.
+            success = await asyncio.to_thread(
+                self.memory_adapter.add_message,
                 session_id=session_id,
                 role="user",
                 content=content,
@@ -1134,7 +1251,7 @@ class MemoryService:
         queue_size = self._sync_queue.qsize() if self._sync_queue else 0
         pending = queue_size + self._sync_active
         stats = {
-            "enabled": self.enabled and self.memory_adapter is not None,
+            "enabled": self.enabled,
             "pending": pending,
             "queued": queue_size,
             "active": self._sync_active,
@@ -1526,14 +1643,12 @@ class MemoryService:
         }
 
     def get_session_concepts(self, *, memory_session_id: str) -> Dict[str, Any]:
-        if not self.enabled or not self.memory_adapter:
+        if not self.enabled:
             return {"ok": False, "reason": "memory_not_enabled"}
         if not self.memory_adapter.hot_layer:
             return {"ok": False, "reason": "hot_layer_unavailable"}
         try:
-            from memory import create_warm_layer_manager
-
-            warm_layer = create_warm_layer_manager(self.memory_adapter.hot_layer.connector)
+            warm_layer = self._layer_manager("warm")
             if not warm_layer:
                 return {"ok": False, "reason": "warm_layer_unavailable"}
             return {"ok": True, "concepts": warm_layer.get_concepts(memory_session_id)}
@@ -1541,14 +1656,12 @@ class MemoryService:
             return {"ok": False, "reason": f"get_concepts_failed:{e}"}
 
     def get_session_summaries(self, *, memory_session_id: str) -> Dict[str, Any]:
-        if not self.enabled or not self.memory_adapter:
+        if not self.enabled:
             return {"ok": False, "reason": "memory_not_enabled"}
         if not self.memory_adapter.hot_layer:
             return {"ok": False, "reason": "hot_layer_unavailable"}
         try:
-            from memory import create_cold_layer_manager
-
-            cold_layer = create_cold_layer_manager(self.memory_adapter.hot_layer.connector)
+            cold_layer = self._layer_manager("cold")
             if not cold_layer:
                 return {"ok": False, "reason": "cold_layer_unavailable"}
             summaries = cold_layer.get_summaries(memory_session_id)
@@ -1557,15 +1670,13 @@ class MemoryService:
             return {"ok": False, "reason": f"get_summaries_failed:{e}"}
 
     def get_summary_for_user(self, *, summary_id: str, user_id: str) -> Dict[str, Any]:
-        if not self.enabled or not self.memory_adapter:
+        if not self.enabled:
             return {"ok": False, "reason": "memory_not_enabled"}
         if not self.memory_adapter.hot_layer:
             return {"ok": False, "reason": "hot_layer_unavailable"}
         try:
-            from memory import create_cold_layer_manager
-
             connector = self.memory_adapter.hot_layer.connector
-            cold_layer = create_cold_layer_manager(connector)
+            cold_layer = self._layer_manager("cold")
             if not cold_layer:
                 return {"ok": False, "reason": "cold_layer_unavailable"}
             summary = cold_layer.get_summary_by_id(summary_id)
@@ -1580,18 +1691,79 @@ class MemoryService:
             return {"ok": False, "reason": f"get_summary_failed:{e}"}
 
     def get_forgetting_stats(self, *, memory_session_id: str) -> Dict[str, Any]:
-        if not self.enabled or not self.memory_adapter:
+        if not self.enabled:
             return {"ok": False, "reason": "memory_not_enabled"}
         if not self.memory_adapter.hot_layer:
             return {"ok": False, "reason": "hot_layer_unavailable"}
         try:
-            from memory import create_forgetting_manager
-
-            forgetting_manager = create_forgetting_manager(self.memory_adapter.hot_layer.connector)
+            forgetting_manager = self._layer_manager("forgetting")
             return {"ok": True, "stats": forgetting_manager.get_forgetting_stats(memory_session_id)}
         except Exception as e:
             return {"ok": False, "reason": f"get_forgetting_stats_failed:{e}"}
 
+    def _read_owned_session(
+        self,
+        kind: str,
+        unavailable_reason: str,
+        failure_reason: str,
+        read: Any,
+    ) -> Dict[str, Any]:
+        """Run a layer's fused ownership-check-and-read query.
+
+        ``read(manager)`` returns ``(memory_session_id, data)`` or ``None`` when
+        the user owns no memory session, mirroring resolve_owned_memory_session.
+        """
+        if not self.enabled:
+            return {"ok": False, "reason": "memory_not_enabled"}
+        if not getattr(self.memory_adapter, "hot_layer", None):
+            return {"ok": False, "reason": "hot_layer_unavailable"}
+        try:
+            manager = self._layer_manager(kind)
+            if not manager:
+                return {"ok": False, "reason": unavailable_reason}
+            owned = read(manager)
+        except Exception as e:
+            return {"ok": False, "reason": f"{failure_reason}:{e}"}
+        if owned is None:
+            return {"ok": False, "reason": "session_memory_not_found"}
+        memory_session_id, data = owned
+        return {"ok": True, "memory_session_id": memory_session_id, "data": data}
+
+    def get_owned_session_concepts(self, *, session_id: str, user_id: str) -> Dict[str, Any]:
+        result = self._read_owned_session(
+            "warm",
+            "warm_layer_unavailable",
+            "get_concepts_failed",
+            lambda warm_layer: warm_layer.get_owned_concepts(session_id, user_id),
+        )
+        if result.get("ok"):
+            result["concepts"] = result.pop("data")
+        return result
+
+    def get_owned_session_summaries(self, *, session_id: str, user_id: str) -> Dict[str, Any]:
+        result = self._read_owned_session(
+            "cold",
+            "cold_layer_unavailable",
+            "get_summaries_failed",
+            lambda cold_layer: cold_layer.get_owned_summaries(session_id, user_id),
+        )
+        if result.get("ok"):
+            summaries = result.pop("data")
+            result["summaries"] = summaries
+            result["total_summaries"] = len(summaries)
+        return result
+
+    def get_owned_forgetting_stats(self, *, session_id: str, user_id: str) -> Dict[str, Any]:
+        result = self._read_owned_session(
+            "forgetting",
+            "memory_not_enabled",
+            "get_forgetting_stats_failed",
+            lambda forgetting_manager: forgetting_manager.get_owned_forgetting_stats(session_id, user_id),
+        )
+        if result.get("ok"):
+            result["stats"] = result.pop("data")
+        return result
+
     def ensure_session_access(self, *, session_id: str, user_id: str) -> Dict[str, Any]:
         manager = self.message_manager
         if not manager:
@@ -1605,7 +1777,7 @@ class MemoryService:
         return {"ok": True}
 
     def resolve_owned_memory_session(self, *, session_id: str, user_id: str) -> Dict[str, Any]:
-        if not self.enabled or not self.memory_adapter:
+        if not self.enabled:
             return {"ok": False, "reason": "memory_not_enabled"}
         if not getattr(self.memory_adapter, "hot_layer", None):
             return {"ok": False, "reason": "hot_layer_unavailable"}
@@ -1619,7 +1791,7 @@ class MemoryService:
             return {"ok": False, "reason": f"resolve_session_failed:{e}"}
 
     def get_graph_global_for_user(self, *, user_id: str) -> Dict[str, Any]:
-        if not self.enabled or not self.memory_adapter:
+        if not self.enabled:
             return {"ok": False, "reason": "memory_not_enabled"}
         adapter = self.memory_adapter
         backend = str(getattr(adapter, "store_backend", "")).strip().lower()
@@ -1780,7 +1952,7 @@ class MemoryService:
             return {"ok": False, "reason": f"graph_global_failed:{e}"}
 
     def get_graph_for_session(self, *, session_id: str, user_id: str) -> Dict[str, Any]:
-        if not self.enabled or not self.memory_adapter:
+        if not self.enabled:
             return {"ok": False, "reason": "memory_not_enabled", "handled": False}
         adapter = self.memory_adapter
         backend = str(getattr(adapter, "store_backend", "")).strip().lower()
@@ -2156,7 +2328,8 @@ class MemoryService:
         if action_norm in {"confirm_write", "confirm_write_keep_existing"}:
             if not self.memory_adapter:
                 return {"ok": False, "reason": "memory_adapter_unavailable"}
-            ok = self.memory_adapter.add_message(
+            ok = await asyncio.to_thread(
+                self.memory_adapter.add_message,
                 session_id=str(row.get("session_id") or ""),
                 role="user",
                 content=str(row.get("content") or ""),
@@ -2274,7 +2447,7 @@ class MemoryService:
                 },
             )
 
-        if not self.enabled or not self.memory_adapter:
+        if not self.enabled:
             result = MemoryRecallResult(
                 request_id=request.request_id,
                 trace_id=request.trace_id,
@@ -2444,7 +2617,7 @@ class MemoryService:
             # Legacy adapter compatibility:
             # If adapter does not provide structured recall candidates, keep
             # historical get_context() behavior (raw context string).
-            if self.enabled and self.memory_adapter and not supports_structured_recall:
+            if self.enabled and not supports_structured_recall:
                 legacy_text = self.memory_adapter.get_context(
                     query=str(query or ""),
                     session_id=str(resolved.get("session_id") or session_id),
@@ -2488,7 +2661,7 @@ class MemoryService:
         user_id: Optional[str] = None,
         metadata: Optional[Dict[str, Any]] = None,
     ) -> bool:
-        if not self.enabled or not self.memory_adapter:
+        if not self.enabled:
             return False
         try:
             success = self.memory_adapter.add_message(
@@ -2514,19 +2687,18 @@ class MemoryService:
         session_id: str,
         user_id: Optional[str] = None,
     ) -> Dict[str, Any]:
-        if not self.enabled or not self.memory_adapter:
+        if not self.enabled:
             return {"concepts_created": 0, "total_concepts": 0, "concepts": []}
 
         try:
-            from memory import create_warm_layer_manager
-
             if not self.memory_adapter.hot_layer:
                 return {"concepts_created": 0, "total_concepts": 0, "concepts": []}
 
             scoped_sid = scoped_session_id(session_id, user_id or "default_user")
-            warm_layer = create_warm_layer_manager(self.memory_adapter.hot_layer.connector)
-            concepts_created = warm_layer.cluster_entities(scoped_sid)
-            concepts = warm_layer.get_concepts(scoped_sid)
+            warm_layer = self._layer_manager("warm")
+            # Layer managers block on the graph store and LLM; run them off the loop.
+            concepts_created = await asyncio.to_thread(warm_layer.cluster_entities, scoped_sid)
+            concepts = await asyncio.to_thread(warm_layer.get_concepts, scoped_sid)
 
             if self.event_emitter:
                 await self.event_emitter.emit(
@@ -2555,29 +2727,26 @@ class MemoryService:
         user_id: Optional[str] = None,
         incremental: bool = False,
     ) -> Dict[str, Any]:
-        if not self.enabled or not self.memory_adapter:
+        if not self.enabled:
             return {"status": "skipped", "message": "Memory system not enabled"}
 
         try:
-            from memory import create_cold_layer_manager
-
             if not self.memory_adapter.hot_layer:
                 return {"status": "skipped", "message": "Hot layer not available"}
 
             scoped_sid = scoped_session_id(session_id, user_id or "default_user")
-            cold_layer = create_cold_layer_manager(self.memory_adapter.hot_layer.connector)
-            if not cold_layer.should_create_summary(scoped_sid):
+            cold_layer = self._layer_manager("cold")
+            if not await asyncio.to_thread(cold_layer.should_create_summary, scoped_sid):
                 return {
                     "status": "skipped",
                     "message": "Not enough messages or summary exists",
                 }
 
-            if incremental:
-                summary_id = cold_layer.create_incremental_summary(scoped_sid)
-            else:
-                summary_id = cold_layer.summarize_session(scoped_sid)
+            summarize = cold_layer.create_incremental_summary if incremental else cold_layer.summarize_session
+            async with self._summary_slots:
+                summary_id = await asyncio.to_thread(summarize, scoped_sid)
 
-            summary = cold_layer.get_summary_by_id(summary_id) if summary_id else None
+            summary = await asyncio.to_thread(cold_layer.get_summary_by_id, summary_id) if summary_id else None
 
             if self.event_emitter and summary_id:
                 await self.event_emitter.emit(
@@ -2606,20 +2775,16 @@ class MemoryService:
         session_id: str,
         user_id: Optional[str] = None,
     ) -> Dict[str, Any]:
-        if not self.enabled or not self.memory_adapter:
+        if not self.enabled:
             return {"status": "skipped", "message": "Memory system not enabled"}
 
         try:
-            from memory import create_forgetting_manager
-
             if not self.memory_adapter.hot_layer:
                 return {"status": "skipped", "message": "Hot layer not available"}
 
             scoped_sid = scoped_session_id(session_id, user_id or "default_user")
-            forgetting_manager = create_forgetting_manager(
-                self.memory_adapter.hot_layer.connector
-            )
-            return forgetting_manager.apply_time_decay(scoped_sid)
+            forgetting_manager = self._layer_manager("forgetting")
+            return await asyncio.to_thread(forgetting_manager.apply_time_decay, scoped_sid)
         except Exception as e:
             logger.error("MemoryService: Error applying decay: {}", e)
             return {"status": "error", "message": str(e)}
@@ -2629,26 +2794,22 @@ class MemoryService:
         session_id: str,
         user_id: Optional[str] = None,
     ) -> Dict[str, Any]:
-        if not self.enabled or not self.memory_adapter:
+        if not self.enabled:
             return {"status": "skipped", "message": "Memory system not enabled"}
 
         try:
-            from memory import create_forgetting_manager
-
             if not self.memory_adapter.hot_layer:
                 return {"status": "skipped", "message": "Hot layer not available"}
 
             scoped_sid = scoped_session_id(session_id, user_id or "default_user")
-            forgetting_manager = create_forgetting_manager(
-                self.memory_adapter.hot_layer.connector
-            )
-            return forgetting_manager.cleanup_forgotten(scoped_sid)
+            forgetting_manager = self._layer_manager("forgetting")
+            return await asyncio.to_thread(forgetting_manager.cleanup_forgotten, scoped_sid)
         except Exception as e:
             logger.error("MemoryService: Error cleaning up forgotten: {}", e)
             return {"status": "error", "message": str(e)}
 
     def is_enabled(self) -> bool:
-        return self.enabled and self.memory_adapter is not None
+        return self.enabled
 
 
 
@@ -2,39 +2,63 @@ from __future__ import annotations
 
 import json
 import re
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
+_WHITESPACE_RE = re.compile(r"\s+")
+_JSON_DECODER = json.JSONDecoder()
+_JSON_OBJECT_ATTEMPTS = 4
+# Underscores separate latin tokens, so they are simply left out of the match.
+_TOKEN_RE = re.compile(r"[\u4e00-\u9fff]+|[a-z0-9]+")
+_ALLOWED_CANDIDATE_TYPES = frozenset(
+    {
+        "goal",
+        "preference",
+        "constraint",
+        "identity",
+        "project_state",
+    }
+)
+# Longer texts bypass the cache so one big turn cannot pin or evict hot entries.
+_NORMALIZE_CACHE_MAX_CHARS = 2048
+
+
+def _normalize(text: str) -> str:
+    return _WHITESPACE_RE.sub(" ", text.strip().lower())
+
+
+_normalize_cached = lru_cache(maxsize=1024)(_normalize)
+
 
 def normalize_content(text: str) -> str:
-    content = (text or "").strip().lower()
-    content = re.sub(r"\s+", " ", content)
-    return content
+    content = text or ""
+    if len(content) > _NORMALIZE_CACHE_MAX_CHARS:
+        return _normalize(content)
+    return _normalize_cached(content)
 
 
 def extract_json_object(text: str) -> Optional[Dict[str, Any]]:
     if not text:
         return None
-    match = re.search(r"\{[\s\S]*\}", text)
-    if not match:
-        return None
-    try:
-        return json.loads(match.group(0))
-    except Exception:
-        return None
+    # Decode from each opening brace in turn; raw_decode stops at the end of the
+    # object, so trailing prose (or a later brace) does not spoil the parse.
+    start = text.find("{")
+    for _ in range(_JSON_OBJECT_ATTEMPTS):
+        if start < 0:
+            return None
+        try:
+            obj, _end = _JSON_DECODER.raw_decode(text, start)
+            return obj
+        except ValueError:
+            start = text.find("{", start + 1)
+    return None
 
 
 def extract_tokens(text: str) -> List[str]:
     cleaned = normalize_content(text)
     if not cleaned:
         return []
-    chunks = re.findall(r"[\u4e00-\u9fff]+|[a-z0-9_]+", cleaned)
-    tokens: List[str] = []
-    for chunk in chunks:
-        if re.match(r"^[a-z0-9_]+$", chunk):
-            tokens.extend([p for p in chunk.split("_") if p])
-        else:
-            tokens.append(chunk)
-    return tokens
+    return _TOKEN_RE.findall(cleaned)
 
 
 def build_semantic_keys(content: str, llm_keys: Optional[List[str]] = None) -> List[str]:
@@ -54,13 +78,6 @@ def build_semantic_keys(content: str, llm_keys: Optional[List[str]] = None) -> L
 
 
 def normalize_candidates(candidates: Any) -> List[Dict[str, Any]]:
-    allowed_types = {
-        "goal",
-        "preference",
-        "constraint",
-        "identity",
-        "project_state",
-    }
     result: List[Dict[str, Any]] = []
     if not isinstance(candidates, list):
         return result
@@ -70,7 +87,7 @@ def normalize_candidates(candidates: Any) -> List[Dict[str, Any]]:
             continue
         raw_type = str(item.get("type", "")).strip().lower()
         content = str(item.get("content", "")).strip()
-        if raw_type not in allowed_types or not content:
+        if raw_type not in _ALLOWED_CANDIDATE_TYPES or not content:
             continue
         semantic_keys = build_semantic_keys(
             content=content,
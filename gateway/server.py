@@ -7,7 +7,7 @@ import os
 import time
 import uuid
 from types import SimpleNamespace
-from typing import Dict, Any, Optional, Callable
+from typing import Dict, Any, Optional, Callable, Tuple
 from datetime import datetime, timezone
 from loguru import logger
 
@@ -69,6 +69,10 @@ class GatewayServer:
         # Request handlers registry.
         self._handlers: Dict[RequestType, Callable] = {}
         self._register_default_handlers()
+        # Handlers are only registered above, so the sorted method list is fixed.
+        self.handler_methods: Tuple[str, ...] = tuple(
+            sorted(str(method.value) for method in self._handlers)
+        )
         
         # Idempotency cache for responses.
         self._idempotency_cache: Dict[str, ResponseMessage] = {}
@@ -1905,10 +1909,8 @@ class GatewayServer:
             recent_messages = self.message_manager.get_recent_messages(
                 params.session_id, count=6, user_id=user_id
             )
-            messages = [
-                {"role": msg["role"], "content": msg["content"]}
-                for msg in (recent_messages or [])
-            ]
+            # Rows are fresh {role, content} dicts already; no need to rebuild them.
+            messages = list(recent_messages or [])
             messages.append({"role": "user", "content": user_query})
 
             if not self.conversation_service:
@@ -2437,6 +2439,8 @@ class GatewayServer:
             base_url = request.params.get("base_url")
             
             result = await self.config_service.switch_model(user_id, model, api_key, base_url)
+            if result["success"] and self.memory_service:
+                self.memory_service.invalidate_memory_api(user_id)
             
             return GatewayProtocol.create_response(
                 request.id,
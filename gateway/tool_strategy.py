@@ -1,9 +1,47 @@
 ﻿from __future__ import annotations
 
+import re
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
 
+def _keyword_re(*keywords: str) -> re.Pattern[str]:
+    # One compiled alternation per intent: a single scan instead of one per keyword.
+    return re.compile("|".join(re.escape(k) for k in keywords))
+
+
+_INTENT_PATTERNS: Dict[str, re.Pattern[str]] = {
+    "browser": _keyword_re("browser", "url", "website", "click", "download page", "ui", "button", "on screen", "locate"),
+    "process": _keyword_re("open app", "launch", "process", "start client", "run command"),
+    "filesystem": _keyword_re("folder", "directory", "path", "save", "file", "exists"),
+    "workflow": _keyword_re("workflow", "resume", "checkpoint", "approval", "retry"),
+    "content": _keyword_re("fetch", "web page", "pdf", "image", "ocr"),
+    "runtime": _keyword_re("session", "agent", "plugin", "memory", "channel", "gateway status"),
+    "schedule": _keyword_re("schedule", "cron", "job", "periodic", "recurring"),
+    "self_evolve": _keyword_re(
+        "self evolve",
+        "self-evolve",
+        "self modify",
+        "modify your code",
+        "modify yourself",
+        "self improvement",
+        "agent evolves",
+        "自我进化",
+        "修改自己的代码",
+    ),
+    "graph": _keyword_re("graph", "node", "link", "relation", "depends on"),
+    "destructive": _keyword_re("delete", "remove", "run command", "execute"),
+    "explicit_dangerous": _keyword_re(
+        "delete",
+        "remove",
+        "terminate",
+        "kill process",
+        "execute command",
+        "run command",
+    ),
+}
+
+
 @dataclass
 class ToolCandidate:
     tool_type: str
@@ -58,6 +96,10 @@ class ToolStrategyEngine:
                 continue
             quality_map[f"{service_name}:{tool_name}"] = item
 
+        # Everything derived from the text alone is computed once, not per catalog entry.
+        intents = {name for name, pattern in _INTENT_PATTERNS.items() if pattern.search(text)}
+        text_tokens = self._tokens(text)
+
         scored: List[ToolCandidate] = []
         for entry in catalog:
             service = str(entry.get("service_name", ""))
@@ -70,7 +112,7 @@ class ToolStrategyEngine:
             reasons: List[str] = []
 
             overlap = 0
-            for token in self._tokens(text):
+            for token in text_tokens:
                 if token and (token in full or token in desc):
                     overlap += 1
             if overlap > 0:
@@ -78,42 +120,42 @@ class ToolStrategyEngine:
                 score += add
                 reasons.append(f"overlap+{add:.2f}")
 
-            if any(k in text for k in ("browser", "url", "website", "click", "download page", "ui", "button", "on screen", "locate")):
+            if "browser" in intents:
                 if service == "computer_control" and tool == "browser_action":
                     score += 0.40
                     reasons.append("browser_intent")
                 if service == "computer_control" and tool == "perception_action":
                     score += 0.45
                     reasons.append("perception_intent")
-            if any(k in text for k in ("open app", "launch", "process", "start client", "run command")):
+            if "process" in intents:
                 if service == "computer_control" and tool in {"process_action", "execute_command"}:
                     score += 0.35
                     reasons.append("process_intent")
-            if any(k in text for k in ("folder", "directory", "path", "save", "file", "exists")):
+            if "filesystem" in intents:
                 if service == "computer_control" and tool in {"fs_action", "read_file", "write_file", "list_files"}:
                     score += 0.30
                     reasons.append("filesystem_intent")
-            if any(k in text for k in ("workflow", "resume", "checkpoint", "approval", "retry")):
+            if "workflow" in intents:
                 if service == "moirai":
                     score += 0.40
                     reasons.append("workflow_intent")
-            if any(k in text for k in ("fetch", "web page", "pdf", "image", "ocr")):
+            if "content" in intents:
                 if service == "computer_control" and tool == "content_action":
                     score += 0.35
                     reasons.append("content_intent")
-            if any(k in text for k in ("session", "agent", "plugin", "memory", "channel", "gateway status")):
+            if "runtime" in intents:
                 if service == "computer_control" and tool == "runtime_action":
                     score += 0.35
                     reasons.append("runtime_intent")
-            if any(k in text for k in ("schedule", "cron", "job", "periodic", "recurring")):
+            if "schedule" in intents:
                 if service == "computer_control" and tool == "schedule_action":
                     score += 0.35
                     reasons.append("schedule_intent")
-            if any(k in text for k in ("self evolve", "self-evolve", "self modify", "modify your code", "modify yourself", "self improvement", "agent evolves", "自我进化", "修改自己的代码")):
+            if "self_evolve" in intents:
                 if service == "self_evolve":
                     score += 0.55
                     reasons.append("self_evolve_intent")
-            if any(k in text for k in ("graph", "node", "link", "relation", "depends on")):
+            if "graph" in intents:
                 if service == "computer_control" and tool == "graph_action":
                     score += 0.35
                     reasons.append("graph_intent")
@@ -122,9 +164,7 @@ class ToolStrategyEngine:
                 score += 0.20
                 reasons.append("historical_preference")
 
-            if tool in {"delete_file", "execute_command"} and not any(
-                k in text for k in ("delete", "remove", "run command", "execute")
-            ):
+            if tool in {"delete_file", "execute_command"} and "destructive" not in intents:
                 score -= 0.10
                 reasons.append("risk_penalty")
 
@@ -133,7 +173,7 @@ class ToolStrategyEngine:
             score += self._risk_cost_delta(
                 service_name=service,
                 tool_name=tool,
-                text=text,
+                explicit_dangerous="explicit_dangerous" in intents,
                 profile=profile,
                 reasons=reasons,
             )
@@ -214,21 +254,10 @@ class ToolStrategyEngine:
         *,
         service_name: str,
         tool_name: str,
-        text: str,
+        explicit_dangerous: bool,
         profile: Dict[str, Any],
         reasons: List[str],
     ) -> float:
-        explicit_dangerous = any(
-            k in text
-            for k in (
-                "delete",
-                "remove",
-                "terminate",
-                "kill process",
-                "execute command",
-                "run command",
-            )
-        )
         risk_level = self._default_risk_level(service_name=service_name, tool_name=tool_name)
         cost_level = self._default_cost_level(service_name=service_name, tool_name=tool_name)
 
@@ -704,7 +704,8 @@ class MemoryAdapter:
             state['messages_since_cluster'] += 1
             state['last_message_at'] = time.time()
             self._persist_maintenance_state(scoped_sid, state)
-            self._schedule_maintenance(scoped_sid, state)
+            if self._maintenance_due(state, state['last_message_at']):
+                self._schedule_maintenance(scoped_sid, state)
             if self._config and getattr(self._config.memory.warm_layer, 'enabled', False):
                 self._schedule_idle_cluster_check(scoped_sid)
         except Exception as e:
@@ -717,6 +718,24 @@ class MemoryAdapter:
             return
         self._on_message_saved_after_store(session_id, role, user_id)
 
+    def _maintenance_due(self, state: dict, now: float) -> bool:
+        """Cheap pre-check of the _maybe_* gates, so most messages spawn no worker."""
+        defaults = self._maintenance_defaults
+        if self._cold_layer and now - state['last_summary_at'] >= defaults['summary_min_interval_s']:
+            return True
+        if self._forgetting and now - state['last_decay_at'] >= defaults['decay_interval_s']:
+            return True
+        if not self._warm_layer or not self._config:
+            return False
+        if not getattr(self._config.memory.warm_layer, 'enabled', False):
+            return False
+        min_cluster = getattr(self._config.memory.warm_layer, 'min_cluster_size', 3)
+        cluster_every = max(defaults['cluster_every_messages'], min_cluster * 4)
+        return (
+            state['messages_since_cluster'] >= cluster_every
+            and now - state['last_cluster_at'] >= defaults['cluster_min_interval_s']
+        )
+
     def _schedule_maintenance(self, session_id: str, state: dict):
         with self._maintenance_lock:
             if state.get('maintenance_queued'):
@@ -835,8 +854,9 @@ class MemoryAdapter:
                 summary_id = self._cold_layer.create_incremental_summary(session_id)
                 if summary_id:
                     logger.info(f"Cold layer summary created: session={session_id}, summary={summary_id}")
-                state['last_summary_at'] = now
-                self._persist_maintenance_state(session_id, state)
+            # Stamp every check so the message-path gate stays closed for the interval.
+            state['last_summary_at'] = now
+            self._persist_maintenance_state(session_id, state)
         finally:
             with self._maintenance_lock:
                 state['summary_running'] = False
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
+import heapq
 import json
+import os
 import re
 import threading
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from .base import MemoryStore
 from memory.session_scope import scoped_session_id
@@ -39,6 +41,8 @@ class FlatMemoryStore(MemoryStore):
         Path(self.file_path).parent.mkdir(parents=True, exist_ok=True)
         Path(self.file_path).touch(exist_ok=True)
         self._lock = threading.RLock()
+        # ((mtime_ns, size), [(row, normalized content), ...]) for read paths.
+        self._rows_cache: Optional[Tuple[Tuple[int, int], List[Tuple[Dict[str, Any], str]]]] = None
 
     def is_ready(self) -> bool:
         return True
@@ -46,6 +50,17 @@ class FlatMemoryStore(MemoryStore):
     def _append_row(self, row: Dict[str, Any]) -> None:
         with open(self.file_path, "a", encoding="utf-8") as f:
             f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        cached = self._rows_cache
+        if cached is not None:
+            st = os.stat(self.file_path)
+            cached[1].append((row, _normalize(str(row.get("content") or ""))))
+            self._rows_cache = ((st.st_mtime_ns, st.st_size), cached[1])
+
+    def _write_rows(self, rows: List[Dict[str, Any]]) -> None:
+        self._rows_cache = None
+        with open(self.file_path, "w", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
 
     def _load_rows(self) -> List[Dict[str, Any]]:
         rows: List[Dict[str, Any]] = []
@@ -60,6 +75,20 @@ class FlatMemoryStore(MemoryStore):
                     continue
         return rows
 
+    def _indexed_rows(self) -> List[Tuple[Dict[str, Any], str]]:
+        """Parsed rows with their normalized content, reused until the file changes.
+
+        Read-only: callers must not mutate the returned rows. Call with ``_lock`` held.
+        """
+        st = os.stat(self.file_path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = self._rows_cache
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        indexed = [(row, _normalize(str(row.get("content") or ""))) for row in self._load_rows()]
+        self._rows_cache = (stamp, indexed)
+        return indexed
+
     def add_message(
         self,
         *,
@@ -102,11 +131,10 @@ class FlatMemoryStore(MemoryStore):
         tokens = _tokenize(query)[:8]
         scoped_sid = scoped_session_id(session_id, user_id)
         with self._lock:
-            rows = [r for r in self._load_rows() if str(r.get("user_id") or "") == str(user_id)]
+            rows = [(r, base) for r, base in self._indexed_rows() if str(r.get("user_id") or "") == str(user_id)]
         scored: List[Dict[str, Any]] = []
-        for row in rows:
+        for row, base in rows:
             content = str(row.get("content") or "")
-            base = _normalize(content)
             hit = 0
             for tk in tokens:
                 if tk in base:
@@ -128,15 +156,16 @@ class FlatMemoryStore(MemoryStore):
                     "relevance_score": min(1.0, score),
                 }
             )
-        scored.sort(
+        # Partial top-n selection; same order as a full descending sort.
+        return heapq.nlargest(
+            max(3, int(top_k) * 2),
+            scored,
             key=lambda x: (
                 float(x.get("relevance_score") or 0.0),
                 float(x.get("importance") or 0.0),
                 str(x.get("created_at") or ""),
             ),
-            reverse=True,
         )
-        return scored[: max(3, int(top_k) * 2)]
 
     def get_context(self, *, query: str, session_id: str, user_id: str) -> str:
         rows = self.collect_recall_candidates(query=query, session_id=session_id, user_id=user_id, top_k=5, mode="fast")
@@ -176,9 +205,7 @@ class FlatMemoryStore(MemoryStore):
                 if row_id:
                     existing_ids.add(row_id)
                 imported += 1
-            with open(self.file_path, "w", encoding="utf-8") as f:
-                for row in rows:
-                    f.write(json.dumps(row, ensure_ascii=False) + "\n")
+            self._write_rows(rows)
         return {"ok": True, "imported": {"memory_items": imported, "nodes": 0, "edges": 0}, "merge": bool(merge)}
 
     def list_memory_entries(
@@ -195,9 +222,9 @@ class FlatMemoryStore(MemoryStore):
         wanted_types = {str(x).strip().lower() for x in (memory_types or []) if str(x).strip()}
         q = _normalize(query)
         with self._lock:
-            rows = self._load_rows()
+            rows = list(self._indexed_rows())
         out: List[Dict[str, Any]] = []
-        for row in rows:
+        for row, normalized in rows:
             if str(row.get("user_id") or "") != str(user_id):
                 continue
             if scoped_sid and str(row.get("session_id") or "") != scoped_sid:
@@ -206,7 +233,7 @@ class FlatMemoryStore(MemoryStore):
             if wanted_types and mt not in wanted_types:
                 continue
             content = str(row.get("content") or "")
-            if q and q not in _normalize(content):
+            if q and q not in normalized:
                 continue
             out.append(
                 {
@@ -267,9 +294,7 @@ class FlatMemoryStore(MemoryStore):
                     updated_row = dict(row)
                 break
             if changed:
-                with open(self.file_path, "w", encoding="utf-8") as f:
-                    for row in rows:
-                        f.write(json.dumps(row, ensure_ascii=False) + "\n")
+                self._write_rows(rows)
         return {"ok": changed, "entry": updated_row if changed else None, "reason": None if changed else "not_found_or_no_change"}
 
     def delete_memory_entry(
@@ -294,9 +319,7 @@ class FlatMemoryStore(MemoryStore):
                 changed = True
                 break
             if changed:
-                with open(self.file_path, "w", encoding="utf-8") as f:
-                    for row in rows:
-                        f.write(json.dumps(row, ensure_ascii=False) + "\n")
+                self._write_rows(rows)
         return {"ok": changed, "reason": None if changed else "not_found"}
 
     def get_capabilities(self) -> Dict[str, Any]:
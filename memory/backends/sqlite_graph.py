@@ -33,17 +33,6 @@ def _tokenize(text: str) -> List[str]:
     return [x for x in out if len(x) >= 2]
 
 
-def _score_overlap(tokens: List[str], text: str) -> float:
-    if not tokens:
-        return 0.0
-    hay = _normalize_text(text)
-    hit = 0
-    for t in tokens:
-        if t in hay:
-            hit += 1
-    return hit / max(1, len(tokens))
-
-
 class SqliteGraphMemoryStore(MemoryStore):
     """
     Lightweight graph-capable memory backend using sqlite3.
@@ -281,15 +270,20 @@ class SqliteGraphMemoryStore(MemoryStore):
 
         with self._lock:
             # Step-1 lexical seed memories.
+            # Count token hits in SQL so the 64 seeds are the best lexical
+            # matches (newest first on ties) rather than just the newest ones.
+            hits_sql = " + ".join(["(instr(lower(content), ?) > 0)"] * len(tokens))
             where_like = " OR ".join(["lower(content) LIKE ?"] * len(tokens))
-            params: List[Any] = [user_id]
+            params: List[Any] = [t.lower() for t in tokens]
+            params.append(user_id)
             params.extend([f"%{t.lower()}%" for t in tokens])
             seed_rows = self._conn.execute(
                 f"""
-                SELECT id, source_layer, content, importance, created_at, session_id
+                SELECT id, source_layer, content, importance, created_at, session_id,
+                       {hits_sql} AS hits
                 FROM memory_items
                 WHERE user_id = ? AND ({where_like})
-                ORDER BY created_at DESC
+                ORDER BY hits DESC, created_at DESC
                 LIMIT 64
                 """,
                 params,
@@ -297,7 +291,7 @@ class SqliteGraphMemoryStore(MemoryStore):
 
             seed: Dict[str, Dict[str, Any]] = {}
             for r in seed_rows:
-                score = _score_overlap(tokens, r["content"])
+                score = int(r["hits"] or 0) / len(tokens)
                 if score <= 0:
                     continue
                 seed[r["id"]] = {
@@ -458,14 +452,16 @@ class SqliteGraphMemoryStore(MemoryStore):
                 self._conn.execute("DELETE FROM edges")
                 self._conn.execute("DELETE FROM nodes")
                 self._conn.execute("DELETE FROM memory_items")
-            for row in nodes:
-                self._conn.execute(
-                    """
-                    INSERT OR REPLACE INTO nodes(
-                        id, user_id, session_id, node_type, title, content, tags_json,
-                        importance, created_at, updated_at, metadata_json
-                    ) VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
+            # One executemany per table keeps bulk imports in C instead of a
+            # Python-level execute() per row.
+            self._conn.executemany(
+                """
+                INSERT OR REPLACE INTO nodes(
+                    id, user_id, session_id, node_type, title, content, tags_json,
+                    importance, created_at, updated_at, metadata_json
+                ) VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
                     (
                         row.get("id"),
                         row.get("user_id"),
@@ -478,16 +474,18 @@ class SqliteGraphMemoryStore(MemoryStore):
                         row.get("created_at") or _utc_now_iso(),
                         row.get("updated_at") or _utc_now_iso(),
                         row.get("metadata_json") or "{}",
-                    ),
-                )
-                imported["nodes"] += 1
-            for row in edges:
-                self._conn.execute(
-                    """
-                    INSERT OR REPLACE INTO edges(
-                        id, user_id, src_node_id, dst_node_id, edge_type, weight, created_at, metadata_json
-                    ) VALUES(?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
+                    )
+                    for row in nodes
+                ],
+            )
+            imported["nodes"] = len(nodes)
+            self._conn.executemany(
+                """
+                INSERT OR REPLACE INTO edges(
+                    id, user_id, src_node_id, dst_node_id, edge_type, weight, created_at, metadata_json
+                ) VALUES(?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
                     (
                         row.get("id") or f"edge:{uuid.uuid4().hex}",
                         row.get("user_id"),
@@ -497,17 +495,19 @@ class SqliteGraphMemoryStore(MemoryStore):
                         float(row.get("weight") or 0.5),
                         row.get("created_at") or _utc_now_iso(),
                         row.get("metadata_json") or "{}",
-                    ),
-                )
-                imported["edges"] += 1
-            for row in memory_items:
-                self._conn.execute(
-                    """
-                    INSERT OR REPLACE INTO memory_items(
-                        id, user_id, session_id, role, memory_type, source_layer, content, semantic_keys_json,
-                        importance, created_at, last_used_at, source_turn, metadata_json
-                    ) VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
+                    )
+                    for row in edges
+                ],
+            )
+            imported["edges"] = len(edges)
+            self._conn.executemany(
+                """
+                INSERT OR REPLACE INTO memory_items(
+                    id, user_id, session_id, role, memory_type, source_layer, content, semantic_keys_json,
+                    importance, created_at, last_used_at, source_turn, metadata_json
+                ) VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
                     (
                         row.get("id") or f"m:{uuid.uuid4().hex}",
                         row.get("user_id"),
@@ -522,9 +522,11 @@ class SqliteGraphMemoryStore(MemoryStore):
                         row.get("last_used_at") or _utc_now_iso(),
                         int(row.get("source_turn") or 0),
                         row.get("metadata_json") or "{}",
-                    ),
-                )
-                imported["memory_items"] += 1
+                    )
+                    for row in memory_items
+                ],
+            )
+            imported["memory_items"] = len(memory_items)
         return {"ok": True, "imported": imported, "merge": bool(merge)}
 
     def list_memory_entries(
@@ -4,9 +4,10 @@ Cold-layer manager.
 Use an LLM to compress conversation history into long-term summaries.
 """
 import logging
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from openai import OpenAI
 from .api_settings import resolve_memory_api
+from .session_scope import OWNED_SESSION_MATCH, logical_session_id, owned_session_params
 
 logger = logging.getLogger(__name__)
 
@@ -221,6 +222,33 @@ class ColdLayerManager:
         
         results = self.connector.query(query, {"session_id": f"session_{session_id}"})
         return [dict(r) for r in results]
+
+    def get_owned_summaries(self, session_id: str, user_id: str) -> Optional[Tuple[str, List[Dict]]]:
+        """
+        Resolve the user's session and fetch its summaries in one query.
+
+        Returns (memory_session_id, summaries), or None when the user owns no
+        memory session for ``session_id``.
+        """
+        query = OWNED_SESSION_MATCH + """
+        OPTIONAL MATCH (sum:Summary)-[:SUMMARIZES]->(s)
+        WITH s, sum
+        ORDER BY sum.created_at DESC
+        RETURN s.id as session_node_id,
+               collect(CASE WHEN sum IS NULL THEN NULL ELSE {
+                   id: sum.id,
+                   content: sum.content,
+                   importance: sum.importance,
+                   message_count: coalesce(properties(sum)['message_count'], 0),
+                   created_at: sum.created_at
+               } END) as summaries
+        """
+
+        results = self.connector.query(query, owned_session_params(session_id, user_id))
+        if not results:
+            return None
+        row = results[0]
+        return logical_session_id(row.get("session_node_id")), [dict(r) for r in row.get("summaries") or []]
     
     def get_summary_by_id(self, summary_id: str) -> Optional[Dict]:
         """Get a specific summary by its ID."""
@@ -3,8 +3,9 @@
 import math
 import logging
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 from .neo4j_connector import Neo4jConnector
+from .session_scope import OWNED_SESSION_MATCH, logical_session_id, owned_session_params
 
 logger = logging.getLogger(__name__)
 
@@ -371,14 +372,7 @@ class ForgettingManager:
             result = self.connector.query(query, params)
             
             if result:
-                stats = result[0]
-                return {
-                    'total_nodes': stats.get('total_nodes', 0),
-                    'avg_importance': round(stats.get('avg_importance', 0), 3),
-                    'weak_nodes': stats.get('weak_nodes', 0),
-                    'strong_nodes': stats.get('strong_nodes', 0),
-                    'status': 'success'
-                }
+                return self._stats_payload(result[0])
             
             return {"status": "no_data"}
             
@@ -386,6 +380,44 @@ class ForgettingManager:
             logger.error(f"Get forgetting stats failed: {e}")
             return {"status": "error", "error": str(e)}
 
+    def get_owned_forgetting_stats(self, session_id: str, user_id: str) -> Optional[Tuple[str, Dict]]:
+        """
+        Resolve the user's session and compute its forgetting stats in one query.
+
+        Returns (memory_session_id, stats), or None when the user owns no
+        memory session for ``session_id``.
+        """
+        query = OWNED_SESSION_MATCH + """
+        OPTIONAL MATCH (n)
+        WHERE n.layer IN [0, 1]
+        AND (
+            EXISTS { MATCH (n)-[:PART_OF_SESSION]->(s) }
+            OR EXISTS { MATCH (n)-[:FROM_MESSAGE]->(:Message)-[:PART_OF_SESSION]->(s) }
+        )
+        RETURN
+            s.id as session_node_id,
+            count(n) as total_nodes,
+            avg(n.importance) as avg_importance,
+            sum(CASE WHEN n.importance < 0.3 THEN 1 ELSE 0 END) as weak_nodes,
+            sum(CASE WHEN n.importance >= 0.7 THEN 1 ELSE 0 END) as strong_nodes
+        """
+
+        result = self.connector.query(query, owned_session_params(session_id, user_id))
+        if not result:
+            return None
+        row = result[0]
+        return logical_session_id(row.get('session_node_id')), self._stats_payload(row)
+
+    @staticmethod
+    def _stats_payload(stats: Dict) -> Dict:
+        return {
+            'total_nodes': stats.get('total_nodes', 0),
+            'avg_importance': round(stats.get('avg_importance') or 0, 3),
+            'weak_nodes': stats.get('weak_nodes', 0),
+            'strong_nodes': stats.get('strong_nodes', 0),
+            'status': 'success'
+        }
+
 
 def create_forgetting_manager(connector: Neo4jConnector) -> ForgettingManager:
     """Factory function to create a ForgettingManager."""
@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
+import threading
+from collections import OrderedDict
 from typing import Any, Dict, List, Optional
 
 from openai import OpenAI
@@ -52,14 +55,36 @@ Role: {role}
 Content: {content}
 """
 
+    # Successful extractions kept per extractor, keyed by a digest of the prompt inputs.
+    CACHE_SIZE = 512
+
     def __init__(self, api_key: str, base_url: str, model: str, temperature: float = 0.3):
         self.client = OpenAI(api_key=api_key, base_url=base_url)
         self.model = model
         self.temperature = temperature
+        self._cache: "OrderedDict[bytes, ExtractionResult]" = OrderedDict()
+        self._cache_lock = threading.Lock()
         logger.info("LLMExtractor initialized with model: %s", model)
 
+    @staticmethod
+    def _cache_key(role: str, content: str, context: Optional[List[Dict]]) -> bytes:
+        # Only the last three context messages reach the prompt.
+        recent = [(msg.get("role", "unknown"), msg.get("content", "")) for msg in (context or [])[-3:]]
+        raw = json.dumps([role, content, recent], ensure_ascii=False, default=str)
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).digest()
+
     def extract(self, role: str, content: str, context: Optional[List[Dict]] = None) -> ExtractionResult:
-        """Extract structured information from one message."""
+        """Extract structured information from one message.
+
+        Repeated messages (greetings, boilerplate, repeated recall queries) are
+        answered from a small LRU cache instead of another LLM call.
+        """
+        key = self._cache_key(role, content, context)
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached.model_copy(deep=True)
         try:
             prompt = self.EXTRACTION_PROMPT.format(role=role, content=content)
             system_prompt = "Return strict JSON only. Do not output markdown."
@@ -120,6 +145,10 @@ Content: {content}
                 len(result.tuples),
                 len(result.entities),
             )
+            with self._cache_lock:
+                self._cache[key] = result.model_copy(deep=True)
+                if len(self._cache) > self.CACHE_SIZE:
+                    self._cache.popitem(last=False)
             return result
 
         except Exception as e:
@@ -1,6 +1,6 @@
 ﻿from __future__ import annotations
 
-from typing import Optional, Tuple
+from typing import Any, Dict, Optional, Tuple
 
 
 def normalize_user_id(user_id: Optional[str]) -> str:
@@ -24,6 +24,32 @@ def session_node_id(session_id: str, user_id: Optional[str]) -> str:
     return f"session_{scoped_session_id(session_id, user_id)}"
 
 
+# Binds `s` to the user's session node (scoped id, then legacy raw id).
+# Prefix for queries that check ownership and read session data in one
+# round-trip; pair with owned_session_params().
+OWNED_SESSION_MATCH = """
+MATCH (s:Session)-[:OWNED_BY]->(:User {id: $user_node_id})
+WHERE s.id IN $candidate_ids
+WITH s LIMIT 1
+"""
+
+
+def owned_session_params(session_id: str, user_id: Optional[str]) -> Dict[str, Any]:
+    scoped = scoped_session_id(session_id, user_id)
+    return {
+        "user_node_id": user_node_id(user_id),
+        "candidate_ids": [f"session_{scoped}", f"session_{session_id}"],
+    }
+
+
+def logical_session_id(session_node_id: str) -> str:
+    """Strip the `session_` node-id prefix."""
+    sid = str(session_node_id or "")
+    if sid.startswith("session_"):
+        return sid[len("session_") :]
+    return sid
+
+
 def resolve_owned_session_id(connector, session_id: str, user_id: Optional[str]) -> Optional[str]:
     """
     Resolve session id owned by current user.
@@ -34,28 +60,14 @@ def resolve_owned_session_id(connector, session_id: str, user_id: Optional[str])
     if not connector:
         return scoped_session_id(session_id, user_id)
 
-    uid = user_node_id(user_id)
-    scoped = scoped_session_id(session_id, user_id)
-    candidates = [f"session_{scoped}", f"session_{session_id}"]
     try:
         rows = connector.query(
-            """
-            MATCH (s:Session)-[:OWNED_BY]->(u:User {id: $user_node_id})
-            WHERE s.id IN $candidate_ids
-            RETURN s.id AS id
-            LIMIT 1
-            """,
-            {
-                "user_node_id": uid,
-                "candidate_ids": candidates,
-            },
+            OWNED_SESSION_MATCH + "RETURN s.id AS id",
+            owned_session_params(session_id, user_id),
         )
         if not rows:
             return None
-        sid = str(rows[0].get("id") or "")
-        if sid.startswith("session_"):
-            return sid[len("session_") :]
-        return sid
+        return logical_session_id(rows[0].get("id"))
     except Exception:
         return None
 
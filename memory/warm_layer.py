@@ -5,9 +5,10 @@ Cluster base-layer nodes into higher-level topic concept nodes.
 """
 import logging
 import json
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from openai import OpenAI
 from .api_settings import resolve_memory_api
+from .session_scope import OWNED_SESSION_MATCH, logical_session_id, owned_session_params
 
 logger = logging.getLogger(__name__)
 
@@ -360,6 +361,30 @@ class WarmLayerManager:
         
         results = self.connector.query(query, {"session_id": f"session_{session_id}"})
         return [dict(r) for r in results]
+
+    def get_owned_concepts(self, session_id: str, user_id: str) -> Optional[Tuple[str, List[Dict]]]:
+        """
+        Resolve the user's session and fetch its concepts in one query.
+
+        Returns (memory_session_id, concepts), or None when the user owns no
+        memory session for ``session_id``.
+        """
+        query = OWNED_SESSION_MATCH + """
+        OPTIONAL MATCH (s)<-[:PART_OF_SESSION]-(c:Concept)
+        OPTIONAL MATCH (c)<-[:BELONGS_TO]-(e:Entity)
+        WITH s, c, count(e) as entity_count
+        ORDER BY c.importance DESC
+        RETURN s.id as session_node_id,
+               collect(CASE WHEN c IS NULL THEN NULL ELSE {
+                   id: c.id, content: c.content, importance: c.importance, entity_count: entity_count
+               } END) as concepts
+        """
+
+        results = self.connector.query(query, owned_session_params(session_id, user_id))
+        if not results:
+            return None
+        row = results[0]
+        return logical_session_id(row.get("session_node_id")), [dict(c) for c in row.get("concepts") or []]
     
     def get_entities_by_concept(self, concept_id: str) -> List[Dict]:
         """Get all entities that belong to a given concept."""
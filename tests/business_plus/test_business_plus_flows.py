@@ -41,6 +41,11 @@ class _InMemoryMessageManager:
         self.sessions[self._k(user_id, sid)] = {"session_id": sid, "user_id": user_id, "messages": []}
         return sid
 
+    def ensure_session(self, session_id: Optional[str] = None, user_id: Optional[str] = None) -> str:
+        if session_id and self.get_session(session_id, user_id=user_id):
+            return session_id
+        return self.create_session(session_id=session_id, user_id=user_id)
+
     def begin_turn(
         self,
         *,
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from agentkit.mcp.agent_manager import AgentConfig, AgentManager
+
+
+def _manager() -> AgentManager:
+    return AgentManager.__new__(AgentManager)
+
+
+def test_replace_placeholders_fills_config_env_and_time_fields(monkeypatch):
+    monkeypatch.setenv("PROMETHEA_TEST_VAR", "from-env")
+    cfg = AgentConfig(id="model-1", name="Neo", base_name="base", system_prompt="", description="{{ModelId}}")
+
+    out = _manager()._replace_placeholders(
+        "{{AgentName}}/{{MaidName}} {{Description}} {{PROMETHEA_TEST_VAR}} {{CurrentDate}} {{Unknown}}",
+        cfg,
+    )
+
+    name_part, description, env_value, date_value, unknown = out.split(" ")
+    assert name_part == "Neo/Neo"
+    # Substituted values are not expanded a second time.
+    assert description == "{{ModelId}}"
+    assert env_value == "from-env"
+    assert len(date_value) == 10 and date_value[4] == "-"
+    assert unknown == "{{Unknown}}"
+
+
+def test_replace_placeholders_without_config_keeps_agent_fields():
+    assert _manager()._replace_placeholders("Hi {{AgentName}}", None) == "Hi {{AgentName}}"
+    assert _manager()._replace_placeholders("", None) == ""
@@ -15,36 +15,52 @@ from gateway.http.schemas import APIConfigUpdate, UserConfigUpdate, UserDeleteRe
 @pytest.mark.asyncio
 async def test_get_current_user_id_prefers_middleware_state():
     request = SimpleNamespace(state=SimpleNamespace(user_id="mw_user"))
-    out = await auth.get_current_user_id(request=request, token=None)
+    out = await auth.get_current_user_id(request=request)
     assert out == "mw_user"
 
 
+@pytest.mark.asyncio
+async def test_get_current_user_id_does_not_redecode_after_middleware(monkeypatch):
+    request = SimpleNamespace(
+        state=SimpleNamespace(user_id=None, jwt_payload=None),
+        headers={"Authorization": "Bearer tok"},
+    )
+
+    def _unexpected(_: str):
+        raise AssertionError("token should not be decoded twice")
+
+    monkeypatch.setattr(auth, "decode_access_token", _unexpected)
+    with pytest.raises(HTTPException) as ei:
+        await auth.get_current_user_id(request=request)
+    assert ei.value.status_code == 401
+
+
 @pytest.mark.asyncio
 async def test_get_current_user_id_requires_token_without_middleware_user():
     request = SimpleNamespace(state=SimpleNamespace())
     with pytest.raises(HTTPException) as ei:
-        await auth.get_current_user_id(request=request, token=None)
+        await auth.get_current_user_id(request=request)
     assert ei.value.status_code == 401
 
 
 @pytest.mark.asyncio
 async def test_get_current_user_id_extracts_sub_from_valid_token(monkeypatch):
-    request = SimpleNamespace(state=SimpleNamespace())
+    request = SimpleNamespace(state=SimpleNamespace(), headers={"Authorization": "Bearer tok"})
     monkeypatch.setattr(auth, "decode_access_token", lambda _: {"sub": "user_1"})
-    out = await auth.get_current_user_id(request=request, token="tok")
+    out = await auth.get_current_user_id(request=request)
     assert out == "user_1"
 
 
 @pytest.mark.asyncio
 async def test_get_current_user_id_rejects_invalid_token(monkeypatch):
-    request = SimpleNamespace(state=SimpleNamespace())
+    request = SimpleNamespace(state=SimpleNamespace(), headers={"Authorization": "Bearer bad"})
 
     def _boom(_: str):
         raise JWTError("bad token")
 
     monkeypatch.setattr(auth, "decode_access_token", _boom)
     with pytest.raises(HTTPException) as ei:
-        await auth.get_current_user_id(request=request, token="bad")
+        await auth.get_current_user_id(request=request)
     assert ei.value.status_code == 401
 
 
@@ -52,7 +68,7 @@ async def test_get_current_user_id_rejects_invalid_token(monkeypatch):
 async def test_get_current_user_id_accepts_cookie_token(monkeypatch):
     request = SimpleNamespace(state=SimpleNamespace(), cookies={auth.AUTH_COOKIE_NAME: "cookie_tok"})
     monkeypatch.setattr(auth, "decode_access_token", lambda _: {"sub": "cookie_user"})
-    out = await auth.get_current_user_id(request=request, token=None)
+    out = await auth.get_current_user_id(request=request)
     assert out == "cookie_user"
 
 
@@ -70,7 +86,7 @@ async def test_login_exposes_api_key_warning_when_global_key_missing(monkeypatch
             "system_prompt": "base prompt",
         },
     )
-    monkeypatch.setattr(auth.user_manager, "get_user_config", lambda _uid: {})
+    monkeypatch.setattr(auth.user_manager, "get_user_config", lambda _uid, user=None: {})
     monkeypatch.setattr(auth.config.api, "api_key", "placeholder-key-not-set", raising=False)
     monkeypatch.setattr(user_secrets, "ENV_FILE", tmp_path / ".env")
     monkeypatch.setattr(user_secrets, "USER_SECRETS_DIR", tmp_path / "users")
@@ -158,6 +174,24 @@ async def test_update_config_falls_back_to_legacy_when_gateway_unavailable(monke
     file_update.assert_called_once()
 
 
+@pytest.mark.asyncio
+async def test_update_config_legacy_fallback_invalidates_cached_config(monkeypatch):
+    config_service = MagicMock()
+    config_service.update_user_config = AsyncMock(
+        side_effect=HTTPException(status_code=503, detail="Config store unavailable")
+    )
+    gateway_server = SimpleNamespace(config_service=config_service)
+    integration = SimpleNamespace(get_gateway_server=lambda: gateway_server)
+    monkeypatch.setattr(auth, "get_gateway_integration", lambda: integration)
+    monkeypatch.setattr(auth.user_manager, "update_user_config", MagicMock(return_value=True))
+    monkeypatch.setattr(auth.user_manager, "update_user_config_file", MagicMock(return_value=True))
+
+    out = await auth.update_config(req=UserConfigUpdate(agent_name="A1"), user_id="u1")
+
+    assert "legacy fallback" in out["message"]
+    config_service.invalidate_user_config.assert_called_once_with("u1")
+
+
 @pytest.mark.asyncio
 async def test_delete_user_account_rejects_when_confirm_is_false():
     with pytest.raises(HTTPException) as ei:
@@ -170,7 +204,6 @@ async def test_delete_user_account_clears_user_sessions_and_deletes_user(monkeyp
     import gateway.http.message_manager as mm
 
     fake_manager = MagicMock()
-    fake_manager.get_all_sessions_info.return_value = {"u1::sA": {}, "sB": {}}
     monkeypatch.setattr(mm, "message_manager", fake_manager)
     workflow_engine = MagicMock()
     config_service = SimpleNamespace(_user_config_cache={"u1": {"x": 1}})
@@ -180,7 +213,42 @@ async def test_delete_user_account_clears_user_sessions_and_deletes_user(monkeyp
 
     out = await auth.delete_user_account(req=UserDeleteRequest(confirm=True), user_id="u1")
     assert out["status"] == "success"
-    fake_manager.delete_session.assert_any_call("sA", user_id="u1")
-    fake_manager.delete_session.assert_any_call("sB", user_id="u1")
+    fake_manager.delete_user_sessions.assert_called_once_with(user_id="u1")
     workflow_engine.purge_user_state.assert_called_once_with("u1")
     assert "u1" not in config_service._user_config_cache
+
+
+def test_decode_access_token_caches_verified_payload(monkeypatch):
+    auth.clear_decoded_token_cache()
+    token = auth.create_access_token({"sub": "cached_user"})
+    calls = {"n": 0}
+    real_decode = auth.jwt.decode
+
+    def _counting_decode(*args, **kwargs):
+        calls["n"] += 1
+        return real_decode(*args, **kwargs)
+
+    monkeypatch.setattr(auth.jwt, "decode", _counting_decode)
+    first = auth.decode_access_token(token)
+    first["sub"] = "mutated"
+    second = auth.decode_access_token(token)
+
+    assert second["sub"] == "cached_user"
+    assert calls["n"] == 1
+    auth.clear_decoded_token_cache()
+
+
+def test_decode_access_token_does_not_serve_expired_cache_entries(monkeypatch):
+    auth.clear_decoded_token_cache()
+    token = auth.create_access_token({"sub": "short_lived"}, expires_minutes=1)
+    auth.decode_access_token(token)
+
+    monkeypatch.setattr(auth.time, "time", lambda: 10**12)
+
+    def _expired(*_args, **_kwargs):
+        raise JWTError("expired")
+
+    monkeypatch.setattr(auth.jwt, "decode", _expired)
+    with pytest.raises(JWTError):
+        auth.decode_access_token(token)
+    auth.clear_decoded_token_cache()
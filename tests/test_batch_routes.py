@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from gateway.http.routes import batch
+from gateway.http.schemas import BatchRequest, BatchRequestItem
+from gateway.protocol import RequestType
+
+
+@pytest.mark.asyncio
+async def test_batch_runs_same_priority_items_concurrently_and_groups_in_order(monkeypatch):
+    events = []
+    started = asyncio.Event()
+    in_flight = {"n": 0, "max": 0}
+
+    async def _fake_dispatch(method, params, user_id, timeout_ms, retries, request):
+        in_flight["n"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["n"])
+        events.append(("start", params["tag"]))
+        if params["tag"] in {"a", "b"}:
+            if in_flight["n"] >= 2:
+                started.set()
+            await asyncio.wait_for(started.wait(), timeout=1)
+        in_flight["n"] -= 1
+        events.append(("end", params["tag"]))
+        if params["tag"] == "b":
+            raise HTTPException(status_code=404, detail="not found")
+        return {"tag": params["tag"]}
+
+    monkeypatch.setattr(batch, "dispatch_gateway_method", _fake_dispatch)
+    method = RequestType.SESSIONS_LIST.value
+    out = await batch.batch_dispatch(
+        BatchRequest(
+            requests=[
+                BatchRequestItem(method=method, params={"tag": "late"}, priority=0),
+                BatchRequestItem(method=method, params={"tag": "a"}, priority=5),
+                BatchRequestItem(method="nope", priority=5),
+                BatchRequestItem(method=method, params={"tag": "b"}, priority=5),
+            ],
+            max_concurrency=8,
+        ),
+        raw_request=None,
+        user_id="u1",
+    )
+
+    results = out["results"]
+    assert [row["ok"] for row in results] == [True, False, False, True]
+    assert results[0]["payload"] == {"tag": "a"}
+    assert "Unknown request method" in results[1]["error"]
+    assert results[2]["error"] == "not found"
+    assert results[3]["payload"] == {"tag": "late"}
+    assert in_flight["max"] == 2
+    assert events.index(("start", "late")) > events.index(("end", "b"))
+
+
+@pytest.mark.asyncio
+async def test_batch_runs_items_sequentially_by_default(monkeypatch):
+    events = []
+
+    async def _fake_dispatch(method, params, user_id, timeout_ms, retries, request):
+        events.append(("start", params["tag"]))
+        await asyncio.sleep(0)
+        events.append(("end", params["tag"]))
+        return {"tag": params["tag"]}
+
+    monkeypatch.setattr(batch, "dispatch_gateway_method", _fake_dispatch)
+    method = RequestType.SESSIONS_LIST.value
+    out = await batch.batch_dispatch(
+        BatchRequest(
+            requests=[BatchRequestItem(method=method, params={"tag": tag}) for tag in ("a", "b", "c")],
+        ),
+        raw_request=None,
+        user_id="u1",
+    )
+
+    assert [row["payload"]["tag"] for row in out["results"]] == ["a", "b", "c"]
+    assert events == [
+        ("start", "a"), ("end", "a"),
+        ("start", "b"), ("end", "b"),
+        ("start", "c"), ("end", "c"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_batch_respects_max_concurrency(monkeypatch):
+    in_flight = {"n": 0, "max": 0}
+
+    async def _fake_dispatch(method, params, user_id, timeout_ms, retries, request):
+        in_flight["n"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["n"])
+        await asyncio.sleep(0)
+        in_flight["n"] -= 1
+        return {}
+
+    monkeypatch.setattr(batch, "dispatch_gateway_method", _fake_dispatch)
+    method = RequestType.SESSIONS_LIST.value
+    out = await batch.batch_dispatch(
+        BatchRequest(
+            requests=[BatchRequestItem(method=method) for _ in range(6)],
+            max_concurrency=2,
+        ),
+        raw_request=None,
+        user_id="u1",
+    )
+
+    assert len(out["results"]) == 6
+    assert in_flight["max"] == 2
+
+
+def test_batch_request_rejects_concurrency_above_server_cap():
+    from pydantic import ValidationError
+
+    from gateway.http.schemas import BATCH_MAX_CONCURRENCY
+
+    method = RequestType.SESSIONS_LIST.value
+    assert BatchRequest(requests=[], max_concurrency=BATCH_MAX_CONCURRENCY).max_concurrency == BATCH_MAX_CONCURRENCY
+    for value in (0, BATCH_MAX_CONCURRENCY + 1, 10_000):
+        with pytest.raises(ValidationError):
+            BatchRequest(requests=[BatchRequestItem(method=method)], max_concurrency=value)
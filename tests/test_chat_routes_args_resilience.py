@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+import json
 from types import SimpleNamespace
 
 import pytest
@@ -109,9 +111,9 @@ async def test_chat_route_keeps_image_attachment_as_structured_input(monkeypatch
 @pytest.mark.asyncio
 async def test_streaming_chat_uses_tool_loop_when_prompt_policy_needs_tools(monkeypatch):
     class _MessageManager:
-        def get_session(self, session_id, user_id=None):
-            _ = (session_id, user_id)
-            return True
+        def ensure_session(self, session_id, user_id=None):
+            _ = user_id
+            return session_id
 
         def begin_turn(self, **kwargs):
             _ = kwargs
@@ -216,3 +218,184 @@ async def test_chat_confirm_route_normalizes_non_dict_args(monkeypatch):
     assert out.status == "needs_confirmation"
     assert out.args == {"_args_list": ["command", "description"]}
     assert out.memory_write_summary.get("enabled") is True
+
+
+def _parse_sse_frames(raw: str):
+    frames = []
+    for block in raw.split("\n\n"):
+        block = block.strip()
+        if block.startswith("data: "):
+            frames.append(json.loads(block[len("data: "):]))
+    return frames
+
+
+@pytest.mark.asyncio
+async def test_streaming_chat_emits_token_frames_and_done(monkeypatch):
+    committed = {}
+
+    class _MessageManager:
+        def ensure_session(self, session_id, user_id=None):
+            _ = user_id
+            return session_id
+
+        def begin_turn(self, **kwargs):
+            _ = kwargs
+            return True
+
+        def commit_turn(self, **kwargs):
+            committed.update(kwargs)
+            return True
+
+        def abort_turn(self, *args, **kwargs):
+            _ = (args, kwargs)
+
+        def get_recent_messages(self, *args, **kwargs):
+            _ = (args, kwargs)
+            return []
+
+    class _ConversationService:
+        async def prepare_chat_turn(self, **kwargs):
+            _ = kwargs
+            return {
+                "messages": [{"role": "user", "content": "hi"}],
+                "user_config": {},
+                "reasoning": {},
+                "prompt_policy": {},
+            }
+
+        async def call_llm_stream(self, *args, **kwargs):
+            _ = (args, kwargs)
+            for token in ["Hel", "lo ", "wörld"]:
+                yield token
+
+    release = asyncio.Event()
+    emitted = []
+
+    class _SlowEmitter:
+        async def emit(self, event_type, payload):
+            emitted.append(payload)
+            await release.wait()
+
+    gateway_server = SimpleNamespace(
+        message_manager=_MessageManager(),
+        conversation_service=_ConversationService(),
+        reasoning_service=None,
+        event_emitter=_SlowEmitter(),
+    )
+    monkeypatch.setattr(chat_routes, "get_gateway_server", lambda: gateway_server)
+
+    response = await chat_routes.chat(
+        request=chat_routes.ChatRequest(message="hi", stream=True, session_id="s1"),
+        raw_request=SimpleNamespace(),
+        user_id="u1",
+    )
+    assert response.media_type == "text/event-stream"
+    assert response.headers["Cache-Control"] == "no-cache"
+
+    async def _read_body():
+        return [
+            chunk.decode("utf-8") if isinstance(chunk, bytes) else str(chunk)
+            async for chunk in response.body_iterator
+        ]
+
+    # Without a memory service there is nothing to wait for: a slow
+    # interaction.completed subscriber must not hold back the done frame.
+    chunks = await asyncio.wait_for(_read_body(), timeout=0.5)
+    assert emitted and emitted[0]["assistant_output"] == "Hello wörld"
+    release.set()
+    frames = _parse_sse_frames("".join(chunks))
+
+    assert frames[0] == {"type": "session_started", "session_id": "s1"}
+    assert frames[-1] == {"type": "done", "session_id": "s1"}
+    text = "".join(f["content"] for f in frames if f["type"] == "text")
+    assert text == "Hello wörld"
+    assert committed["assistant_content"] == "Hello wörld"
+
+
+async def _collect(agen):
+    return [item async for item in agen]
+
+
+@pytest.mark.asyncio
+async def test_coalesce_text_chunks_merges_until_size_threshold():
+    async def _source():
+        for token in ["ab", "cd", "ef", "g"]:
+            yield token
+
+    out = await _collect(chat_routes._coalesce_text_chunks(_source(), max_chars=4, max_delay=5.0))
+    assert out == ["abcd", "efg"]
+
+
+@pytest.mark.asyncio
+async def test_coalesce_text_chunks_flushes_after_delay():
+    async def _source():
+        yield "a"
+        yield "b"
+        await asyncio.sleep(0.05)
+        yield "c"
+
+    out = await _collect(chat_routes._coalesce_text_chunks(_source(), max_chars=100, max_delay=0.01))
+    assert out == ["ab", "c"]
+
+
+@pytest.mark.asyncio
+async def test_coalesce_text_chunks_passes_error_markers_through():
+    async def _source():
+        yield "partial "
+        yield "[error] upstream failed"
+        yield "tail"
+
+    out = await _collect(chat_routes._coalesce_text_chunks(_source(), max_chars=100, max_delay=5.0))
+    assert out == ["partial ", "[error] upstream failed", "tail"]
+
+
+@pytest.mark.asyncio
+async def test_coalesce_text_chunks_is_passthrough_when_disabled():
+    async def _source():
+        for token in ["a", "b"]:
+            yield token
+
+    out = await _collect(chat_routes._coalesce_text_chunks(_source(), max_chars=0, max_delay=0.01))
+    assert out == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_prefetch_chunks_bounds_read_ahead():
+    produced = []
+
+    async def _source():
+        for i in range(10):
+            produced.append(i)
+            yield i
+
+    stream = chat_routes._prefetch_chunks(_source(), maxsize=2)
+    assert await stream.__anext__() == 0
+    for _ in range(5):
+        await asyncio.sleep(0)
+    # One chunk consumed, two queued, one held by the blocked producer.
+    assert len(produced) <= 4
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_prefetch_chunks_propagates_upstream_errors():
+    async def _source():
+        yield "a"
+        raise RuntimeError("boom")
+
+    out = []
+    with pytest.raises(RuntimeError, match="boom"):
+        async for chunk in chat_routes._prefetch_chunks(_source()):
+            out.append(chunk)
+    assert out == ["a"]
+
+
+def test_sse_text_frame_matches_generic_encoding():
+    for content in ["plain", 'quote " and \\ slash', "wörld\nnext"]:
+        assert chat_routes._sse_text(content) == chat_routes._sse({"type": "text", "content": content})
+
+
+def test_next_turn_id_is_unique_and_compact():
+    ids = [chat_routes._next_turn_id() for _ in range(1000)]
+    assert len(set(ids)) == len(ids)
+    assert all(len(turn_id) < 32 for turn_id in ids)
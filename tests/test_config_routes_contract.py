@@ -1,6 +1,13 @@
+import json
+import os
+
+import pytest
+
+from gateway.http.routes import config as config_routes
 from gateway.http.routes.config import (
     ConfigUpdateRequest,
     _build_basic_config_view,
+    _deep_update,
 )
 
 
@@ -51,3 +58,93 @@ def test_basic_config_view_preserves_enterprise_switch_and_org_id():
     assert view["org_brain"]["recall_priority"] == "override_persona"
     assert view["org_brain"]["confirmation_queue"] is False
     assert view["org_brain"]["audience_default"] == "sales"
+
+
+def test_deep_update_merges_nested_dicts_and_replaces_leaves():
+    base = {
+        "memory": {"neo4j": {"uri": "bolt://a", "database": "neo4j"}, "enabled": True},
+        "prompts": "flat",
+    }
+    _deep_update(
+        base,
+        {
+            "memory": {"neo4j": {"uri": "bolt://b"}, "enabled": False},
+            "prompts": {"system": "x"},
+            "api": {"model": "m"},
+        },
+    )
+    assert base == {
+        "memory": {"neo4j": {"uri": "bolt://b", "database": "neo4j"}, "enabled": False},
+        "prompts": {"system": "x"},
+        "api": {"model": "m"},
+    }
+
+
+@pytest.mark.asyncio
+async def test_load_default_config_dict_reuses_parse_until_file_changes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(config_routes, "_DEFAULT_CONFIG_CACHE", {})
+    (tmp_path / "config").mkdir()
+    path = tmp_path / "config" / "default.json"
+    path.write_text('\ufeff{"agent_name": "A"}', encoding="utf-8")
+
+    _, first = await config_routes._load_default_config_dict()
+    _, second = await config_routes._load_default_config_dict()
+    assert first == {"agent_name": "A"}
+    assert second is first
+
+    path.write_text('{"agent_name": "B"}', encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    _, third = await config_routes._load_default_config_dict()
+    assert third == {"agent_name": "B"}
+
+    # An in-place rewrite that keeps the mtime (coarse timestamps) but not the size.
+    stat = path.stat()
+    path.write_text('{"agent_name": "BB"}', encoding="utf-8")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    _, fourth = await config_routes._load_default_config_dict()
+    assert fourth == {"agent_name": "BB"}
+
+
+def test_conditional_json_response_returns_304_for_matching_etag():
+    from types import SimpleNamespace
+
+    payload = {"status": "success", "config": {"agent_name": "Promethea"}}
+    first = config_routes._conditional_json_response(SimpleNamespace(headers={}), payload)
+    etag = first.headers["etag"]
+    assert first.status_code == 200
+    assert json.loads(first.body) == payload
+
+    cached = config_routes._conditional_json_response(
+        SimpleNamespace(headers={"if-none-match": f"W/{etag}, \"other\""}), payload
+    )
+    assert cached.status_code == 304
+    assert cached.body == b""
+    assert cached.headers["etag"] == etag
+
+    changed = config_routes._conditional_json_response(
+        SimpleNamespace(headers={"if-none-match": etag}), {**payload, "view": "basic"}
+    )
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_update_config_secrets_invalidates_memory_api_settings(monkeypatch):
+    from types import SimpleNamespace
+
+    invalidated = []
+    memory_service = SimpleNamespace(invalidate_memory_api=invalidated.append)
+    gateway_server = SimpleNamespace(memory_service=memory_service)
+    integration = SimpleNamespace(get_gateway_server=lambda: gateway_server)
+    monkeypatch.setattr(config_routes, "get_gateway_integration", lambda: integration)
+    monkeypatch.setattr(config_routes, "update_user_secrets", lambda user_id, values: {"saved": True})
+
+    out = await config_routes.update_config_secrets(
+        request=config_routes.SecretsUpdateRequest(values={"MEMORY__API__MODEL": "m"}),
+        current_user_id="u1",
+    )
+
+    assert out["secrets"] == {"saved": True}
+    assert invalidated == ["u1"]
@@ -165,3 +165,46 @@ class TestConfigService:
             persisted = mock_user_manager.update_user_config_file.call_args[0][1]
             assert persisted.get("memory", {}).get("enabled") is False
             assert persisted.get("memory", {}).get("profile") == "balanced"
+
+    @pytest.mark.asyncio
+    async def test_get_merged_config_is_cached_until_user_config_changes(self):
+        service = ConfigService(event_emitter=EventEmitter())
+
+        with patch("gateway.config_service.user_manager") as mock_user_manager:
+            mock_user_manager.get_user_config.return_value = {"agent_name": "First"}
+            mock_user_manager.update_user_config_file.return_value = True
+
+            first = service.get_merged_config("cache_user")
+            first["agent_name"] = "mutated"
+            second = service.get_merged_config("cache_user")
+            assert second["agent_name"] == "First"
+            assert mock_user_manager.get_user_config.call_count == 1
+
+            version = service.get_config_version("cache_user")
+            mock_user_manager.get_user_config.return_value = {"agent_name": "Second"}
+            result = await service.update_user_config("cache_user", {"agent_name": "Second"}, validate=False)
+            assert result["success"] is True
+            assert service.get_config_version("cache_user") == version + 1
+            assert service.get_merged_config("cache_user")["agent_name"] == "Second"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_user_config_updates_share_one_write(self):
+        import asyncio
+
+        service = ConfigService(event_emitter=EventEmitter())
+
+        with patch("gateway.config_service.user_manager") as mock_user_manager:
+            mock_user_manager.get_user_config.return_value = {"agent_name": "Promethea"}
+            mock_user_manager.update_user_config_file.return_value = True
+
+            results = await asyncio.gather(
+                service.update_user_config("burst_user", {"system": {"debug": True}}, validate=False),
+                service.update_user_config("burst_user", {"system": {"log_level": "DEBUG"}}, validate=False),
+                service.update_user_config("other_user", {"agent_name": "Other"}, validate=False),
+            )
+
+        assert all(result["success"] for result in results)
+        assert mock_user_manager.update_user_config_file.call_count == 2
+        writes = {call.args[0]: call.args[1] for call in mock_user_manager.update_user_config_file.call_args_list}
+        assert writes["burst_user"]["system"] == {"debug": True, "log_level": "DEBUG"}
+        assert writes["other_user"]["agent_name"] == "Other"
@@ -104,6 +104,7 @@ async def test_server_chat_uses_gateway_response_payload_shape():
 
     message_manager = MagicMock()
     message_manager.get_session.return_value = True
+    message_manager.ensure_session.side_effect = lambda session_id, user_id=None: session_id
     message_manager.begin_turn.return_value = True
     message_manager.commit_turn.return_value = True
     server.message_manager = message_manager
@@ -147,6 +148,12 @@ def test_canonical_gateway_event_types_centralized():
     assert "gateway.run.finished" in ALL_EVENT_TYPES
 
 
+def test_server_exposes_sorted_handler_methods():
+    server = GatewayServer()
+    assert list(server.handler_methods) == sorted(str(m.value) for m in server._handlers)
+    assert RequestType.CHAT.value in server.handler_methods
+
+
 @pytest.mark.asyncio
 async def test_server_chat_emits_canonical_gateway_events():
     server = GatewayServer()
@@ -155,6 +162,7 @@ async def test_server_chat_emits_canonical_gateway_events():
 
     message_manager = MagicMock()
     message_manager.get_session.return_value = True
+    message_manager.ensure_session.side_effect = lambda session_id, user_id=None: session_id
     message_manager.begin_turn.return_value = True
     message_manager.commit_turn.return_value = True
     server.message_manager = message_manager
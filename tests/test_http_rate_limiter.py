@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import json
+
+from gateway.http import middleware
+from gateway.http.middleware import InMemoryRateLimiter, RateLimitConfig
+
+
+def _freeze_clock(monkeypatch, start: float = 1000.0):
+    clock = {"now": start}
+    monkeypatch.setattr(middleware.time, "monotonic", lambda: clock["now"])
+    return clock
+
+
+def test_rate_limiter_rejects_after_bucket_is_drained(monkeypatch):
+    _freeze_clock(monkeypatch)
+    limiter = InMemoryRateLimiter(RateLimitConfig(requests=3, window_seconds=60))
+
+    assert [limiter.allow("u1") for _ in range(4)] == [True, True, True, False]
+    assert limiter.allow("u2") is True
+
+
+def test_rate_limiter_refills_tokens_over_time(monkeypatch):
+    clock = _freeze_clock(monkeypatch)
+    limiter = InMemoryRateLimiter(RateLimitConfig(requests=2, window_seconds=60))
+
+    assert limiter.allow("u1") is True
+    assert limiter.allow("u1") is True
+    assert limiter.allow("u1") is False
+
+    clock["now"] += 30
+    assert limiter.allow("u1") is True
+    assert limiter.allow("u1") is False
+
+
+def test_rate_limiter_with_zero_budget_rejects_everything(monkeypatch):
+    _freeze_clock(monkeypatch)
+    limiter = InMemoryRateLimiter(RateLimitConfig(requests=0, window_seconds=60))
+
+    assert limiter.allow("u1") is False
+
+
+def test_rate_limiter_drops_idle_buckets(monkeypatch):
+    clock = _freeze_clock(monkeypatch)
+    limiter = InMemoryRateLimiter(RateLimitConfig(requests=5, window_seconds=10))
+
+    for idx in range(50):
+        limiter.allow(f"ip-{idx}")
+    assert len(limiter) == 50
+
+    clock["now"] += 11
+    for idx in range(1_000):
+        limiter.allow(f"fresh-{idx}")
+    assert len(limiter) == 1_000
+
+
+def test_rate_limiter_bounds_key_cardinality(monkeypatch):
+    _freeze_clock(monkeypatch)
+    limiter = InMemoryRateLimiter(RateLimitConfig(requests=5, window_seconds=60, max_keys=128))
+
+    for idx in range(10_000):
+        limiter.allow(f"ip-{idx}")
+
+    assert len(limiter) <= 128
+
+
+def test_canned_error_response_matches_json_error_shape():
+    response = middleware._canned_error_response(
+        middleware._RATE_LIMITED_BODY_PREFIX, 429, 'rid-"quoted"'
+    )
+
+    assert response.status_code == 429
+    assert response.media_type == "application/json"
+    assert json.loads(response.body) == {
+        "status": "error",
+        "error": {"code": "rate_limited", "message": "Too many requests"},
+        "request_id": 'rid-"quoted"',
+    }
+
+
+def test_invalid_tokens_are_rate_limited_by_client_host(monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from jose import JWTError
+
+    def _reject(_token):
+        raise JWTError("bad token")
+
+    monkeypatch.setenv("GATEWAY_RATE_LIMIT_REQUESTS", "2")
+    monkeypatch.setattr(middleware, "get_gateway_integration", lambda: None)
+    monkeypatch.setattr(middleware, "decode_access_token", _reject)
+    app = FastAPI()
+    middleware.register_http_middlewares(app)
+    client = TestClient(app)
+
+    statuses = [
+        client.get("/api/sessions", headers={"Authorization": "Bearer guess"}).status_code
+        for _ in range(3)
+    ]
+
+    assert statuses == [401, 401, 429]
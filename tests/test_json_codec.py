@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+
+from gateway.http import json_codec
+
+
+def test_dumps_bytes_emits_compact_utf8_json():
+    blob = json_codec.dumps_bytes({"a": [1, 2.5, None], "text": "héllo"})
+
+    assert isinstance(blob, bytes)
+    assert b" " not in blob
+    assert json.loads(blob) == {"a": [1, 2.5, None], "text": "héllo"}
+    assert json_codec.loads(blob) == json_codec.loads(blob.decode("utf-8"))
+
+
+def test_dumps_bytes_uses_default_for_unknown_types():
+    marker = object()
+    blob = json_codec.dumps_bytes({"value": marker}, default=lambda _: "fallback")
+    assert json.loads(blob) == {"value": "fallback"}
+
+
+def test_dumps_bytes_falls_back_to_stdlib_without_orjson(monkeypatch):
+    monkeypatch.setattr(json_codec, "orjson", None)
+    stamp = datetime(2026, 1, 2, tzinfo=timezone.utc)
+
+    blob = json_codec.dumps_bytes({"when": stamp, 1: "x"}, default=lambda v: v.isoformat())
+
+    assert json.loads(blob) == {"when": "2026-01-02T00:00:00+00:00", "1": "x"}
+
+
+def test_dumps_bytes_indent_matches_between_backends(monkeypatch):
+    payload = {"agent_name": "Prométhea", "api": {"temperature": 0.7}}
+    fast = json_codec.dumps_bytes(payload, indent=True)
+    monkeypatch.setattr(json_codec, "orjson", None)
+    slow = json_codec.dumps_bytes(payload, indent=True)
+
+    assert slow == json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
+    assert fast == slow
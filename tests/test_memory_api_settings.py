@@ -100,6 +100,77 @@ def test_memory_service_use_main_api_string_false_uses_dedicated(tmp_path, monke
     assert api["model"] == "mem-model"
 
 
+def test_memory_service_caches_api_settings_until_secrets_or_config_change(tmp_path, monkeypatch):
+    import asyncio
+
+    from gateway import user_secrets
+
+    merges = []
+
+    class _CfgService:
+        @staticmethod
+        def get_merged_config(user_id):
+            merges.append(user_id)
+            return {"api": {}, "memory": {"api": {"use_main_api": "false"}}}
+
+    class _Adapter:
+        @staticmethod
+        def is_enabled():
+            return False
+
+    monkeypatch.setattr(user_secrets, "ENV_FILE", tmp_path / ".env")
+    monkeypatch.setattr(user_secrets, "USER_SECRETS_DIR", tmp_path / "users")
+    user_secrets.update_user_secrets(
+        "u1",
+        {"MEMORY__API__USE_MAIN_API": "false", "MEMORY__API__MODEL": "mem-model"},
+    )
+
+    service = MemoryService(memory_adapter=_Adapter(), config_service=_CfgService())
+    assert service._resolve_memory_api_for_user("u1")["model"] == "mem-model"
+    assert service._resolve_memory_api_for_user("u1")["model"] == "mem-model"
+    assert merges == ["u1"]
+
+    user_secrets.update_user_secrets("u1", {"MEMORY__API__MODEL": "mem-model-2"})
+    assert service._resolve_memory_api_for_user("u1")["model"] == "mem-model-2"
+    assert merges == ["u1", "u1"]
+
+    asyncio.run(service._on_config_changed(SimpleNamespace(payload={"user_id": "u1", "changes": {"api": {}}})))
+    service._resolve_memory_api_for_user("u1")
+    assert merges == ["u1", "u1", "u1"]
+
+
+def test_memory_service_invalidate_memory_api_covers_same_size_secret_rewrite(tmp_path, monkeypatch):
+    import os
+
+    from gateway import user_secrets
+
+    class _Adapter:
+        @staticmethod
+        def is_enabled():
+            return False
+
+    monkeypatch.setattr(user_secrets, "ENV_FILE", tmp_path / ".env")
+    monkeypatch.setattr(user_secrets, "USER_SECRETS_DIR", tmp_path / "users")
+    user_secrets.update_user_secrets(
+        "u1",
+        {"MEMORY__API__USE_MAIN_API": "false", "MEMORY__API__MODEL": "mem-a"},
+    )
+    secrets_path = user_secrets.user_secrets_path("u1")
+    stat = secrets_path.stat()
+
+    service = MemoryService(memory_adapter=_Adapter())
+    assert service._resolve_memory_api_for_user("u1")["model"] == "mem-a"
+
+    user_secrets.update_user_secrets("u1", {"MEMORY__API__MODEL": "mem-b"})
+    # Same size and, as on coarse-timestamp filesystems, the same mtime.
+    assert secrets_path.stat().st_size == stat.st_size
+    os.utime(secrets_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert service._resolve_memory_api_for_user("u1")["model"] == "mem-a"
+
+    service.invalidate_memory_api("u1")
+    assert service._resolve_memory_api_for_user("u1")["model"] == "mem-b"
+
+
 def test_cold_layer_default_summary_model_follows_main_api():
     cfg = SimpleNamespace(
         api=SimpleNamespace(
@@ -133,4 +204,73 @@ def test_cold_layer_explicit_summary_model_overrides_main_api():
 
     manager = ColdLayerManager(connector=object(), config=cfg)
 
-    assert manager.summary_model == "summary-model"
\ No newline at end of file
+    assert manager.summary_model == "summary-model"
+
+
+def test_dedicated_memory_classifier_reuses_openai_client(monkeypatch):
+    import asyncio
+
+    import openai
+
+    built = []
+
+    class _FakeOpenAI:
+        def __init__(self, api_key, base_url):
+            built.append((api_key, base_url))
+            self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+        @staticmethod
+        def _create(**_kwargs):
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=' {"ok": true} '))])
+
+    class _Adapter:
+        @staticmethod
+        def is_enabled():
+            return False
+
+    monkeypatch.setattr(openai, "OpenAI", _FakeOpenAI)
+    service = MemoryService(memory_adapter=_Adapter())
+    monkeypatch.setattr(
+        service,
+        "_resolve_memory_api_for_user",
+        lambda _user_id: {"api_key": "k1", "base_url": "https://mem.example/v1", "model": "m"},
+    )
+
+    async def _run():
+        return [await service._call_memory_classifier_llm("u1", "p", "q") for _ in range(3)]
+
+    assert asyncio.run(_run()) == ['{"ok": true}'] * 3
+    assert built == [("k1", "https://mem.example/v1")]
+
+
+def test_memory_llm_client_pool_closes_evicted_clients(monkeypatch):
+    import openai
+
+    closed = []
+
+    class _FakeOpenAI:
+        def __init__(self, api_key, base_url):
+            self.api_key = api_key
+
+        def close(self):
+            closed.append(self.api_key)
+
+    class _Adapter:
+        @staticmethod
+        def is_enabled():
+            return False
+
+    monkeypatch.setattr(openai, "OpenAI", _FakeOpenAI)
+    service = MemoryService(memory_adapter=_Adapter())
+    service._memory_llm_clients_limit = 2
+
+    first = service._memory_llm_client("k1", "https://mem.example/v1")
+    service._memory_llm_client("k2", "https://mem.example/v1")
+    assert service._memory_llm_client("k1", "https://mem.example/v1") is first
+    service._memory_llm_client("k3", "https://mem.example/v1")
+
+    assert closed == ["k2"]
+    assert list(service._memory_llm_clients) == [
+        ("k1", "https://mem.example/v1"),
+        ("k3", "https://mem.example/v1"),
+    ]
@@ -57,7 +57,7 @@ def test_should_write_candidate_has_no_side_effect(monkeypatch):
     assert svc._should_write_candidate("u1", "goal", "abc")
     key = svc._make_write_key("u1", "goal", "abc")
     assert key not in svc._recent_write_index
-    assert svc._recent_write_keys == []
+    assert len(svc._recent_write_index) == 0
 
 
 @pytest.mark.asyncio
@@ -136,7 +136,13 @@ async def test_interaction_completed_passes_memory_metadata(monkeypatch):
 
     memory_adapter = MagicMock()
     memory_adapter.is_enabled.return_value = True
-    memory_adapter.add_message.return_value = True
+    write_threads = []
+
+    def _add_message(**_kwargs):
+        write_threads.append(threading.current_thread())
+        return True
+
+    memory_adapter.add_message.side_effect = _add_message
     svc = MemoryService(memory_adapter=memory_adapter)
 
     monkeypatch.setattr(svc, "_classify_interaction", _fake_classify)
@@ -147,6 +153,7 @@ async def test_interaction_completed_passes_memory_metadata(monkeypatch):
 
     await svc._on_interaction_completed(event)
 
+    assert write_threads and write_threads[0] is not threading.current_thread()
     kwargs = memory_adapter.add_message.call_args.kwargs
     assert kwargs["metadata"]["memory_type"] == "preference"
     assert kwargs["metadata"]["semantic_keys"] == ["prefer", "concise"]
@@ -175,7 +182,7 @@ def test_on_message_saved_queues_maintenance_once(monkeypatch):
     adapter.hot_layer = object()
     adapter._config = None
     adapter._warm_layer = None
-    adapter._cold_layer = None
+    adapter._cold_layer = object()
     adapter._forgetting = None
     adapter._maintenance_lock = threading.Lock()
     adapter._idle_timer_lock = threading.Lock()
@@ -207,6 +214,84 @@ def test_on_message_saved_queues_maintenance_once(monkeypatch):
     assert spawn_count["count"] == 1
 
 
+def test_back_to_back_messages_start_one_worker_when_no_summary_is_due(monkeypatch):
+    import memory.adapter as adapter_module
+    from memory.adapter import MemoryAdapter
+
+    spawn_count = {"count": 0}
+
+    class _InlineThread:
+        def __init__(self, target=None, args=None, daemon=None):
+            self.target = target
+            self.args = args or ()
+
+        def start(self):
+            spawn_count["count"] += 1
+            self.target(*self.args)
+
+    class _ColdLayer:
+        def should_create_summary(self, session_id):
+            return False
+
+    monkeypatch.setattr(adapter_module.threading, "Thread", _InlineThread)
+
+    adapter = MemoryAdapter.__new__(MemoryAdapter)
+    adapter.enabled = True
+    adapter.hot_layer = object()
+    adapter._config = None
+    adapter._warm_layer = None
+    adapter._cold_layer = _ColdLayer()
+    adapter._forgetting = None
+    adapter._maintenance_lock = threading.Lock()
+    adapter._maintenance_state = {}
+    adapter._maintenance_persist_keys = ()
+    adapter._maintenance_defaults = {
+        "cluster_every_messages": 12,
+        "cluster_min_interval_s": 300,
+        "summary_min_interval_s": 600,
+        "decay_interval_s": 24 * 3600,
+    }
+    adapter._ensure_managers = lambda: None
+
+    adapter.on_message_saved("s1", "user", "u1")
+    adapter.on_message_saved("s1", "assistant", "u1")
+
+    assert spawn_count["count"] == 1
+
+
+def test_maintenance_due_only_when_a_layer_gate_is_open():
+    from memory.adapter import MemoryAdapter
+
+    adapter = MemoryAdapter.__new__(MemoryAdapter)
+    adapter._maintenance_defaults = {
+        "cluster_every_messages": 12,
+        "cluster_min_interval_s": 300,
+        "summary_min_interval_s": 600,
+        "decay_interval_s": 24 * 3600,
+    }
+    adapter._config = SimpleNamespace(
+        memory=SimpleNamespace(
+            warm_layer=SimpleNamespace(enabled=True, min_cluster_size=3)
+        )
+    )
+    adapter._warm_layer = object()
+    adapter._cold_layer = object()
+    adapter._forgetting = object()
+    state = {
+        "messages_since_cluster": 1,
+        "last_cluster_at": 0.0,
+        "last_summary_at": 1000.0,
+        "last_decay_at": 1000.0,
+    }
+
+    assert adapter._maintenance_due(state, now=1100.0) is False
+    assert adapter._maintenance_due(state, now=1600.0) is True
+
+    state["last_summary_at"] = 1600.0
+    state["messages_since_cluster"] = 12
+    assert adapter._maintenance_due(state, now=1700.0) is True
+
+
 def test_idle_cluster_uses_idle_thresholds():
     from memory.adapter import MemoryAdapter
 
@@ -497,3 +582,162 @@ def test_memory_visibility_hints_record_and_drain():
     assert len(rows) == 1
     assert rows[0]["type"] == "memory_saved"
     assert svc.drain_visibility_hints(session_id="s1", user_id="u1", limit=3) == []
+
+
+def test_flat_memory_recall_reuses_parsed_rows_until_file_changes(tmp_path, monkeypatch):
+    from memory.backends.flat_memory import FlatMemoryStore
+
+    store = FlatMemoryStore(str(tmp_path / "flat.jsonl"))
+    store.add_message(session_id="s1", role="user", content="I use tokio daily", user_id="u1")
+
+    loads = []
+    original_load = FlatMemoryStore._load_rows
+
+    def _counting_load(self):
+        loads.append(1)
+        return original_load(self)
+
+    monkeypatch.setattr(FlatMemoryStore, "_load_rows", _counting_load)
+
+    assert "tokio" in store.get_context(query="tokio", session_id="s2", user_id="u1")
+    store.add_message(session_id="s1", role="user", content="Rust services on tokio", user_id="u1")
+    assert len(store.collect_recall_candidates(query="tokio", session_id="s2", user_id="u1")) == 2
+    assert len(loads) == 1
+
+    memory_id = store.list_memory_entries(user_id="u1", query="daily")[0]["memory_id"]
+    store.update_memory_entry(user_id="u1", memory_id=memory_id, content="I use asyncio daily")
+    contents = [row["content"] for row in store.collect_recall_candidates(query="asyncio", session_id="s2", user_id="u1")]
+    assert contents[0] == "I use asyncio daily"
+
+
+def test_sqlite_graph_seeds_prefer_best_lexical_matches_over_newest(tmp_path):
+    from memory.backends.sqlite_graph import SqliteGraphMemoryStore
+
+    store = SqliteGraphMemoryStore(str(tmp_path / "graph.db"))
+    store.add_message(session_id="s1", role="user", content="tokio runtime powers my rust services", user_id="u1")
+    for i in range(70):
+        store.add_message(session_id="s1", role="user", content=f"rust note {i}", user_id="u1")
+
+    rows = store.collect_recall_candidates(query="rust tokio runtime", session_id="s2", user_id="u1", top_k=40)
+
+    best = next(row for row in rows if row["content"] == "tokio runtime powers my rust services")
+    assert best["source_layer"] == "direct"
+
+
+def test_llm_extractor_reuses_result_for_repeated_message():
+    from collections import OrderedDict
+
+    from memory.llm_extractor import LLMExtractor
+
+    calls = []
+
+    def _create(**params):
+        calls.append(params)
+        body = '{"facts": [], "entities": ["tokio"], "keywords": ["tokio"]}'
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=body))])
+
+    extractor = LLMExtractor.__new__(LLMExtractor)
+    extractor.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=_create)))
+    extractor.model = "m"
+    extractor.temperature = 0.3
+    extractor._cache = OrderedDict()
+    extractor._cache_lock = threading.Lock()
+
+    first = extractor.extract("user", "I use tokio")
+    first.entities.append("mutated")
+    second = extractor.extract("user", "I use tokio")
+    assert second.entities == ["tokio"]
+    assert len(calls) == 1
+
+    extractor.extract("user", "I use tokio", context=[{"role": "user", "content": "hi"}])
+    assert len(calls) == 2
+
+
+def test_flat_memory_recall_returns_top_candidates_in_rank_order(tmp_path):
+    from memory.backends.flat_memory import FlatMemoryStore
+
+    store = FlatMemoryStore(str(tmp_path / "flat.jsonl"))
+    for i in range(20):
+        store.add_message(
+            session_id="s1",
+            role="user",
+            content=f"note {i} about tokio" if i % 5 == 0 else f"note {i}",
+            user_id="u1",
+            metadata={"importance": (i + 1) / 100},
+        )
+
+    rows = store.collect_recall_candidates(query="tokio note", session_id="s2", user_id="u1", top_k=2)
+
+    assert [row["content"] for row in rows] == [
+        "note 15 about tokio",
+        "note 10 about tokio",
+        "note 5 about tokio",
+        "note 0 about tokio",
+    ]
+
+
+def test_write_keys_match_on_normalized_content_and_split_on_scope():
+    from gateway.memory_service import MemoryService
+
+    memory_adapter = MagicMock()
+    memory_adapter.is_enabled.return_value = False
+    svc = MemoryService(memory_adapter=memory_adapter)
+
+    key = svc._make_write_key("u1", "goal", "Ship the release")
+    assert isinstance(key, int)
+    assert key == svc._make_write_key("u1", "goal", "Ship the release")
+    assert key != svc._make_write_key("u2", "goal", "Ship the release")
+    assert key != svc._make_write_key("u1", "preference", "Ship the release")
+
+    svc._remember_write_key(key)
+    assert list(svc._recent_write_index) == [key]
+
+
+def test_recent_write_index_evicts_oldest_keys_past_the_limit():
+    from gateway.memory_service import MemoryService
+
+    memory_adapter = MagicMock()
+    memory_adapter.is_enabled.return_value = False
+    svc = MemoryService(memory_adapter=memory_adapter)
+    svc._recent_write_limit = 3
+
+    for key in (1, 2, 3, 2, 4, 5):
+        svc._remember_write_key(key)
+
+    assert list(svc._recent_write_index) == [3, 4, 5]
+
+
+def test_graph_dedupe_checks_exact_and_semantic_matches_in_one_query(monkeypatch):
+    from gateway.memory_service import MemoryService
+
+    class _Connector:
+        def __init__(self, row):
+            self.row = row
+            self.calls = []
+
+        def query(self, cypher, params):
+            self.calls.append(params)
+            return [self.row] if self.row is not None else []
+
+    memory_adapter = MagicMock()
+    memory_adapter.is_enabled.return_value = False
+    svc = MemoryService(memory_adapter=memory_adapter)
+
+    cases = [
+        ({"exact_id": "m1", "semantic_contents": []}, False),
+        ({"exact_id": None, "semantic_contents": ["Other", "  Likes GREEN tea "]}, False),
+        ({"exact_id": None, "semantic_contents": ["likes black tea"]}, True),
+        (None, True),
+    ]
+    for row, expected in cases:
+        connector = _Connector(row)
+        monkeypatch.setattr(svc, "_get_connector", lambda c=connector: c)
+        assert svc._graph_memory_state_changed(
+            user_id="u1",
+            memory_type="preference",
+            content="Likes green tea",
+            semantic_keys=["tea"],
+        ) is expected
+        assert connector.calls == [
+            {"user_id": "u1", "norm_content": "likes green tea", "user_node_id": "user_u1", "keys": ["tea"]}
+        ]
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import pytest
+
+from gateway.http.routes import memory
+from gateway.protocol import RequestType
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("path", "request_type"),
+    [
+        ("/memory/cluster/{session_id}", RequestType.MEMORY_CLUSTER),
+        ("/memory/decay/{session_id}", RequestType.MEMORY_DECAY),
+        ("/memory/cleanup/{session_id}", RequestType.MEMORY_CLEANUP),
+    ],
+)
+async def test_session_method_routes_dispatch_their_gateway_method(monkeypatch, path, request_type):
+    captured = {}
+
+    async def _fake_dispatch(method, params, user_id, request=None):
+        captured.update(method=method, params=dict(params), user_id=user_id, request=request)
+        return {"result": "done"}
+
+    monkeypatch.setattr(memory, "dispatch_gateway_method", _fake_dispatch)
+    route = next(r for r in memory.router.routes if r.path == path)
+    assert route.methods == {"POST"}
+
+    out = await route.endpoint(session_id="s1", raw_request="req", user_id="u1")
+
+    assert out == {"status": "success", "result": "done"}
+    assert captured == {"method": request_type, "params": {"session_id": "s1"}, "user_id": "u1", "request": "req"}
@@ -1,3 +1,5 @@
+import asyncio
+
 from gateway.memory_service import MemoryService
 
 
@@ -155,6 +157,59 @@ def test_get_session_concepts_and_summaries(monkeypatch):
     assert summaries["total_summaries"] == 1
 
 
+def test_layer_managers_are_built_once_until_config_reload(monkeypatch):
+    built = []
+
+    class _Warm:
+        @staticmethod
+        def get_concepts(_sid):
+            return []
+
+    def _create_warm(_connector):
+        built.append(_connector)
+        return _Warm()
+
+    monkeypatch.setattr("memory.create_warm_layer_manager", _create_warm)
+    svc = MemoryService(memory_adapter=_AdapterWithHot())
+
+    svc.get_session_concepts(memory_session_id="ms1")
+    svc.get_session_concepts(memory_session_id="ms2")
+    assert len(built) == 1
+
+    asyncio.run(svc._on_config_reloaded(None))
+    svc.get_session_concepts(memory_session_id="ms1")
+    assert len(built) == 2
+
+
+def test_owned_session_reads_check_ownership_and_fetch_in_one_call(monkeypatch):
+    from memory.warm_layer import WarmLayerManager
+
+    queries = []
+
+    class _Connector:
+        def __init__(self, rows):
+            self.rows = rows
+
+        def query(self, query, params):
+            queries.append(params)
+            return self.rows
+
+    warm = object.__new__(WarmLayerManager)
+    warm.connector = _Connector(
+        [{"session_node_id": "session_u1::s1", "concepts": [{"id": "c1", "entity_count": 2}]}]
+    )
+    monkeypatch.setattr("memory.create_warm_layer_manager", lambda _connector: warm)
+    svc = MemoryService(memory_adapter=_AdapterWithHot())
+
+    out = svc.get_owned_session_concepts(session_id="s1", user_id="u1")
+    assert out == {"ok": True, "memory_session_id": "u1::s1", "concepts": [{"id": "c1", "entity_count": 2}]}
+    assert queries == [{"user_node_id": "user_u1", "candidate_ids": ["session_u1::s1", "session_s1"]}]
+
+    warm.connector = _Connector([])
+    out = svc.get_owned_session_concepts(session_id="s1", user_id="u1")
+    assert out == {"ok": False, "reason": "session_memory_not_found"}
+
+
 def test_get_summary_for_user_ownership(monkeypatch):
     class _Cold:
         @staticmethod
@@ -216,3 +271,86 @@ def test_resolve_owned_memory_session(monkeypatch):
     assert out == {"ok": True, "memory_session_id": "u1:s1"}
 
 
+def test_maintenance_runs_layer_work_off_the_event_loop(monkeypatch):
+    import threading
+
+    threads = []
+
+    class _Forgetting:
+        @staticmethod
+        def apply_time_decay(sid):
+            threads.append(threading.current_thread())
+            return {"status": "success", "session_id": sid}
+
+    monkeypatch.setattr("memory.create_forgetting_manager", lambda _connector: _Forgetting())
+    svc = MemoryService(memory_adapter=_AdapterWithHot())
+
+    async def _run():
+        return await svc.apply_decay(session_id="s1", user_id="u1"), threading.current_thread()
+
+    out, loop_thread = asyncio.run(_run())
+    assert out == {"status": "success", "session_id": "u1::s1"}
+    assert threads and threads[0] is not loop_thread
+
+
+def test_summaries_run_with_bounded_concurrency(monkeypatch):
+    import threading
+    import time
+
+    active = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+
+    class _Cold:
+        @staticmethod
+        def should_create_summary(_sid):
+            return True
+
+        @staticmethod
+        def summarize_session(sid):
+            with lock:
+                active["now"] += 1
+                active["peak"] = max(active["peak"], active["now"])
+            time.sleep(0.02)
+            with lock:
+                active["now"] -= 1
+            return f"sum_{sid}"
+
+        @staticmethod
+        def get_summary_by_id(summary_id):
+            return {"id": summary_id}
+
+    monkeypatch.setattr("memory.create_cold_layer_manager", lambda _connector: _Cold())
+    svc = MemoryService(memory_adapter=_AdapterWithHot())
+
+    async def _run():
+        return await asyncio.gather(
+            *(svc.summarize_session(session_id=f"s{i}", user_id="u1") for i in range(10))
+        )
+
+    out = asyncio.run(_run())
+    assert [row["summary_id"] for row in out] == [f"sum_u1::s{i}" for i in range(10)]
+    assert active["peak"] <= svc._summary_concurrency
+
+
+def test_write_thresholds_are_cached_per_user_until_config_changes():
+    from types import SimpleNamespace
+
+    merges = []
+
+    class _ConfigService:
+        def get_merged_config(self, user_id):
+            merges.append(user_id)
+            return {"memory": {"gating": {"dedupe": {"min_candidate_chars": 5}}}}
+
+        def get_default_config(self):
+            return SimpleNamespace(model_dump=lambda: {})
+
+    svc = MemoryService(memory_adapter=_Adapter(), config_service=_ConfigService())
+    for _ in range(3):
+        svc._should_write_candidate("u1", "preference", "likes green tea")
+    assert merges == ["u1"]
+    assert svc._dedupe_min_candidate_chars == 5
+
+    asyncio.run(svc._on_config_changed(SimpleNamespace(payload={"user_id": "u1", "changes": {"memory": {}}})))
+    svc._should_write_candidate("u1", "preference", "likes green tea")
+    assert merges == ["u1", "u1"]
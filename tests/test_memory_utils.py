@@ -4,9 +4,11 @@ from gateway.memory_recall_utils import (
     resolve_recall_policy,
     source_layer_to_memory_type,
 )
+from gateway import memory_text_utils
 from gateway.memory_text_utils import (
     build_semantic_keys,
     extract_json_object,
+    extract_tokens,
     normalize_candidates,
     normalize_content,
 )
@@ -33,3 +35,34 @@ def test_memory_recall_policy_and_mapping():
     assert source_layer_to_memory_type("summary") == "semantic"
     assert build_recall_reason({"source_layer": "recent"}, mode="fast", session_id="s1") == "recent_session_context"
     assert parse_candidate_datetime("2026-01-01T00:00:00Z") is not None
+
+
+def test_normalize_content_caches_short_texts_only():
+    memory_text_utils._normalize_cached.cache_clear()
+    assert normalize_content("  Likes   Green Tea ") == "likes green tea"
+    assert normalize_content("  Likes   Green Tea ") == "likes green tea"
+    assert memory_text_utils._normalize_cached.cache_info().hits == 1
+
+    long_text = "Word  " * memory_text_utils._NORMALIZE_CACHE_MAX_CHARS
+    assert normalize_content(long_text) == " ".join(["word"] * memory_text_utils._NORMALIZE_CACHE_MAX_CHARS)
+    assert memory_text_utils._normalize_cached.cache_info().currsize == 1
+    assert normalize_content(None) == ""
+
+
+def test_extract_tokens_splits_latin_on_underscores_and_keeps_cjk_runs():
+    assert extract_tokens("snake_case__word 项目_state _x_ 你好") == [
+        "snake",
+        "case",
+        "word",
+        "项目",
+        "state",
+        "x",
+        "你好",
+    ]
+
+
+def test_extract_json_object_ignores_trailing_prose_and_stray_braces():
+    text = 'Sure {see below}: {"has_long_term_state": true, "candidates": [{"type": "goal"}]} Note: {done}.'
+    assert extract_json_object(text) == {"has_long_term_state": True, "candidates": [{"type": "goal"}]}
+    assert extract_json_object("no json here") is None
+    assert extract_json_object("{a} {b} {c} {d} {\"late\": 1}") is None
@@ -1,3 +1,4 @@
+import threading
 from types import SimpleNamespace
 from unittest.mock import MagicMock
 
@@ -125,7 +126,8 @@ def test_memory_write_decision_reason_serialization():
 async def test_memory_write_proposal_can_confirm_without_superseding_conflicts():
     emitter = EventEmitter()
     memory_adapter = MagicMock()
-    memory_adapter.add_message.return_value = True
+    write_threads = []
+    memory_adapter.add_message.side_effect = lambda **_kwargs: write_threads.append(threading.current_thread()) or True
 
     service = MemoryService(event_emitter=emitter, memory_adapter=memory_adapter)
     proposal_id = service._create_write_proposal(
@@ -149,6 +151,7 @@ async def test_memory_write_proposal_can_confirm_without_superseding_conflicts()
     assert proposal["status"] == "confirmed"
     assert proposal["resolved_action"] == "confirm_write_keep_existing"
     memory_adapter.add_message.assert_called_once()
+    assert write_threads[0] is not threading.current_thread()
     memory_adapter.list_memory_entries.assert_not_called()
     memory_adapter.update_memory_entry.assert_not_called()
     payload = emitter.get_history(event=EventType.MEMORY_WRITE_DECIDED)[-1].payload
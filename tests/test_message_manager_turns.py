@@ -1,4 +1,7 @@
-﻿from gateway.http.message_manager import MessageManager
+﻿import json
+
+from gateway.http.message_manager import MessageManager, Session
+from gateway.http.session_store import SessionStorage
 
 
 class _NoopStore:
@@ -8,7 +11,8 @@ class _NoopStore:
     def load_all(self):
         return {}
 
-    def save_all(self, sessions):
+    def save_all(self, sessions, changed=None):
+        _ = changed
         self.last = sessions
 
 
@@ -54,3 +58,102 @@ def test_turn_abort_removes_pending():
     assert mgr.abort_turn(sid, "t1", user_id="u1")
     # TODO: comment cleaned
     assert mgr.get_messages(sid, user_id="u1") == []
+
+
+def test_delete_user_sessions_only_removes_owned_sessions_and_saves_once():
+    mgr = _build_manager()
+    saves = []
+    mgr.session_store.save_all = lambda sessions, changed=None: saves.append(dict(sessions))
+    mgr.create_session("s1", user_id="u1")
+    mgr.create_session("s2", user_id="u1")
+    mgr.create_session("s3", user_id="u2")
+    saves.clear()
+
+    removed = mgr.delete_user_sessions(user_id="u1")
+
+    assert removed == 2
+    assert list(mgr.session.keys()) == ["u2::s3"]
+    assert len(saves) == 1
+    assert mgr.delete_user_sessions(user_id="u1") == 0
+    assert len(saves) == 1
+
+
+def test_get_recent_messages_returns_tail_as_dicts():
+    mgr = _build_manager()
+    sid = mgr.create_session("s1", user_id="u1")
+    for i in range(3):
+        assert mgr.begin_turn(sid, f"t{i}", "user", f"q{i}", "u1")
+        assert mgr.commit_turn(sid, f"t{i}", f"a{i}", user_id="u1")
+
+    recent = mgr.get_recent_messages(sid, count=3, user_id="u1")
+    assert recent == [
+        {"role": "assistant", "content": "a1"},
+        {"role": "user", "content": "q2"},
+        {"role": "assistant", "content": "a2"},
+    ]
+    assert len(mgr.get_recent_messages(sid, user_id="u1")) == 6
+    assert mgr.get_recent_messages("missing", user_id="u1") == []
+
+
+def test_ensure_session_creates_only_when_missing():
+    mgr = _build_manager()
+
+    sid = mgr.ensure_session("s1", user_id="u1")
+    assert sid == "s1"
+    assert mgr.begin_turn(sid, "t1", "user", "hello", "u1")
+    assert mgr.commit_turn(sid, "t1", "world", user_id="u1")
+    assert mgr.ensure_session("s1", user_id="u1") == "s1"
+    assert len(mgr.get_messages("s1", user_id="u1")) == 2
+
+    generated = mgr.ensure_session(None, user_id="u1")
+    assert generated and generated != "s1"
+    assert mgr.get_session(generated, user_id="u1") is not None
+
+
+def test_session_storage_reencodes_only_changed_sessions(tmp_path, monkeypatch):
+    store = SessionStorage(str(tmp_path / "sessions.json"))
+    sessions = {"u1::a": Session(title="A"), "u1::b": Session(title="B")}
+    store.save_all(sessions)
+
+    dumped = []
+    original_dump = Session.model_dump
+
+    def _tracking_dump(self, *args, **kwargs):
+        dumped.append(self.title)
+        return original_dump(self, *args, **kwargs)
+
+    monkeypatch.setattr(Session, "model_dump", _tracking_dump)
+    sessions["u1::b"].title = "B2"
+    store.save_all(sessions, changed=("u1::b",))
+    assert dumped == ["B2"]
+
+    del sessions["u1::a"]
+    store.save_all(sessions, changed=())
+    on_disk = json.loads((tmp_path / "sessions.json").read_text(encoding="utf-8"))
+    assert list(on_disk) == ["u1::b"]
+    assert on_disk["u1::b"]["title"] == "B2"
+    assert store.load_all()["u1::b"].title == "B2"
+
+
+def test_set_agent_type_survives_save_and_reload(tmp_path):
+    path = str(tmp_path / "sessions.json")
+    mgr = _build_manager()
+    mgr.session_store = SessionStorage(path)
+    sid = mgr.create_session("s1", user_id="u1")
+
+    assert mgr.set_agent_type(sid, "coder", user_id="u1")
+
+    reloaded = SessionStorage(path).load_all()
+    assert reloaded["u1::s1"].agent_type == "coder"
+
+
+def test_session_storage_saves_complete_file_without_leftover_temp_files(tmp_path):
+    store = SessionStorage(str(tmp_path / "sessions.json"))
+    sessions = {"u1::a": Session(title="A")}
+
+    store.save_all(sessions)
+    sessions["u1::a"].title = "A2"
+    store.save_all(sessions, changed=("u1::a",))
+
+    assert [p.name for p in tmp_path.iterdir()] == ["sessions.json"]
+    assert SessionStorage(str(tmp_path / "sessions.json")).load_all()["u1::a"].title == "A2"
@@ -16,3 +16,32 @@ def test_metrics_collector_exposes_llm_token_fields_and_ui_aliases():
     assert stats["llm"]["average_latency_ms"] == 250
     assert stats["llm"]["estimated_cost"] > 0
     assert stats["cost"]["estimated_usd"] == stats["llm"]["estimated_cost"]
+
+
+def test_metrics_collector_prometheus_text_escapes_path_labels():
+    collector = MetricsCollector()
+    collector.record_http_request("GET", '/api/a"b\\c', 200, 3.0)
+    collector.record_http_request("GET", '/api/a"b\\c', 500, 5.0)
+
+    text = collector.to_prometheus_text()
+
+    assert text.endswith("\n")
+    assert "promethea_http_requests_total 2\n" in text
+    assert 'promethea_http_requests_by_path_total{path="GET /api/a\\"b\\\\c"} 2\n' in text
+    assert 'promethea_http_errors_by_path_total{path="GET /api/a\\"b\\\\c"} 1\n' in text
+
+    collector.record_http_request("GET", '/api/a"b\\c', 200, 1.0)
+    assert 'promethea_http_requests_by_path_total{path="GET /api/a\\"b\\\\c"} 3\n' in collector.to_prometheus_text()
+
+
+def test_metrics_collector_aggregates_http_requests_per_method_and_path():
+    collector = MetricsCollector()
+    collector.record_http_request("GET", "/api/sessions/{session_id}", 200, 2.0)
+    collector.record_http_request("GET", "/api/sessions/{session_id}", 404, 4.0)
+    collector.record_http_request("POST", "/api/sessions/{session_id}", 200, 1.0)
+
+    by_path = collector.http_by_path
+    assert by_path["GET /api/sessions/{session_id}"] == {"count": 2, "latency_ms_total": 6.0, "errors": 1}
+    assert by_path["POST /api/sessions/{session_id}"]["count"] == 1
+    assert collector.get_stats()["http"]["requests_total"] == 3
+    assert collector.get_stats()["http"]["errors_total"] == 1
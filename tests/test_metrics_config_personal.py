@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 from types import SimpleNamespace
 
 import pytest
@@ -36,7 +37,8 @@ async def test_metrics_contains_personal_and_workflow_recovery(monkeypatch):
     monkeypatch.setattr(metrics_config.state.metrics, "get_stats", lambda: {"llm": {}, "memory": {}, "sessions": {}, "cost": {}, "uptime_seconds": 0})
     monkeypatch.setattr(metrics_config.user_file_store, "get_global_stats", lambda: {"total_files": 3, "total_bytes": 128, "total_users": 1})
 
-    out = await metrics_config.get_metrics()
+    response = await metrics_config.get_metrics()
+    out = json.loads(response.body)
     assert out["status"] == "success"
     assert out["metrics"]["personal"]["sessions_current"] == 2
     assert out["metrics"]["personal"]["sessions_pinned"] == 1
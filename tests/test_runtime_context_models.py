@@ -33,6 +33,7 @@ async def test_gateway_chat_builds_and_passes_run_context():
 
     message_manager = MagicMock()
     message_manager.get_session.return_value = True
+    message_manager.ensure_session.side_effect = lambda session_id, user_id=None: session_id
     message_manager.begin_turn.return_value = True
     message_manager.commit_turn.return_value = True
     server.message_manager = message_manager
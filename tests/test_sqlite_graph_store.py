@@ -34,3 +34,28 @@ def test_sqlite_graph_related_recall_via_recursive_cte(tmp_path):
     assert any("runtime tuning guide" in x.lower() for x in contents)
     assert any("rust async stack" in x.lower() for x in contents)
 
+
+def test_sqlite_graph_mef_round_trip_bulk_imports_every_table(tmp_path):
+    source = SqliteGraphMemoryStore(str(tmp_path / "src.db"))
+    for text in ("Tokio runtime tuning guide", "Rust async stack relies on tokio"):
+        assert source.add_message(
+            session_id="s1",
+            role="user",
+            content=text,
+            user_id="u1",
+            metadata={"memory_type": "semantic", "source_layer": "direct"},
+        )
+    payload = source.export_mef(user_id="u1")
+
+    target = SqliteGraphMemoryStore(str(tmp_path / "dst.db"))
+    out = target.import_mef(payload, merge=False)
+
+    assert out["ok"] is True
+    assert out["imported"] == {
+        "memory_items": len(payload["memory_items"]),
+        "nodes": len(payload["nodes"]),
+        "edges": len(payload["edges"]),
+    }
+    exported = target.export_mef(user_id="u1")
+    for table in ("memory_items", "nodes", "edges"):
+        assert sorted(r["id"] for r in exported[table]) == sorted(r["id"] for r in payload[table])
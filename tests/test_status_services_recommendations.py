@@ -1,3 +1,5 @@
+import json
+
 import pytest
 
 from gateway.http.routes import status
@@ -15,7 +17,7 @@ async def test_status_services_returns_failed_components_and_recommendations(mon
             }
 
     monkeypatch.setattr(status, "get_gateway_server", lambda: _DummyGateway())
-    out = await status.get_services_status()
+    out = json.loads((await status.get_services_status()).body)
     assert out["status"] == "degraded"
     assert out["summary"]["failed"] == 2
     assert set(out["failed_services"]) == {"memory_service", "workflow_engine"}
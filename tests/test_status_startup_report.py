@@ -1,4 +1,6 @@
-﻿import pytest
+﻿import json
+
+import pytest
 
 from gateway.http import state
 from gateway.http.routes import status
@@ -30,5 +32,5 @@ async def test_status_includes_startup_report(monkeypatch):
         raising=False,
     )
 
-    out = await status.get_status()
+    out = json.loads((await status.get_status()).body)
     assert out["startup"]["status"] == "healthy"
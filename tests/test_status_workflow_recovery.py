@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 from types import SimpleNamespace
 
 import pytest
@@ -22,7 +23,7 @@ async def test_status_exposes_workflow_recovery(monkeypatch):
         workflow_engine = _Workflow()
 
     monkeypatch.setattr(status, "get_gateway_server", lambda: _Gateway())
-    out = await status.get_status()
+    out = json.loads((await status.get_status()).body)
     assert out["status"] == "running"
     assert out["workflow_recovery"]["paused"] == 1
     assert out["workflow_recovery"]["failed"] == 1
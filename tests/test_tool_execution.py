@@ -384,6 +384,20 @@ class TestToolExecution(unittest.TestCase):
         self.assertIn("", new_messages[0]['content'])
         self.assertIn("mock_service", new_messages[0]['content'])
 
+    def test_system_prompt_injection_does_not_mutate_existing_system_message(self):
+        conv = PrometheaConversation()
+        conv.mcp_manager = MockMCPManager()
+
+        messages = [{'role': 'system', 'content': 'base'}, {'role': 'user', 'content': 'hello'}]
+        first = conv.prepare_messages(messages)
+        second = conv.prepare_messages(messages)
+
+        self.assertEqual(messages[0]['content'], 'base')
+        self.assertEqual(first, second)
+        self.assertEqual(len(first), 2)
+        self.assertTrue(first[0]['content'].startswith('base\n\n'))
+        self.assertIs(first[1], messages[1])
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -151,3 +151,30 @@ def test_strategy_avoids_high_risk_tool_without_explicit_dangerous_intent():
     )
     assert out["use_tool"] is True
     assert out["tool_name"] == "browser_action"
+
+
+def test_strategy_intent_patterns_match_plain_substring_semantics():
+    from gateway.tool_strategy import _INTENT_PATTERNS
+
+    text = "please rebuild the nodejs project and then terminate the old worker"
+    found = {name for name, pattern in _INTENT_PATTERNS.items() if pattern.search(text)}
+    # Substrings count, as with `keyword in text`: "ui" in "rebuild", "node" in "nodejs".
+    assert found == {"browser", "graph", "explicit_dangerous"}
+
+    engine = ToolStrategyEngine()
+    out = engine.recommend(
+        step={"goal": "run the build"},
+        user_message="compile it",
+        observations=[],
+        catalog=[
+            {
+                "tool_type": "mcp",
+                "service_name": "computer_control",
+                "tool_name": "execute_command",
+                "description": "shell",
+            }
+        ],
+        strategy_hints={},
+    )
+    assert "risk_penalty" in out["candidates"][0]["reasons"]
+    assert "risk_high" in out["candidates"][0]["reasons"]
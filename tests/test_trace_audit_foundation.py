@@ -121,3 +121,43 @@ async def test_memory_write_decision_generates_audit_event():
     audits = emitter.get_audit_history(action="memory_write_decision")
     assert audits
     assert audits[-1].outcome == "write"
+
+
+@pytest.mark.asyncio
+async def test_event_emitter_histories_keep_only_the_newest_entries():
+    emitter = EventEmitter()
+    total = emitter._max_history + 5
+    for i in range(total):
+        await emitter.emit(EventType.MEMORY_SAVED, {"trace_id": f"t{i}", "session_id": "s1"})
+
+    history = emitter.get_history(limit=total)
+    assert len(history) == emitter._max_history
+    assert history[0].payload["trace_id"] == "t5"
+    assert history[-1].payload["trace_id"] == f"t{total - 1}"
+    assert [e.trace_id for e in emitter.get_trace_history(limit=2)] == [f"t{total - 2}", f"t{total - 1}"]
+
+
+@pytest.mark.asyncio
+async def test_event_emitter_dispatches_sync_and_async_handlers_resolved_at_registration(monkeypatch):
+    emitter = EventEmitter()
+    seen = []
+
+    async def _async_handler(event_msg):
+        seen.append(("async", event_msg.payload["n"]))
+
+    def _sync_handler(event_msg):
+        seen.append(("sync", event_msg.payload["n"]))
+
+    emitter.on(EventType.MEMORY_SAVED, _async_handler)
+    emitter.on(EventType.MEMORY_SAVED, _sync_handler)
+
+    def _unexpected_probe(_handler):
+        raise AssertionError("handler kind should be resolved at registration")
+
+    monkeypatch.setattr("gateway.events.asyncio.iscoroutinefunction", _unexpected_probe)
+    await emitter.emit(EventType.MEMORY_SAVED, {"n": 1})
+    assert sorted(seen) == [("async", 1), ("sync", 1)]
+
+    emitter.off(EventType.MEMORY_SAVED, _async_handler)
+    await emitter.emit(EventType.MEMORY_SAVED, {"n": 2})
+    assert seen[-1] == ("sync", 2) and len(seen) == 3
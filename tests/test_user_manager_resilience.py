@@ -1,5 +1,10 @@
 import json
+import os
+import threading
 
+import pytest
+
+from gateway.http import user_manager as user_manager_module
 from gateway.http.user_manager import UserManager
 
 
@@ -9,6 +14,7 @@ def _make_manager(tmp_path):
     mgr.users_dir.mkdir(parents=True, exist_ok=True)
     mgr.store_backend = "sqlite_graph"
     mgr.connector = None
+    mgr._config_file_cache = {}
     return mgr
 
 
@@ -37,6 +43,169 @@ def test_get_user_config_auto_heals_corrupt_json(tmp_path, monkeypatch):
     assert json.loads(current_path.read_text(encoding="utf-8")).get("agent_name") == "Recovered"
 
 
+def test_get_user_config_reuses_passed_user_when_creating_file(tmp_path, monkeypatch):
+    mgr = _make_manager(tmp_path)
+
+    def _unexpected_lookup(_uid):
+        raise AssertionError("user record was already supplied")
+
+    monkeypatch.setattr(mgr, "get_user_by_id", _unexpected_lookup)
+    monkeypatch.setattr(
+        UserManager,
+        "_build_user_default_config",
+        staticmethod(lambda agent_name: {"agent_name": agent_name}),
+    )
+
+    cfg = UserManager.get_user_config(mgr, "u3", user={"agent_name": "Given"})
+
+    assert cfg.get("agent_name") == "Given"
+
+
+def test_get_user_config_rereads_file_only_after_it_changes(tmp_path, monkeypatch):
+    mgr = _make_manager(tmp_path)
+    current_path = UserManager._current_config_path(mgr, "u4")
+    current_path.parent.mkdir(parents=True, exist_ok=True)
+    current_path.write_text('{"agent_name": "First"}', encoding="utf-8")
+
+    first = UserManager.get_user_config(mgr, "u4")
+    first["agent_name"] = "mutated by caller"
+    assert UserManager.get_user_config(mgr, "u4") == {"agent_name": "First"}
+
+    stat = current_path.stat()
+    current_path.write_text('{"agent_name": "Second"}', encoding="utf-8")
+    os.utime(current_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert UserManager.get_user_config(mgr, "u4") == {"agent_name": "Second"}
+
+
+def test_update_user_config_file_drops_cached_bytes_for_same_size_rewrite(tmp_path):
+    mgr = _make_manager(tmp_path)
+    current_path = UserManager._current_config_path(mgr, "u5")
+    UserManager._write_json_atomic(mgr, current_path, {"system_prompt": "aaaa"})
+    stat = current_path.stat()
+
+    assert UserManager.get_user_config(mgr, "u5")["system_prompt"] == "aaaa"
+    assert UserManager.update_user_config_file(mgr, "u5", {"system_prompt": "bbbb"})
+    # Same size and, as on coarse-timestamp filesystems, the same mtime.
+    assert current_path.stat().st_size == stat.st_size
+    os.utime(current_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert UserManager.get_user_config(mgr, "u5")["system_prompt"] == "bbbb"
+
+
+def test_get_user_config_falls_back_to_legacy_file_and_reuses_paths(tmp_path):
+    mgr = _make_manager(tmp_path)
+    legacy_path = UserManager._legacy_config_path(mgr, "u9")
+    legacy_path.write_text('{"agent_name": "Legacy"}', encoding="utf-8")
+
+    assert UserManager.get_user_config(mgr, "u9") == {"agent_name": "Legacy"}
+    assert UserManager._legacy_config_path(mgr, "u9") is legacy_path
+    assert not UserManager._current_config_path(mgr, "u9").exists()
+
+
+def test_deep_merge_merges_nested_dicts_in_place():
+    target = {"api": {"model": "m", "temperature": 0.5}, "agent_name": "A"}
+    merged = UserManager._deep_merge(target, {"api": {"temperature": 0.9}, "memory": {"enabled": True}})
+
+    assert merged is target
+    assert merged == {
+        "api": {"model": "m", "temperature": 0.9},
+        "agent_name": "A",
+        "memory": {"enabled": True},
+    }
+    assert UserManager._deep_merge(None, {"a": 1}) == {"a": 1}
+
+
+def test_update_user_config_without_changes_skips_graph_and_file(tmp_path, monkeypatch):
+    mgr = _make_manager(tmp_path)
+
+    class _Connector:
+        def query(self, *_args, **_kwargs):
+            raise AssertionError("no graph write expected")
+
+    mgr.connector = _Connector()
+
+    def _unexpected_file_write(*_args, **_kwargs):
+        raise AssertionError("no file write expected")
+
+    monkeypatch.setattr(mgr, "update_user_config_file", _unexpected_file_write)
+
+    assert UserManager.update_user_config(mgr, "u5") is True
+
+
+def test_channel_account_queries_are_reused_and_reject_unsafe_channel_names(tmp_path):
+    mgr = _make_manager(tmp_path)
+    queries = []
+
+    class _Connector:
+        def query(self, query, params):
+            queries.append((query, params))
+            return []
+
+    mgr.connector = _Connector()
+
+    assert UserManager.bind_channel_account(mgr, "u6", "telegram", "tg-1") is True
+    assert UserManager.bind_channel_account(mgr, "u7", "telegram", "tg-2") is True
+    assert queries[0][0] is queries[1][0]
+    assert "u.channel_telegram = $account_id" in queries[0][0]
+    assert queries[1][1] == {"user_id": "user_u7", "account_id": "tg-2"}
+
+    assert UserManager.bind_channel_account(mgr, "u6", "x} DETACH DELETE u //", "a") is False
+    assert UserManager.get_user_by_channel_account(mgr, "bad-name", "a") is None
+    assert len(queries) == 2
+
+
+def test_graph_queries_hold_a_shared_query_slot(tmp_path, monkeypatch):
+    mgr = _make_manager(tmp_path)
+    slots = threading.BoundedSemaphore(1)
+    monkeypatch.setattr(user_manager_module, "_graph_query_slots", slots)
+    held = []
+
+    class _Connector:
+        def query(self, _query, _params):
+            held.append(not slots.acquire(blocking=False))
+            return [{"u": {"id": "user_u8"}}]
+
+    mgr.store_backend = "neo4j"
+    mgr.connector = _Connector()
+
+    assert UserManager.get_user_by_id(mgr, "u8") == {"id": "user_u8"}
+    assert held == [True]
+    assert slots.acquire(blocking=False)
+
+
+def test_graph_query_gives_up_when_no_slot_frees(tmp_path, monkeypatch):
+    from neo4j.exceptions import ServiceUnavailable
+
+    mgr = _make_manager(tmp_path)
+    slots = threading.BoundedSemaphore(1)
+    slots.acquire()
+    monkeypatch.setattr(user_manager_module, "_graph_query_slots", slots)
+    monkeypatch.setattr(user_manager_module, "_GRAPH_QUERY_SLOT_TIMEOUT_S", 0.01)
+
+    class _Connector:
+        def query(self, _query, _params):
+            raise AssertionError("query should not run without a slot")
+
+    mgr.connector = _Connector()
+
+    with pytest.raises(ServiceUnavailable):
+        UserManager._graph_query(mgr, "RETURN 1")
+
+
+def test_verify_user_checks_pbkdf2_hashes_without_bcrypt(tmp_path, monkeypatch):
+    mgr = _make_manager(tmp_path)
+    stored = user_manager_module._pbkdf2_context.hash("pw")
+    monkeypatch.setattr(mgr, "get_user_by_username", lambda _name: {"username": "neo", "password_hash": stored})
+
+    def _bcrypt_path(*_args, **_kwargs):
+        raise AssertionError("PBKDF2 hashes should not go through the bcrypt context")
+
+    monkeypatch.setattr(user_manager_module.pwd_context, "verify", _bcrypt_path)
+
+    assert UserManager.verify_user(mgr, "neo", "pw")["username"] == "neo"
+    assert UserManager.verify_user(mgr, "neo", "wrong") is None
+
+
 def test_update_user_config_file_uses_atomic_writer(tmp_path, monkeypatch):
     mgr = _make_manager(tmp_path)
     user_uuid = "u2"
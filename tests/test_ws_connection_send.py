@@ -0,0 +1,26 @@
+import json
+
+import pytest
+
+from gateway.connection import Connection
+
+
+class _WebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_text(self, data):
+        self.sent.append(data)
+
+
+@pytest.mark.asyncio
+async def test_send_message_encodes_dict_payloads_as_utf8_json_text():
+    ws = _WebSocket()
+    conn = Connection(ws, "c1")
+
+    await conn.send_message({"type": "event", "payload": {"text": "你好", "n": 3}})
+
+    assert len(ws.sent) == 1
+    assert isinstance(ws.sent[0], str)
+    assert "你好" in ws.sent[0]
+    assert json.loads(ws.sent[0]) == {"type": "event", "payload": {"text": "你好", "n": 3}}